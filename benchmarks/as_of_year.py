@@ -0,0 +1,214 @@
+"""
+Compare ways of selecting each asset's latest position "as of" a year, on a
+large position_snapshots table, through the allocation-by-asset query:
+
+- snapshots group by: join on max(snapshot_date) per asset (counts an asset
+  twice when two snapshots share its last date, e.g. a split and a buy)
+- snapshots row_number: ROW_NUMBER() OVER (PARTITION BY asset_id ORDER BY
+  snapshot_date DESC, id DESC) over the snapshots
+- checkpoints correlated: year = correlated max(year) subquery per
+  checkpoint row (the previous implementation)
+- checkpoints row_number: ROW_NUMBER() over the year-end checkpoints
+- checkpoints grouped: (asset_id, year) IN one GROUP BY max(year) pass
+  (PositionSnapshotService)
+
+Snapshots are inserted directly, the last one of some years doubled on the
+same date, and the checkpoints are derived from them as a rebuild would.
+
+Usage:
+    poetry run python benchmarks/as_of_year.py --assets 5000 --years 15 --snapshots 20
+"""
+import argparse
+import random
+import time
+from datetime import date as Date
+from decimal import Decimal
+
+from sqlalchemy import and_, func, insert, select
+from sqlalchemy.orm import aliased
+
+from holdings_tracker_desktop.models import Asset, PositionCheckpoint, PositionSnapshot
+from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
+from holdings_tracker_desktop.services.read_cache import read_cache
+
+from synthetic import START_DATE, create_database, populate, remove_database
+
+def populate_snapshots(db, assets: int, years: int, per_year: int, seed: int = 42) -> None:
+    rng = random.Random(seed)
+
+    for asset_id in range(1, assets + 1):
+        rows = []
+
+        for year in range(START_DATE.year, START_DATE.year + years):
+            if rng.random() < 0.3:
+                continue
+
+            days = sorted(rng.sample(range(365), per_year))
+
+            if rng.random() < 0.2:
+                days.append(days[-1])
+
+            for day in days:
+                rows.append({
+                    "asset_id": asset_id,
+                    "snapshot_date": Date.fromordinal(Date(year, 1, 1).toordinal() + day),
+                    "quantity": Decimal(rng.randint(1, 1000)),
+                    "avg_price": Decimal(rng.randint(500, 20000)) / 100,
+                    "origin_action": "BUY"
+                })
+
+        # Every year may be skipped; an empty list would insert DEFAULT VALUES.
+        if rows:
+            db.execute(insert(PositionSnapshot), rows)
+
+    PositionSnapshotService(db)._insert_checkpoints()
+    db.commit()
+
+def by_asset(stmt, total):
+    return stmt.add_columns(Asset.ticker, total.label("total_cost")).group_by(Asset.ticker)
+
+def snapshots_group_by(year):
+    latest = (
+        select(PositionSnapshot.asset_id, func.max(PositionSnapshot.snapshot_date).label("snapshot_date"))
+        .where(PositionSnapshot.snapshot_date < Date(year + 1, 1, 1))
+        .group_by(PositionSnapshot.asset_id)
+        .subquery()
+    )
+
+    return by_asset(
+        select()
+        .select_from(Asset)
+        .join(PositionSnapshot, PositionSnapshot.asset_id == Asset.id)
+        .join(latest, and_(
+            latest.c.asset_id == PositionSnapshot.asset_id,
+            latest.c.snapshot_date == PositionSnapshot.snapshot_date
+        )),
+        func.sum(PositionSnapshot.quantity * PositionSnapshot.avg_price)
+    )
+
+def snapshots_row_number(year):
+    ranked = (
+        select(
+            PositionSnapshot.asset_id,
+            (PositionSnapshot.quantity * PositionSnapshot.avg_price).label("total_cost"),
+            func.row_number().over(
+                partition_by=PositionSnapshot.asset_id,
+                order_by=(PositionSnapshot.snapshot_date.desc(), PositionSnapshot.id.desc())
+            ).label("position")
+        )
+        .where(PositionSnapshot.snapshot_date < Date(year + 1, 1, 1))
+        .cte("latest_snapshots")
+    )
+
+    return by_asset(
+        select()
+        .select_from(Asset)
+        .join(ranked, and_(ranked.c.asset_id == Asset.id, ranked.c.position == 1)),
+        func.sum(ranked.c.total_cost)
+    )
+
+def checkpoints_correlated(year):
+    earlier = aliased(PositionCheckpoint)
+    latest_year = (
+        select(func.max(earlier.year))
+        .where(earlier.asset_id == PositionCheckpoint.asset_id, earlier.year <= year)
+        .correlate(PositionCheckpoint)
+        .scalar_subquery()
+    )
+
+    return by_asset(
+        select()
+        .select_from(Asset)
+        .join(PositionCheckpoint, PositionCheckpoint.asset_id == Asset.id)
+        .where(PositionCheckpoint.year == latest_year),
+        func.sum(PositionCheckpoint.total_cost)
+    )
+
+def checkpoints_row_number(year):
+    ranked = (
+        select(
+            PositionCheckpoint.asset_id,
+            PositionCheckpoint.total_cost,
+            func.row_number().over(
+                partition_by=PositionCheckpoint.asset_id,
+                order_by=PositionCheckpoint.year.desc()
+            ).label("position")
+        )
+        .where(PositionCheckpoint.year <= year)
+        .cte("latest_checkpoints")
+    )
+
+    return by_asset(
+        select()
+        .select_from(Asset)
+        .join(ranked, and_(ranked.c.asset_id == Asset.id, ranked.c.position == 1)),
+        func.sum(ranked.c.total_cost)
+    )
+
+def per_call(fn, runs: int) -> float:
+    fn()
+    start = time.perf_counter()
+
+    for _ in range(runs):
+        fn()
+
+    return (time.perf_counter() - start) / runs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, default=5000)
+    parser.add_argument("--years", type=int, default=15)
+    parser.add_argument("--snapshots", type=int, default=20, help="snapshots per asset and year")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # Call the service's query every run.
+    read_cache.enabled = False
+
+    engine, SessionLocal, path = create_database()
+    year = START_DATE.year + args.years // 2
+
+    try:
+        with SessionLocal() as db:
+            populate(db, assets=args.assets, notes_per_asset=0, events_per_asset=0)
+            populate_snapshots(db, args.assets, args.years, args.snapshots)
+
+        with SessionLocal() as db:
+            snapshots = db.scalar(select(func.count(PositionSnapshot.id)))
+            checkpoints = db.scalar(select(func.count(PositionCheckpoint.id)))
+            service = PositionSnapshotService(db)
+
+            def grouped():
+                return [(row["label"], row["value"]) for row in service.get_allocation_by_asset(year)]
+
+            paths = [
+                (label, lambda stmt=stmt: db.execute(stmt).all())
+                for label, stmt in [
+                    ("snapshots group by", snapshots_group_by(year)),
+                    ("snapshots row_number", snapshots_row_number(year)),
+                    ("checkpoints correlated", checkpoints_correlated(year)),
+                    ("checkpoints row_number", checkpoints_row_number(year)),
+                ]
+            ]
+            paths.append(("checkpoints grouped", grouped))
+
+            # The latest snapshot by (snapshot_date, id) is the reference.
+            expected = {ticker: float(total) for ticker, total in paths[1][1]()}
+
+            print(f"{snapshots} snapshots, {checkpoints} checkpoints, as of {year}\n")
+            print(f"{'path':<24} {'time (ms)':>10} {'wrong assets':>13}")
+
+            for label, fn in paths:
+                wrong = sum(
+                    1 for ticker, total in fn()
+                    if abs(float(total) - expected.get(ticker, 0.0)) > 0.01
+                )
+                elapsed = per_call(fn, args.runs)
+                print(f"{label:<24} {elapsed * 1e3:10.1f} {wrong:13d}")
+
+    finally:
+        engine.dispose()
+        remove_database(path)
+
+if __name__ == "__main__":
+    main()
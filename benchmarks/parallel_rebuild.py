@@ -0,0 +1,71 @@
+"""
+Compare full snapshot regeneration strategies on a synthetic dataset:
+
+- serial loop over PositionSnapshotService.rebuild_from (one call per asset)
+- PositionSnapshotService.rebuild_all() in a single process
+- PositionSnapshotService.rebuild_all(workers=N)
+
+Usage:
+    poetry run python benchmarks/parallel_rebuild.py --assets 3000 --notes 30 --workers 4
+"""
+import argparse
+import os
+import time
+from datetime import date as Date
+
+from holdings_tracker_desktop.models import Asset, PositionSnapshot
+from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
+
+from synthetic import create_database, populate, remove_database
+
+def timed(label: str, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.2f}s")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, default=3000)
+    parser.add_argument("--notes", type=int, default=30, help="broker notes per asset")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    engine, SessionLocal, path = create_database()
+
+    try:
+        with SessionLocal() as db:
+            populate(db, assets=args.assets, notes_per_asset=args.notes)
+
+        print(f"{args.assets} assets x {args.notes} notes, {args.workers} workers\n")
+
+        def serial_rebuild_from():
+            with SessionLocal() as db:
+                service = PositionSnapshotService(db)
+                for (asset_id,) in db.query(Asset.id).order_by(Asset.id):
+                    service.rebuild_from(asset_id, Date.min)
+
+        def rebuild_all(workers: int):
+            with SessionLocal() as db:
+                PositionSnapshotService(db).rebuild_all(workers=workers)
+
+        baseline = timed("serial rebuild_from loop", serial_rebuild_from)
+
+        with SessionLocal() as db:
+            expected = db.query(PositionSnapshot).count()
+
+        single = timed("rebuild_all(workers=1)", lambda: rebuild_all(1))
+        parallel = timed(f"rebuild_all(workers={args.workers})", lambda: rebuild_all(args.workers))
+
+        with SessionLocal() as db:
+            assert db.query(PositionSnapshot).count() == expected
+
+        print(f"\nspeedup vs rebuild_from loop: {baseline / single:5.1f}x single, {baseline / parallel:5.1f}x parallel")
+
+    finally:
+        engine.dispose()
+        remove_database(path)
+
+if __name__ == "__main__":
+    main()
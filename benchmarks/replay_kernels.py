@@ -0,0 +1,136 @@
+"""
+Compare timeline replay kernels on synthetic broker notes and asset events:
+
+- reference: position_replay.apply_item, one call per ORM item (the
+  per-object rules rebuild_from used before the tuple kernel)
+- kernel: position_replay encoding of plain column tuples followed by
+  position_replay.replay (what the service runs)
+
+Events are split into per-asset timelines that each start from an empty
+position. Every (quantity, avg_price) pair is compared after quantizing to
+the Numeric(20, 6) column scale and the number of mismatches is reported.
+
+Usage:
+    poetry run python benchmarks/replay_kernels.py --events 1000000
+"""
+import argparse
+import random
+import time
+from datetime import date as Date, timedelta
+from decimal import Decimal
+
+from holdings_tracker_desktop.models import AssetEvent, BrokerNote
+from holdings_tracker_desktop.models.asset_event import AssetEventType
+from holdings_tracker_desktop.models.broker_note import OperationType
+from holdings_tracker_desktop.services import position_replay
+from holdings_tracker_desktop.services.position_snapshot_service import SNAPSHOT_SCALE
+
+ZERO = Decimal("0")
+
+def build_timelines(count: int, per_asset: int, seed: int) -> list[list[tuple]]:
+    """Random per-asset timelines shaped like the rebuild_all column projections"""
+    rng = random.Random(seed)
+    timelines = []
+
+    for start in range(0, count, per_asset):
+        day = Date(2010, 1, 4)
+        timeline = []
+
+        for _ in range(min(per_asset, count - start)):
+            day += timedelta(days=rng.randint(0, 5))
+            timeline.append(random_row(rng, day))
+
+        timelines.append(timeline)
+
+    return timelines
+
+def random_row(rng: random.Random, day: Date) -> tuple:
+    roll = rng.random()
+    quantity = Decimal(rng.randint(1, 100))
+    price = Decimal(rng.randint(500, 20000)) / 100
+
+    if roll < 0.70:
+        fees = Decimal(rng.randint(0, 500)) / 100
+        return "note", day, OperationType.BUY, quantity, price, fees, ZERO
+
+    if roll < 0.96:
+        return "note", day, OperationType.SELL, quantity, price, ZERO, ZERO
+
+    if roll < 0.98:
+        factor = rng.choice([Decimal("0.5"), Decimal("2"), Decimal("3")])
+        return "event", day, AssetEventType.SPLIT, factor, None, None
+
+    if roll < 0.99:
+        return "event", day, AssetEventType.SUBSCRIPTION, None, quantity, price
+
+    return "event", day, AssetEventType.AMORTIZATION, None, None, Decimal(rng.randint(1, 100)) / 100
+
+def to_model(row: tuple):
+    if row[0] == "note":
+        _, day, operation, quantity, price, fees, taxes = row
+        return BrokerNote(
+            date=day, operation=operation, quantity=quantity, price=price, fees=fees, taxes=taxes
+        )
+
+    _, day, event_type, factor, quantity, price = row
+    return AssetEvent(date=day, event_type=event_type, factor=factor, quantity=quantity, price=price)
+
+def replay_reference(timelines: list[list]) -> list[tuple[Decimal, Decimal]]:
+    results = []
+
+    for timeline in timelines:
+        quantity, total_cost = ZERO, ZERO
+
+        for item in timeline:
+            quantity, total_cost, _ = position_replay.apply_item(item, quantity, total_cost)
+            results.append((quantity, total_cost / quantity if quantity > 0 else ZERO))
+
+    return results
+
+def replay_kernel(timelines: list[list[tuple]]) -> list[tuple[Decimal, Decimal]]:
+    results = []
+
+    for timeline in timelines:
+        steps = [
+            position_replay.encode_note(*row[1:]) if row[0] == "note"
+            else position_replay.encode_event(*row[1:])
+            for row in timeline
+        ]
+
+        for _, _, quantity, total_cost in position_replay.replay(steps, ZERO, ZERO):
+            results.append((quantity, total_cost / quantity if quantity > 0 else ZERO))
+
+    return results
+
+def count_mismatches(expected: list, actual: list) -> int:
+    return sum(
+        1
+        for (quantity, avg_price), (other_quantity, other_avg_price) in zip(expected, actual)
+        if quantity.quantize(SNAPSHOT_SCALE) != other_quantity.quantize(SNAPSHOT_SCALE)
+        or avg_price.quantize(SNAPSHOT_SCALE) != other_avg_price.quantize(SNAPSHOT_SCALE)
+    )
+
+def timed(label: str, count: int, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:8.2f}s  {count / elapsed:12,.0f} events/s")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--per-asset", type=int, default=500, help="events per asset timeline")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    timelines = build_timelines(args.events, args.per_asset, args.seed)
+    models = [[to_model(row) for row in timeline] for timeline in timelines]
+
+    reference = timed("reference (apply_item)", args.events, lambda: replay_reference(models))
+    kernel = timed("kernel (encode + replay)", args.events, lambda: replay_kernel(timelines))
+
+    print(f"\nmismatches after quantization: {count_mismatches(reference, kernel)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Compare SQLite pragma profiles on a synthetic dataset:
+
+- rebuild: PositionSnapshotService.rebuild_all()
+- edits: broker notes created one by one through BrokerNoteService, each
+  committed and followed by its incremental snapshot rebuild
+- lists: the position, allocation and broker note year queries used by the UI
+
+Each profile gets its own fresh database file; "sqlite-default" applies no
+pragmas at all (rollback journal, synchronous=FULL).
+
+Usage:
+    poetry run python benchmarks/sqlite_profiles.py --assets 1000 --notes 30
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from holdings_tracker_desktop.models.broker_note import OperationType
+from holdings_tracker_desktop.schemas.broker_note import BrokerNoteCreate
+from holdings_tracker_desktop.services.broker_note_service import BrokerNoteService
+from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
+from holdings_tracker_desktop.services.read_cache import read_cache
+from holdings_tracker_desktop.utils.sqlite_profiles import SQLITE_PROFILES
+
+from synthetic import START_DATE, create_database, populate, remove_database
+
+def run_profile(profile: str | None, args) -> dict[str, float]:
+    engine, SessionLocal, path = create_database(profile=profile)
+
+    try:
+        with SessionLocal() as db:
+            populate(db, assets=args.assets, notes_per_asset=args.notes)
+
+        with SessionLocal() as db:
+            start = time.perf_counter()
+            PositionSnapshotService(db).rebuild_all()
+            rebuild = time.perf_counter() - start
+
+        rng = random.Random(7)
+        latest_day = START_DATE + timedelta(days=args.notes * 10)
+
+        with SessionLocal() as db:
+            service = BrokerNoteService(db)
+            start = time.perf_counter()
+
+            for _ in range(args.edits):
+                service.create(BrokerNoteCreate(
+                    date=latest_day - timedelta(days=rng.randint(0, 365)),
+                    operation=OperationType.BUY,
+                    broker_id=1,
+                    asset_id=rng.randint(1, args.assets),
+                    quantity=Decimal(rng.randint(1, 100)),
+                    price=Decimal(rng.randint(500, 20000)) / 100,
+                    fees=Decimal("1.50")
+                ))
+
+            edit = (time.perf_counter() - start) / args.edits
+
+        list_timings = []
+        for _ in range(args.repeat):
+            with SessionLocal() as db:
+                start = time.perf_counter()
+                year = latest_day.year
+                PositionSnapshotService(db).list_all_for_ui_by_year(year)
+                PositionSnapshotService(db).get_allocation_by_asset(year)
+                PositionSnapshotService(db).get_allocation_by_sector(year)
+                BrokerNoteService(db).list_by_year_for_ui(year)
+                list_timings.append(time.perf_counter() - start)
+
+        return {
+            "rebuild": rebuild,
+            "edit": edit,
+            "lists": statistics.median(list_timings)
+        }
+
+    finally:
+        engine.dispose()
+        remove_database(path)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, default=1000)
+    parser.add_argument("--notes", type=int, default=30, help="broker notes per asset")
+    parser.add_argument("--edits", type=int, default=200, help="broker notes created one by one")
+    parser.add_argument("--repeat", type=int, default=20, help="runs of the list queries")
+    args = parser.parse_args()
+
+    # The list timings compare the queries across profiles.
+    read_cache.enabled = False
+
+    print(f"{args.assets} assets x {args.notes} notes, {args.edits} edits, {args.repeat} list runs\n")
+    print(f"{'profile':<16} {'rebuild_all':>12} {'edit (ms)':>10} {'lists (ms)':>11}")
+
+    for profile in [None, *SQLITE_PROFILES]:
+        result = run_profile(profile, args)
+        print(
+            f"{profile or 'sqlite-default':<16} {result['rebuild']:11.2f}s "
+            f"{result['edit'] * 1000:10.2f} {result['lists'] * 1000:11.2f}"
+        )
+
+if __name__ == "__main__":
+    main()
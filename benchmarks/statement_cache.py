@@ -0,0 +1,225 @@
+"""
+Measure the Python-side cost per call of the hot read paths:
+
+- legacy: the previous session.query() implementations, rebuilt on every call
+- cached: the service methods, built from lambda_stmt() statements whose
+  construction and cache key are reused across calls
+
+The dataset is kept small so SQLite execution time is negligible and the
+difference is dominated by statement construction and compilation lookup.
+Both sides are checked to return the same results before timing (compared
+field by field where the cached path returns lightweight rows instead of
+dicts).
+
+Usage:
+    poetry run python benchmarks/statement_cache.py --calls 2000
+"""
+import argparse
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import aliased
+
+from holdings_tracker_desktop.models import (
+    Asset, AssetSector, BrokerNote, PositionCheckpoint, PositionSnapshot
+)
+from holdings_tracker_desktop.schemas.ui_rows import BrokerNoteRow
+from holdings_tracker_desktop.services.asset_service import AssetService
+from holdings_tracker_desktop.services.broker_note_service import BrokerNoteService
+from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
+from holdings_tracker_desktop.services.read_cache import read_cache
+from holdings_tracker_desktop.utils.dates import year_range
+from holdings_tracker_desktop.utils.exceptions import ConflictException
+
+from synthetic import START_DATE, create_database, populate, remove_database
+
+def legacy_checkpoint_year_as_of(year):
+    earlier = aliased(PositionCheckpoint)
+
+    return (
+        select(func.max(earlier.year))
+        .where(earlier.asset_id == PositionCheckpoint.asset_id, earlier.year <= year)
+        .correlate(PositionCheckpoint)
+        .scalar_subquery()
+    )
+
+def legacy_allocation_by_asset(db, year):
+    total_cost = func.sum(PositionCheckpoint.total_cost).label("total_cost")
+
+    rows = (
+        db.query(Asset.ticker, total_cost)
+        .select_from(Asset)
+        .join(PositionCheckpoint, PositionCheckpoint.asset_id == Asset.id)
+        .filter(PositionCheckpoint.year == legacy_checkpoint_year_as_of(year))
+        .group_by(Asset.ticker)
+        .order_by(total_cost.desc())
+        .all()
+    )
+
+    return [{"label": ticker, "value": float(total)} for ticker, total in rows if total > 0]
+
+def legacy_allocation_by_sector(db, year):
+    total_cost = func.sum(PositionCheckpoint.total_cost).label("total_cost")
+    sector_label = func.coalesce(AssetSector.name, "Unclassified").label("sector_name")
+
+    rows = (
+        db.query(sector_label, total_cost)
+        .select_from(Asset)
+        .join(PositionCheckpoint, PositionCheckpoint.asset_id == Asset.id)
+        .filter(PositionCheckpoint.year == legacy_checkpoint_year_as_of(year))
+        .outerjoin(AssetSector, AssetSector.id == Asset.sector_id)
+        .group_by(sector_label)
+        .order_by(total_cost.desc())
+        .all()
+    )
+
+    return [{"label": sector, "value": float(total)} for sector, total in rows if total and total > 0]
+
+def legacy_broker_notes_by_year(db, year, limit):
+    start, end = year_range(year)
+
+    notes = (
+        db.query(BrokerNote)
+        .filter(BrokerNote.date >= start, BrokerNote.date < end)
+        .order_by(BrokerNote.date.desc())
+        .offset(0)
+        .limit(limit)
+        .all()
+    )
+
+    return [note.to_ui_dict() for note in notes]
+
+def legacy_state_before(db, asset_id, from_date):
+    start, _ = year_range(from_date.year)
+
+    snapshot = (
+        db.query(PositionSnapshot)
+        .filter(
+            PositionSnapshot.asset_id == asset_id,
+            PositionSnapshot.snapshot_date >= start,
+            PositionSnapshot.snapshot_date < from_date
+        )
+        .order_by(PositionSnapshot.snapshot_date.desc(), PositionSnapshot.id.desc())
+        .first()
+    )
+
+    if not snapshot:
+        snapshot = (
+            db.query(PositionSnapshot)
+            .join(PositionCheckpoint, PositionCheckpoint.snapshot_id == PositionSnapshot.id)
+            .filter(PositionCheckpoint.asset_id == asset_id, PositionCheckpoint.year < from_date.year)
+            .order_by(PositionCheckpoint.year.desc())
+            .first()
+        )
+
+    if not snapshot:
+        return Decimal("0"), Decimal("0")
+
+    return snapshot.quantity, snapshot.total_cost
+
+def legacy_ticker_exists(db, ticker, exclude_id):
+    query = db.query(Asset).filter(func.lower(Asset.ticker) == ticker.lower())
+
+    if exclude_id is not None:
+        query = query.filter(Asset.id != exclude_id)
+
+    return db.query(query.exists()).scalar()
+
+def ticker_exists(service, ticker, exclude_id):
+    try:
+        service._ensure_ticker_is_unique(ticker, exclude_id)
+        return False
+    except ConflictException:
+        return True
+
+def row_fields(rows):
+    """UI dicts or BrokerNoteRows as comparable tuples of the row fields"""
+    return [tuple(row[field] for field in BrokerNoteRow._fields) for row in rows]
+
+def per_call(fn, calls: int) -> float:
+    fn()
+    start = time.perf_counter()
+
+    for _ in range(calls):
+        fn()
+
+    return (time.perf_counter() - start) / calls
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, default=20)
+    parser.add_argument("--notes", type=int, default=10, help="broker notes per asset")
+    parser.add_argument("--calls", type=int, default=2000, help="calls timed per path")
+    args = parser.parse_args()
+
+    # Measure statement construction, not cached service results.
+    read_cache.enabled = False
+
+    engine, SessionLocal, path = create_database()
+
+    try:
+        with SessionLocal() as db:
+            populate(db, assets=args.assets, notes_per_asset=args.notes)
+
+        with SessionLocal() as db:
+            PositionSnapshotService(db).rebuild_all()
+
+        with SessionLocal() as db:
+            snapshots = PositionSnapshotService(db)
+            notes = BrokerNoteService(db)
+            assets = AssetService(db)
+
+            year = (START_DATE + timedelta(days=args.notes * 5)).year
+            state_date = START_DATE + timedelta(days=args.notes * 5)
+
+            paths = [
+                (
+                    "get_allocation_by_asset",
+                    lambda: legacy_allocation_by_asset(db, year),
+                    lambda: snapshots.get_allocation_by_asset(year)
+                ),
+                (
+                    "get_allocation_by_sector",
+                    lambda: legacy_allocation_by_sector(db, year),
+                    lambda: snapshots.get_allocation_by_sector(year)
+                ),
+                (
+                    "list_by_year_for_ui",
+                    lambda: legacy_broker_notes_by_year(db, year, 20),
+                    lambda: notes.list_by_year_for_ui(year, limit=20)
+                ),
+                (
+                    "_load_state_before",
+                    lambda: legacy_state_before(db, 1, state_date),
+                    lambda: snapshots._load_state_before(1, state_date)
+                ),
+                (
+                    "_ensure_ticker_is_unique",
+                    lambda: legacy_ticker_exists(db, "syn000001", 2),
+                    lambda: ticker_exists(assets, "syn000001", 2)
+                ),
+            ]
+
+            print(f"{args.assets} assets x {args.notes} notes, {args.calls} calls per path\n")
+            print(f"{'path':<30} {'legacy (us)':>12} {'cached (us)':>12} {'speedup':>8}")
+
+            comparable = {"list_by_year_for_ui": row_fields}
+
+            for label, legacy, cached in paths:
+                normalize = comparable.get(label, lambda result: result)
+
+                if normalize(legacy()) != normalize(cached()):
+                    raise AssertionError(f"{label}: legacy and cached results differ")
+
+                before = per_call(legacy, args.calls)
+                after = per_call(cached, args.calls)
+                print(f"{label:<30} {before * 1e6:12.1f} {after * 1e6:12.1f} {before / after:7.2f}x")
+
+    finally:
+        engine.dispose()
+        remove_database(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Synthetic dataset helpers shared by the benchmark scripts.
+
+Builds a throwaway SQLite database with the application schema and fills it
+with random broker notes and asset events, without going through config.py.
+"""
+import os
+import random
+import tempfile
+from datetime import date as Date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from holdings_tracker_desktop.models import (
+    Asset, AssetEvent, AssetSector, AssetType, Broker, BrokerNote, Country, Currency
+)
+from holdings_tracker_desktop.models.asset_event import AssetEventType
+from holdings_tracker_desktop.models.base import Base
+from holdings_tracker_desktop.models.broker_note import OperationType
+from holdings_tracker_desktop.utils.sqlite_profiles import apply_sqlite_profile
+
+START_DATE = Date(2010, 1, 4)
+
+def create_database(path: str | None = None, profile: str | None = None):
+    """
+    Create an empty database file and return (engine, session factory, path).
+
+    When profile is given, its SQLite pragmas are applied to every connection;
+    otherwise SQLite defaults are used.
+    """
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix="holdings_bench_", suffix=".db")
+        os.close(fd)
+
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+    if profile is not None:
+        apply_sqlite_profile(engine, profile)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    return engine, sessionmaker(autoflush=False, bind=engine), path
+
+def remove_database(path: str) -> None:
+    """Delete a database file together with its WAL and shared-memory files."""
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+def populate(
+    db: Session,
+    assets: int,
+    notes_per_asset: int,
+    events_per_asset: int = 1,
+    seed: int = 42
+) -> None:
+    """Insert reference data, assets and a random note/event history per asset."""
+    rng = random.Random(seed)
+
+    db.add(Country(id=1, name="Brasil"))
+    db.add(Currency(id=1, code="BRL", name="Real Brasileiro", symbol="R$"))
+    db.flush()
+    db.add(AssetType(id=1, name="FII", country_id=1))
+    db.flush()
+    db.add(AssetSector(id=1, name="Logísticos", asset_type_id=1))
+    db.add(Broker(id=1, name="BB-BI S.A.", country_id=1))
+    db.flush()
+
+    db.execute(insert(Asset), [
+        {
+            "id": asset_id,
+            "ticker": f"SYN{asset_id:06d}",
+            "type_id": 1,
+            "currency_id": 1,
+            "sector_id": 1 if asset_id % 2 else None
+        }
+        for asset_id in range(1, assets + 1)
+    ])
+
+    notes = []
+    events = []
+
+    for asset_id in range(1, assets + 1):
+        day = START_DATE
+        quantity = 0
+
+        for _ in range(notes_per_asset):
+            day += timedelta(days=rng.randint(0, 20))
+            note_quantity = rng.randint(1, 100)
+
+            if quantity > note_quantity and rng.random() < 0.3:
+                operation = OperationType.SELL
+                quantity -= note_quantity
+            else:
+                operation = OperationType.BUY
+                quantity += note_quantity
+
+            notes.append({
+                "date": day,
+                "operation": operation,
+                "broker_id": 1,
+                "asset_id": asset_id,
+                "quantity": Decimal(note_quantity),
+                "price": Decimal(rng.randint(500, 20000)) / 100,
+                "fees": Decimal(rng.randint(0, 500)) / 100,
+                "taxes": Decimal("0"),
+                "note_number": f"{asset_id}-{len(notes)}"
+            })
+
+        for _ in range(events_per_asset):
+            event_date = START_DATE + timedelta(days=rng.randint(0, notes_per_asset * 10))
+            events.append({
+                "asset_id": asset_id,
+                "event_type": AssetEventType.SPLIT,
+                "date": event_date,
+                "factor": Decimal("0.5")
+            })
+
+    if notes:
+        db.execute(insert(BrokerNote), notes)
+
+    if events:
+        db.execute(insert(AssetEvent), events)
+
+    db.commit()
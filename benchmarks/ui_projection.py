@@ -0,0 +1,127 @@
+"""
+Measure time and peak Python memory of listing a year of broker notes:
+
+- legacy: the previous list_by_year_for_ui, loading BrokerNote objects into
+  the session (plus lazy loads of their broker, asset and currency) and
+  turning each into a to_ui_dict() dictionary
+- projection: the service method, selecting only the displayed columns and
+  returning BrokerNoteRow tuples without touching the identity map
+
+The defaults put 50,000 notes in a single year. Each run uses a fresh
+session, so the legacy path pays for its identity map every time. Peak
+memory is traced with tracemalloc in separate runs, so tracing does not
+distort the timings.
+
+Usage:
+    poetry run python benchmarks/ui_projection.py --assets 2500 --notes 20
+"""
+import argparse
+import time
+import tracemalloc
+
+from sqlalchemy import func, select
+
+from holdings_tracker_desktop.models import BrokerNote
+from holdings_tracker_desktop.schemas.ui_rows import BrokerNoteRow
+from holdings_tracker_desktop.services.broker_note_service import BrokerNoteService
+from holdings_tracker_desktop.services.read_cache import read_cache
+from holdings_tracker_desktop.utils.dates import year_range
+
+from synthetic import START_DATE, create_database, populate, remove_database
+
+def legacy_broker_notes_by_year(db, year, limit):
+    start, end = year_range(year)
+
+    notes = (
+        db.query(BrokerNote)
+        .filter(BrokerNote.date >= start, BrokerNote.date < end)
+        .order_by(BrokerNote.date.desc())
+        .offset(0)
+        .limit(limit)
+        .all()
+    )
+
+    return [note.to_ui_dict() for note in notes]
+
+def row_fields(rows):
+    return [tuple(row[field] for field in BrokerNoteRow._fields) for row in rows]
+
+def best_time(SessionLocal, fn, runs: int) -> float:
+    timings = []
+
+    for _ in range(runs):
+        with SessionLocal() as db:
+            start = time.perf_counter()
+            fn(db)
+            timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+def peak_memory(SessionLocal, fn) -> int:
+    with SessionLocal() as db:
+        tracemalloc.start()
+
+        try:
+            rows = fn(db)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        del rows
+
+    return peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, default=2500)
+    parser.add_argument("--notes", type=int, default=20, help="broker notes per asset")
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per path (best is kept)")
+    args = parser.parse_args()
+
+    # Every timed run must go to the database.
+    read_cache.enabled = False
+
+    engine, SessionLocal, path = create_database()
+    year = START_DATE.year
+
+    try:
+        with SessionLocal() as db:
+            populate(db, assets=args.assets, notes_per_asset=args.notes, events_per_asset=0)
+
+        with SessionLocal() as db:
+            start, end = year_range(year)
+            limit = db.scalar(
+                select(func.count(BrokerNote.id)).where(BrokerNote.date >= start, BrokerNote.date < end)
+            )
+
+        paths = [
+            ("legacy", lambda db: legacy_broker_notes_by_year(db, year, limit)),
+            ("projection", lambda db: BrokerNoteService(db).list_by_year_for_ui(year, limit=limit)),
+        ]
+
+        with SessionLocal() as db:
+            legacy, projection = (fn(db) for _, fn in paths)
+
+            if row_fields(legacy) != row_fields(projection):
+                raise AssertionError("legacy and projection results differ")
+
+        print(f"{limit} broker notes in {year}, best of {args.runs} runs\n")
+        print(f"{'path':<12} {'time (ms)':>10} {'peak (MiB)':>11}")
+
+        results = []
+
+        for label, fn in paths:
+            elapsed = best_time(SessionLocal, fn, args.runs)
+            peak = peak_memory(SessionLocal, fn)
+            results.append((elapsed, peak))
+            print(f"{label:<12} {elapsed * 1e3:10.1f} {peak / 2**20:11.1f}")
+
+        (before_time, before_peak), (after_time, after_peak) = results
+        print(f"\nspeedup {before_time / after_time:.2f}x, peak memory {before_peak / after_peak:.2f}x lower")
+
+    finally:
+        engine.dispose()
+        remove_database(path)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from logging.config import fileConfig
 from alembic import context
 from src.holdings_tracker_desktop.models.base import Base
+from src.holdings_tracker_desktop.models.search_index import SEARCH_INDEXES
 from src.holdings_tracker_desktop.database import engine
 
 # this is the Alembic Config object, which provides
@@ -18,6 +19,17 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names) -> bool:
+    """Leave the FTS5 search indexes and their shadow tables out of autogenerate"""
+    if type_ != "table":
+        return True
+
+    return not any(
+        name == index.name or name.startswith(f"{index.name}_")
+        for index in SEARCH_INDEXES.values()
+    )
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -40,6 +52,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -59,7 +72,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name
         )
 
         with context.begin_transaction():
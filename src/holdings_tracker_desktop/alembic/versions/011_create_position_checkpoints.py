@@ -0,0 +1,54 @@
+"""create position checkpoints
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011'
+down_revision: Union[str, Sequence[str], None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('position_checkpoints',
+    sa.Column('asset_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('snapshot_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=20, scale=6), nullable=False),
+    sa.Column('total_cost', sa.Numeric(precision=20, scale=6), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.ForeignKeyConstraint(['asset_id'], ['assets.id'], ),
+    sa.ForeignKeyConstraint(['snapshot_id'], ['position_snapshots.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('asset_id', 'year', name='uq_position_checkpoints_asset_id_year')
+    )
+    op.create_index(op.f('ix_position_checkpoints_id'), 'position_checkpoints', ['id'], unique=False)
+
+    # Backfill from the existing snapshots: the last snapshot of each
+    # (asset, year) is the one with the highest id.
+    op.execute("""
+        INSERT INTO position_checkpoints (asset_id, year, snapshot_id, quantity, total_cost)
+        SELECT asset_id, CAST(strftime('%Y', snapshot_date) AS INTEGER), id, quantity, quantity * avg_price
+        FROM position_snapshots
+        WHERE id IN (
+            SELECT max(id)
+            FROM position_snapshots
+            GROUP BY asset_id, strftime('%Y', snapshot_date)
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_position_checkpoints_id'), table_name='position_checkpoints')
+    op.drop_table('position_checkpoints')
@@ -0,0 +1,33 @@
+"""add date indexes
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '012'
+down_revision: Union[str, Sequence[str], None] = '011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_broker_notes_asset_id_date', 'broker_notes', ['asset_id', 'date'], unique=False)
+    op.create_index('ix_broker_notes_date', 'broker_notes', ['date'], unique=False)
+    op.create_index('ix_asset_events_asset_id_date', 'asset_events', ['asset_id', 'date'], unique=False)
+    op.create_index('ix_position_snapshots_asset_id_snapshot_date_id', 'position_snapshots', ['asset_id', 'snapshot_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_position_snapshots_asset_id_snapshot_date_id', table_name='position_snapshots')
+    op.drop_index('ix_asset_events_asset_id_date', table_name='asset_events')
+    op.drop_index('ix_broker_notes_date', table_name='broker_notes')
+    op.drop_index('ix_broker_notes_asset_id_date', table_name='broker_notes')
@@ -0,0 +1,51 @@
+"""create year summaries
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '013'
+down_revision: Union[str, Sequence[str], None] = '012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('year_summaries',
+    sa.Column('year', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('broker_note_count', sa.Integer(), nullable=False),
+    sa.Column('snapshot_asset_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('year')
+    )
+
+    # Backfill from the existing broker notes and position checkpoints.
+    op.execute("""
+        INSERT INTO year_summaries (year, broker_note_count, snapshot_asset_count)
+        SELECT year, sum(broker_note_count), sum(snapshot_asset_count)
+        FROM (
+            SELECT CAST(strftime('%Y', date) AS INTEGER) AS year,
+                   count(*) AS broker_note_count,
+                   0 AS snapshot_asset_count
+            FROM broker_notes
+            GROUP BY 1
+            UNION ALL
+            SELECT year, 0, count(*)
+            FROM position_checkpoints
+            GROUP BY year
+        )
+        GROUP BY year
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('year_summaries')
@@ -0,0 +1,32 @@
+"""create search indexes
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.holdings_tracker_desktop.models.search_index import drop_search_index_ddl, search_index_ddl
+
+
+# revision identifiers, used by Alembic.
+revision: str = '014'
+down_revision: Union[str, Sequence[str], None] = '013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FTS5 tables and their sync triggers, filled from the existing rows.
+    for statement in search_index_ddl():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for statement in drop_search_index_ddl():
+        op.execute(statement)
@@ -0,0 +1,34 @@
+"""add conversion index
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '015'
+down_revision: Union[str, Sequence[str], None] = '014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_asset_events_converted_to_asset_id_date',
+        'asset_events',
+        ['converted_to_asset_id', 'date'],
+        unique=False,
+        sqlite_where=sa.text('converted_to_asset_id IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_asset_events_converted_to_asset_id_date', table_name='asset_events')
@@ -23,3 +23,11 @@ def str_to_bool(value: str, default=False) -> bool:
 # ---------------------------------------------------------
 DATABASE_URL = os.getenv("DATABASE_URL")
 SQL_ECHO = str_to_bool(os.getenv("SQL_ECHO"), default=False)
+
+# JSON-lines file receiving per-operation query statistics at exit (off when unset).
+SQL_STATS_FILE = os.getenv("SQL_STATS_FILE")
+
+# Pragma profile for SQLite connections: "safe", "fast" or "bulk-import".
+# SQLITE_PRAGMAS overrides single pragmas, e.g. "cache_size=-20000,mmap_size=0".
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "safe")
+SQLITE_PRAGMAS = os.getenv("SQLITE_PRAGMAS")
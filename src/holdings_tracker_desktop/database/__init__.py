@@ -1,12 +1,21 @@
-from .database import get_db, SessionLocal, engine
+from .database import get_db, get_read_db, unit_of_work, SessionLocal, ReadSessionLocal, engine, read_engine
+from .unit_of_work import UnitOfWork
 
-__all__ = ['get_db', 'SessionLocal', 'engine']
+__all__ = [
+    'get_db', 'get_read_db', 'unit_of_work', 'UnitOfWork',
+    'SessionLocal', 'ReadSessionLocal', 'engine', 'read_engine'
+]
 
 """
 Database session management for Holdings Tracker Desktop.
 
 Provides:
 - get_db(): Context manager for database sessions
+- get_read_db(): Context manager for read-only sessions used by UI queries
+- unit_of_work(): Context manager sharing one transaction and session across
+  a user interaction; get_db()/get_read_db() join it while it is active
 - SessionLocal: Session factory
+- ReadSessionLocal: Read-only session factory
 - engine: SQLAlchemy engine instance
+- read_engine: Read-only engine (same as engine for in-memory databases)
 """
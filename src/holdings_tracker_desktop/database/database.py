@@ -1,7 +1,26 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
-from holdings_tracker_desktop.config import DATABASE_URL, SQL_ECHO
+from holdings_tracker_desktop.config import DATABASE_URL, SQL_ECHO, SQL_STATS_FILE, SQLITE_PRAGMAS, SQLITE_PROFILE
+from holdings_tracker_desktop.utils.sql_instrumentation import enable_sql_stats
+from holdings_tracker_desktop.utils.sqlite_profiles import apply_sqlite_profile
+from .unit_of_work import UnitOfWork
+
+def _read_only_url(url: URL) -> URL | None:
+    """
+    Get a mode=ro URI for a file-backed SQLite database, or None when the
+    database cannot be opened by a second engine (in-memory or non-SQLite).
+    """
+    if url.get_backend_name() != "sqlite":
+        return None
+
+    database = url.database
+
+    if not database or database == ":memory:" or database.startswith("file:"):
+        return None
+
+    return url.set(database=f"file:{database}", query={**url.query, "mode": "ro", "uri": "true"})
 
 # SQLite requires check_same_thread=False in GUI applications.
 engine = create_engine(
@@ -10,14 +29,69 @@ engine = create_engine(
     connect_args={"check_same_thread": False}
 )
 
+apply_sqlite_profile(engine, SQLITE_PROFILE, SQLITE_PRAGMAS)
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine
 )
 
+# UI reads go through a separate pool of read-only connections. Under WAL
+# they see the last committed state and never wait on a background write.
+read_url = _read_only_url(make_url(DATABASE_URL))
+
+if read_url is not None:
+    read_engine = create_engine(
+        read_url,
+        echo=SQL_ECHO,
+        connect_args={"check_same_thread": False}
+    )
+
+    apply_sqlite_profile(read_engine, SQLITE_PROFILE, SQLITE_PRAGMAS, read_only=True)
+else:
+    read_engine = engine
+
+if SQL_STATS_FILE:
+    enable_sql_stats(SQL_STATS_FILE, engine, read_engine)
+
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine
+)
+
+@contextmanager
+def unit_of_work(read_only: bool = False, expire_on_commit: bool = False):
+    """
+    Run a user interaction in a single UnitOfWork.
+
+    Nested calls join the active unit of work, except for a read-write unit
+    requested inside a read-only one, which gets its own transaction.
+    """
+    current = UnitOfWork.current()
+
+    if current is not None and (read_only or not current.read_only):
+        yield current
+        return
+
+    if read_only:
+        uow = UnitOfWork(read_engine, ReadSessionLocal, read_only=True, expire_on_commit=expire_on_commit)
+    else:
+        uow = UnitOfWork(engine, SessionLocal, expire_on_commit=expire_on_commit)
+
+    with uow:
+        yield uow
+
 @contextmanager
 def get_db():
+    uow = UnitOfWork.current()
+
+    if uow is not None and not uow.read_only:
+        with uow.savepoint() as db:
+            yield db
+        return
+
     db = SessionLocal()
     try:
         yield db
@@ -27,3 +101,18 @@ def get_db():
         raise
     finally:
         db.close()
+
+@contextmanager
+def get_read_db():
+    """Session for queries only; it is never committed"""
+    uow = UnitOfWork.current()
+
+    if uow is not None:
+        yield uow.session
+        return
+
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
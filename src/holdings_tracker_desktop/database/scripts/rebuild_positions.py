@@ -0,0 +1,36 @@
+import argparse
+
+from holdings_tracker_desktop.database import SessionLocal
+from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
+
+def run_rebuild_positions():
+    parser = argparse.ArgumentParser(description="Rebuild all position snapshots.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "number of worker processes replaying assets in parallel (default: 1). "
+            "Worker start-up and shipping rows back cost more than the replay "
+            "saves on small portfolios, and the load and bulk write stay serial; "
+            "only try more than 1 with thousands of assets on a machine with "
+            "that many free cores, and compare against --workers 1"
+        )
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+
+    try:
+        service = PositionSnapshotService(db)
+        count = service.rebuild_all(workers=args.workers)
+        print(f"Position snapshots rebuilt successfully! ({count} rows)")
+
+    except Exception as e:
+        print("Rebuild error:", e)
+
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_rebuild_positions()
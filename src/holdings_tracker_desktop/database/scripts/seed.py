@@ -1,55 +1,54 @@
-from holdings_tracker_desktop.database import SessionLocal
+from holdings_tracker_desktop.database import unit_of_work
 from holdings_tracker_desktop.models import Country, Currency, AssetSector, AssetType, Broker
+from holdings_tracker_desktop.repositories.base_repository import BaseRepository
+from holdings_tracker_desktop.schemas.asset_sector import AssetSectorCreate, AssetSectorUpdate
+from holdings_tracker_desktop.schemas.asset_type import AssetTypeCreate, AssetTypeUpdate
+from holdings_tracker_desktop.schemas.broker import BrokerCreate, BrokerUpdate
+from holdings_tracker_desktop.schemas.country import CountryCreate, CountryUpdate
+from holdings_tracker_desktop.schemas.currency import CurrencyCreate, CurrencyUpdate
 
 def run_seeds():
-    db = SessionLocal()
-
+    # One transaction for the whole seed; each create_many only releases a savepoint.
     try:
-        countries = [
-            Country(name="Brasil"),
-            Country(name="United States")
-        ]
-        db.add_all(countries)
-
-        currencies = [
-            Currency(code="BRL", name="Real Brasileiro", symbol="R$"),
-            Currency(code="USD", name="United States Dollar", symbol="$")
-        ]
-        db.add_all(currencies)
-
-        asset_types = [
-            AssetType(name="Ação", country_id=1),
-            AssetType(name="Fiagro", country_id=1),
-            AssetType(name="FI-Infra", country_id=1),
-            AssetType(name="FII", country_id=1),
-            AssetType(name="Reit", country_id=2),
-            AssetType(name="Stock", country_id=2)
-        ]
-        db.add_all(asset_types)
-
-        asset_sector = [
-            AssetSector(name="Híbridos", asset_type_id=4),
-            AssetSector(name="Lajes Comerciais", asset_type_id=4),
-            AssetSector(name="Logísticos", asset_type_id=4),
-            AssetSector(name="Recebíveis Imobiliários", asset_type_id=4),
-            AssetSector(name="Shoppings", asset_type_id=4)
-        ]
-        db.add_all(asset_sector)
-
-        brokers = [
-            Broker(name="BB-BI S.A.", country_id=1)
-        ]
-        db.add_all(brokers)
-
-        db.commit()
+        with unit_of_work() as uow:
+            db = uow.session
+
+            brasil, united_states = BaseRepository[Country, CountryCreate, CountryUpdate](Country, db).create_many([
+                {"name": "Brasil"},
+                {"name": "United States"}
+            ])
+
+            BaseRepository[Currency, CurrencyCreate, CurrencyUpdate](Currency, db).create_many([
+                {"code": "BRL", "name": "Real Brasileiro", "symbol": "R$"},
+                {"code": "USD", "name": "United States Dollar", "symbol": "$"}
+            ])
+
+            asset_type_ids = BaseRepository[AssetType, AssetTypeCreate, AssetTypeUpdate](AssetType, db).create_many([
+                {"name": "Ação", "country_id": brasil},
+                {"name": "Fiagro", "country_id": brasil},
+                {"name": "FI-Infra", "country_id": brasil},
+                {"name": "FII", "country_id": brasil},
+                {"name": "Reit", "country_id": united_states},
+                {"name": "Stock", "country_id": united_states}
+            ])
+            fii = asset_type_ids[3]
+
+            BaseRepository[AssetSector, AssetSectorCreate, AssetSectorUpdate](AssetSector, db).create_many([
+                {"name": "Híbridos", "asset_type_id": fii},
+                {"name": "Lajes Comerciais", "asset_type_id": fii},
+                {"name": "Logísticos", "asset_type_id": fii},
+                {"name": "Recebíveis Imobiliários", "asset_type_id": fii},
+                {"name": "Shoppings", "asset_type_id": fii}
+            ])
+
+            BaseRepository[Broker, BrokerCreate, BrokerUpdate](Broker, db).create_many([
+                {"name": "BB-BI S.A.", "country_id": brasil}
+            ])
+
         print("Seeds inserted successfully!")
 
     except Exception as e:
-        db.rollback()
         print("Seed error:", e)
 
-    finally:
-        db.close()
-
 if __name__ == "__main__":
     run_seeds()
@@ -0,0 +1,133 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+_current_unit_of_work: ContextVar[Optional["UnitOfWork"]] = ContextVar("unit_of_work", default=None)
+
+class UnitOfWork:
+    """
+    One database transaction spanning a whole user interaction.
+
+    The session is bound to a connection whose transaction the unit of work
+    owns, with join_transaction_mode="create_savepoint": the commits issued
+    by repositories and services only release a savepoint, and the work is
+    committed once when the block exits without an error (or always rolled
+    back for read-only units).
+
+    While a unit of work is active, get_db() and get_read_db() hand out its
+    session, so every helper of the interaction shares one identity map and
+    reference entities are loaded once. The unit of work keeps a strong
+    reference to every loaded object (the session alone only holds weak
+    ones). Objects are not expired when the inner commits happen unless
+    expire_on_commit=True; expire() refreshes them explicitly.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        session_factory: sessionmaker,
+        read_only: bool = False,
+        expire_on_commit: bool = False
+    ):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.read_only = read_only
+        self.expire_on_commit = expire_on_commit
+        self._session: Session | None = None
+        self._loaded: set = set()
+
+    @staticmethod
+    def current() -> Optional["UnitOfWork"]:
+        """The unit of work active in this thread/context, if any"""
+        return _current_unit_of_work.get()
+
+    @property
+    def session(self) -> Session:
+        if self._session is None:
+            raise RuntimeError("Unit of work is not active")
+
+        return self._session
+
+    def __enter__(self) -> "UnitOfWork":
+        self._connection = self.engine.connect()
+        self._transaction = self._connection.begin()
+
+        if self._connection.dialect.name == "sqlite":
+            # pysqlite only opens a transaction right before DML, so the first
+            # SAVEPOINT would start (and its RELEASE commit) the transaction.
+            # Begin it now so savepoints nest and every read sees one snapshot.
+            self._connection.exec_driver_sql("BEGIN")
+
+        self._session = self.session_factory(
+            bind=self._connection,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=self.expire_on_commit
+        )
+        event.listen(self._session, "loaded_as_persistent", self._keep_loaded)
+        event.listen(self._session, "pending_to_persistent", self._keep_loaded)
+        self._token = _current_unit_of_work.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _current_unit_of_work.reset(self._token)
+        commit = exc_type is None and not self.read_only
+
+        try:
+            if commit:
+                self._session.commit()
+
+            self._session.close()
+
+            if commit:
+                self._transaction.commit()
+            else:
+                self._transaction.rollback()
+        finally:
+            self._connection.close()
+            self._session = None
+            self._loaded.clear()
+
+    @contextmanager
+    def savepoint(self):
+        """
+        Nested block whose changes are rolled back alone if it raises,
+        leaving the rest of the unit of work intact.
+
+        The savepoint is taken on the connection, below the savepoints of
+        the session, so commits issued inside the block stay inside it. On
+        rollback the identity map is cleared, since it may hold rows the
+        rollback removed.
+        """
+        session = self.session
+
+        # Release the session's current savepoint first, so the block's
+        # savepoint is not released along with it by the next commit.
+        session.commit()
+        savepoint = self._connection.begin_nested()
+
+        try:
+            yield session
+            session.commit()
+        except:
+            session.rollback()
+            savepoint.rollback()
+            session.expunge_all()
+            self._loaded.clear()
+            raise
+        else:
+            savepoint.commit()
+
+    def expire(self, *instances) -> None:
+        """Expire the given instances, or the whole identity map when none are given"""
+        if not instances:
+            self.session.expire_all()
+
+        for instance in instances:
+            self.session.expire(instance)
+
+    def _keep_loaded(self, session: Session, instance) -> None:
+        self._loaded.add(instance)
@@ -7,7 +7,9 @@ from .broker import Broker
 from .broker_note import BrokerNote
 from .country import Country
 from .currency import Currency
+from .position_checkpoint import PositionCheckpoint
 from .position_snapshot import PositionSnapshot
+from .year_summary import YearSummary
 
 __all__ = [
     "Asset",
@@ -19,5 +21,7 @@ __all__ = [
     "BrokerNote",
     "Country",
     "Currency",
+    "PositionCheckpoint",
     "PositionSnapshot",
+    "YearSummary",
 ]
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
     from .asset_type import AssetType
     from .broker_note import BrokerNote
     from .currency import Currency
+    from .position_checkpoint import PositionCheckpoint
     from .position_snapshot import PositionSnapshot
     from .asset_ticker_history import AssetTickerHistory
 
@@ -68,6 +69,12 @@ class Asset(AuditableModel):
         lazy="dynamic"
     )
 
+    checkpoints: Mapped[list[PositionCheckpoint]] = relationship(
+        back_populates="asset",
+        cascade="all, delete-orphan",
+        lazy="dynamic"
+    )
+
     events: Mapped[list[AssetEvent]] = relationship(
         back_populates="asset",
         foreign_keys="[AssetEvent.asset_id]",
@@ -138,18 +145,26 @@ class Asset(AuditableModel):
 
         return True, ""
 
-    def to_ui_dict(self) -> dict:
+    def to_ui_dict(self, counts: dict[str, int] | None = None) -> dict:
         """Optimized for PySide6 table widgets"""
+        if counts is None:
+            counts = {
+                'broker_notes': self.broker_notes_count,
+                'snapshots': self.snapshots_count,
+                'events': self.events_count,
+                'ticker_histories': self.ticker_histories_count,
+            }
+
         return {
             'id': self.id,
             'ticker': self.ticker,
             'type_name': self.asset_type.name if self.asset_type else '',
             'currency_code': self.currency.code if self.currency else '',
             'sector_name': self.sector.name if self.sector else '',
-            'broker_notes_count': self.broker_notes_count,
-            'snapshots_count': self.snapshots_count,
-            'events_count': self.events_count,
-            'ticker_histories_count': self.ticker_histories_count,
+            'broker_notes_count': counts['broker_notes'],
+            'snapshots_count': counts['snapshots'],
+            'events_count': counts['events'],
+            'ticker_histories_count': counts['ticker_histories'],
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
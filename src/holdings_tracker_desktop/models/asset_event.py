@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
-from sqlalchemy import ForeignKey, Enum, Numeric, Date
+from sqlalchemy import ForeignKey, Enum, Index, Numeric, Date, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from enum import Enum as PyEnum
 from decimal import Decimal
@@ -24,6 +24,14 @@ class AssetEventType(PyEnum):
 
 class AssetEvent(AuditableModel):
     __tablename__ = "asset_events"
+    __table_args__ = (
+        Index("ix_asset_events_asset_id_date", "asset_id", "date"),
+        # Conversions received by an asset; only CONVERSION events set the column.
+        Index(
+            "ix_asset_events_converted_to_asset_id_date", "converted_to_asset_id", "date",
+            sqlite_where=text("converted_to_asset_id IS NOT NULL")
+        ),
+    )
 
     asset_id: Mapped[int] = mapped_column(
         ForeignKey("assets.id"), 
@@ -87,14 +87,20 @@ class AssetType(AuditableModel):
 
         return True, ""
 
-    def to_ui_dict(self) -> dict:
+    def to_ui_dict(self, counts: dict[str, int] | None = None) -> dict:
         """Optimized for PySide6 table widgets"""
+        if counts is None:
+            counts = {
+                'assets': self.assets_count,
+                'sectors': self.sectors_count,
+            }
+
         return {
             'id': self.id,
             'name': self.name,
             'country_name': self.country.name if self.country else '',
-            'assets_count': self.assets_count,
-            'sectors_count': self.sectors_count,
+            'assets_count': counts['assets'],
+            'sectors_count': counts['sectors'],
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
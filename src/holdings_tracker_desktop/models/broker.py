@@ -76,13 +76,18 @@ class Broker(AuditableModel):
 
         return True, ""
 
-    def to_ui_dict(self) -> dict:
+    def to_ui_dict(self, counts: dict[str, int] | None = None) -> dict:
         """Optimized for PySide6 table widgets"""
+        if counts is None:
+            counts = {
+                "broker_notes": self.broker_notes_count,
+            }
+
         return {
             "id": self.id,
             "name": self.name,
             "country_name": self.country.name if self.country else None,
-            "broker_notes_count": self.broker_notes_count,
+            "broker_notes_count": counts["broker_notes"],
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
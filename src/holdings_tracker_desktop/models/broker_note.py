@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
-from sqlalchemy import String, ForeignKey, Enum, Numeric, Date
+from sqlalchemy import String, ForeignKey, Enum, Index, Numeric, Date
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from enum import Enum as PyEnum
 from decimal import Decimal
@@ -17,6 +17,10 @@ class OperationType(PyEnum):
 
 class BrokerNote(AuditableModel):
     __tablename__ = "broker_notes"
+    __table_args__ = (
+        Index("ix_broker_notes_asset_id_date", "asset_id", "date"),
+        Index("ix_broker_notes_date", "date"),
+    )
 
     date: Mapped[Date] = mapped_column(
         Date, 
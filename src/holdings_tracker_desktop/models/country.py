@@ -80,13 +80,19 @@ class Country(AuditableModel):
 
         return True, ""
 
-    def to_ui_dict(self) -> dict:
+    def to_ui_dict(self, counts: dict[str, int] | None = None) -> dict:
         """Optimized for PySide6 table widgets"""
+        if counts is None:
+            counts = {
+                'asset_types': self.asset_types_count,
+                'brokers': self.brokers_count,
+            }
+
         return {
             'id': self.id,
             'name': self.name,
-            'asset_types_count': self.asset_types_count,
-            'brokers_count': self.brokers_count,
+            'asset_types_count': counts['asset_types'],
+            'brokers_count': counts['brokers'],
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
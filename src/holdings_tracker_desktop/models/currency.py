@@ -74,14 +74,19 @@ class Currency(AuditableModel):
 
         return True, ""
 
-    def to_ui_dict(self) -> dict:
+    def to_ui_dict(self, counts: dict[str, int] | None = None) -> dict:
         """Optimized for PySide6 table widgets"""
+        if counts is None:
+            counts = {
+                'assets': self.assets_count,
+            }
+
         return {
             'id': self.id,
             'code': self.code,
             'name': self.name,
             'symbol': self.symbol,
-            'assets_count': self.assets_count,
+            'assets_count': counts['assets'],
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from sqlalchemy import ForeignKey, Integer, Numeric, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from decimal import Decimal
+from .base import IdentifiedModel
+
+if TYPE_CHECKING:
+    from .asset import Asset
+    from .position_snapshot import PositionSnapshot
+
+class PositionCheckpoint(IdentifiedModel):
+    """
+    Position of an asset at the end of a year in which it had snapshots.
+
+    Maintained by PositionSnapshotService alongside the snapshots; points at
+    the last snapshot of the year so "as of year" lookups never aggregate
+    over the whole snapshot history.
+    """
+    __tablename__ = "position_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("asset_id", "year", name="uq_position_checkpoints_asset_id_year"),
+    )
+
+    asset_id: Mapped[int] = mapped_column(
+        ForeignKey("assets.id"),
+        nullable=False
+    )
+
+    year: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False
+    )
+
+    snapshot_id: Mapped[int] = mapped_column(
+        ForeignKey("position_snapshots.id"),
+        nullable=False
+    )
+
+    quantity: Mapped[Decimal] = mapped_column(
+        Numeric(20, 6),
+        nullable=False
+    )
+
+    total_cost: Mapped[Decimal] = mapped_column(
+        Numeric(20, 6),
+        nullable=False
+    )
+
+    asset: Mapped[Asset] = relationship(
+        back_populates="checkpoints",
+        cascade="save-update",
+        lazy="selectin"
+    )
+
+    snapshot: Mapped[PositionSnapshot] = relationship(
+        lazy="select"
+    )
+
+    def __repr__(self) -> str:
+        return f"<PositionCheckpoint(id={self.id}, asset_id={self.asset_id}, year={self.year})>"
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
-from sqlalchemy import ForeignKey, Numeric, Date, String
+from sqlalchemy import ForeignKey, Index, Numeric, Date, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from decimal import Decimal
 from .base import IdentifiedModel
@@ -11,6 +11,9 @@ if TYPE_CHECKING:
 
 class PositionSnapshot(IdentifiedModel):
     __tablename__ = "position_snapshots"
+    __table_args__ = (
+        Index("ix_position_snapshots_asset_id_snapshot_date_id", "asset_id", "snapshot_date", "id"),
+    )
 
     asset_id: Mapped[int] = mapped_column(
         ForeignKey("assets.id"), 
@@ -0,0 +1,194 @@
+"""
+SQLite FTS5 search indexes.
+
+Each indexed table has a standalone FTS5 table whose rowid is the id of the
+indexed row, kept in sync by triggers. The asset index also holds every old
+and new ticker of the asset's ticker histories, so an asset can be found by
+a ticker it no longer uses.
+
+The same DDL is issued by the alembic migration and, for databases built
+with Base.metadata.create_all(), by the after_create hook below.
+"""
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import event, table, column
+from sqlalchemy.sql.expression import TableClause
+
+from .base import Base
+
+TOKENIZE = "unicode61"
+
+# Prefix indexes for the 2 and 3 character prefixes users type first.
+PREFIX = "2 3"
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """FTS5 table indexing some text columns of a table"""
+    name: str
+    source: str
+    columns: tuple[str, ...]
+
+    @property
+    def fts(self) -> TableClause:
+        """Lightweight table construct for querying the index"""
+        return table(self.name, column("rowid"), column("rank"), *[column(c) for c in self.columns])
+
+    def match(self, text: str, columns: tuple[str, ...] = ()) -> str | None:
+        """
+        match_query(text), optionally restricted to some of the index
+        columns. None when text has no searchable word.
+        """
+        query = match_query(text)
+        columns = [c for c in columns if c in self.columns]
+
+        if query is not None and columns:
+            query = f"{{{' '.join(columns)}}} : ({query})"
+
+        return query
+
+def match_query(text: str) -> str | None:
+    """
+    FTS5 query matching rows that contain every whitespace-separated term of
+    text, the last word of each term as a prefix. None when text has no
+    searchable word.
+
+    A term such as "NC-1234" becomes the phrase "NC 1234"*, which FTS5
+    resolves from its rarest token instead of intersecting every note
+    containing "NC".
+    """
+    phrases = [" ".join(re.findall(r"\w+", term)) for term in text.split()]
+    phrases = [phrase for phrase in phrases if phrase]
+
+    if not phrases:
+        return None
+
+    return " ".join(f'"{phrase}"*' for phrase in phrases)
+
+SEARCH_INDEXES: dict[str, SearchIndex] = {
+    index.source: index
+    for index in (
+        SearchIndex("assets_fts", "assets", ("ticker", "past_tickers")),
+        SearchIndex("brokers_fts", "brokers", ("name",)),
+        SearchIndex("asset_types_fts", "asset_types", ("name",)),
+        SearchIndex("asset_sectors_fts", "asset_sectors", ("name",)),
+        SearchIndex("broker_notes_fts", "broker_notes", ("note_number",)),
+    )
+}
+
+# Space-separated old and new tickers of an asset.
+_PAST_TICKERS = (
+    "(SELECT group_concat(h.old_ticker || ' ' || h.new_ticker, ' ') "
+    "FROM asset_ticker_histories h WHERE h.asset_id = {asset_id})"
+)
+
+def _create_table(index: SearchIndex) -> str:
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {index.name} USING fts5("
+        f"{', '.join(index.columns)}, tokenize='{TOKENIZE}', prefix='{PREFIX}')"
+    )
+
+def _column_triggers(index: SearchIndex) -> list[str]:
+    """Triggers mirroring a table whose indexed columns are its own columns"""
+    columns = ", ".join(index.columns)
+    new_values = ", ".join(f"new.{c}" for c in index.columns)
+    not_empty = " OR ".join(f"new.{c} IS NOT NULL" for c in index.columns)
+
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {index.name}_insert AFTER INSERT ON {index.source}
+        WHEN {not_empty} BEGIN
+            INSERT INTO {index.name} (rowid, {columns}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {index.name}_update AFTER UPDATE OF {columns} ON {index.source} BEGIN
+            DELETE FROM {index.name} WHERE rowid = old.id;
+            INSERT INTO {index.name} (rowid, {columns})
+            SELECT new.id, {new_values} WHERE {not_empty};
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {index.name}_delete AFTER DELETE ON {index.source} BEGIN
+            DELETE FROM {index.name} WHERE rowid = old.id;
+        END""",
+    ]
+
+def _asset_triggers() -> list[str]:
+    """Triggers for the asset index, which also follows ticker histories"""
+    refresh = "UPDATE assets_fts SET past_tickers = {past} WHERE rowid = {asset_id};"
+
+    def refresh_for(asset_id: str) -> str:
+        return refresh.format(past=_PAST_TICKERS.format(asset_id=asset_id), asset_id=asset_id)
+
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS assets_fts_insert AFTER INSERT ON assets BEGIN
+            INSERT INTO assets_fts (rowid, ticker, past_tickers)
+            VALUES (new.id, new.ticker, {_PAST_TICKERS.format(asset_id='new.id')});
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS assets_fts_update AFTER UPDATE OF ticker ON assets BEGIN
+            UPDATE assets_fts SET ticker = new.ticker WHERE rowid = new.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS assets_fts_delete AFTER DELETE ON assets BEGIN
+            DELETE FROM assets_fts WHERE rowid = old.id;
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS assets_fts_history_insert AFTER INSERT ON asset_ticker_histories BEGIN
+            {refresh_for('new.asset_id')}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS assets_fts_history_update
+        AFTER UPDATE OF asset_id, old_ticker, new_ticker ON asset_ticker_histories BEGIN
+            {refresh_for('old.asset_id')}
+            {refresh_for('new.asset_id')}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS assets_fts_history_delete AFTER DELETE ON asset_ticker_histories BEGIN
+            {refresh_for('old.asset_id')}
+        END""",
+    ]
+
+def _backfill(index: SearchIndex) -> str:
+    if index.source == "assets":
+        return (
+            "INSERT INTO assets_fts (rowid, ticker, past_tickers) "
+            f"SELECT a.id, a.ticker, {_PAST_TICKERS.format(asset_id='a.id')} FROM assets a"
+        )
+
+    columns = ", ".join(index.columns)
+    not_empty = " OR ".join(f"{c} IS NOT NULL" for c in index.columns)
+    return (
+        f"INSERT INTO {index.name} (rowid, {columns}) "
+        f"SELECT id, {columns} FROM {index.source} WHERE {not_empty}"
+    )
+
+def search_index_ddl() -> list[str]:
+    """Statements creating and filling every search index"""
+    statements = []
+
+    for index in SEARCH_INDEXES.values():
+        statements.append(_create_table(index))
+        statements.append(f"DELETE FROM {index.name}")
+        statements.append(_backfill(index))
+
+        if index.source == "assets":
+            statements.extend(_asset_triggers())
+        else:
+            statements.extend(_column_triggers(index))
+
+    return statements
+
+def drop_search_index_ddl() -> list[str]:
+    """Statements dropping every search index and the triggers feeding it"""
+    statements = []
+
+    for index in SEARCH_INDEXES.values():
+        triggers = ["insert", "update", "delete"]
+
+        if index.source == "assets":
+            triggers += ["history_insert", "history_update", "history_delete"]
+
+        statements.extend(f"DROP TRIGGER IF EXISTS {index.name}_{trigger}" for trigger in triggers)
+        statements.append(f"DROP TABLE IF EXISTS {index.name}")
+
+    return statements
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_indexes(target, connection, **kw) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+
+    for statement in search_index_ddl():
+        connection.exec_driver_sql(statement)
@@ -0,0 +1,38 @@
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+
+class YearSummary(Base):
+    """
+    Per-year counts behind the year filters of the UI.
+
+    Maintained by YearSummaryService as broker notes are written and
+    snapshots are rebuilt; a row only exists while one of its counts is
+    positive, so listing years reads a handful of rows.
+    """
+    __tablename__ = "year_summaries"
+
+    year: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=False
+    )
+
+    broker_note_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+
+    # Assets with at least one snapshot dated in the year.
+    snapshot_asset_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<YearSummary(year={self.year}, broker_note_count={self.broker_note_count}, "
+            f"snapshot_asset_count={self.snapshot_asset_count})>"
+        )
@@ -1,20 +1,79 @@
-from typing import Generic, TypeVar, Optional, List, Any, Dict
-from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc, func
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Generic, TypeVar, Optional, List, Any, Dict, Sequence, Iterator, Callable, get_args
+from sqlalchemy.orm import Session, joinedload, lazyload
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.sql import Executable
+from sqlalchemy import (
+    Row, Select, and_, asc, desc, func, insert, literal, literal_column,
+    or_, select, tuple_, update
+)
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from pydantic import BaseModel as PydanticBaseModel
+from pydantic import BaseModel as PydanticBaseModel, TypeAdapter, ValidationError as PydanticValidationError
 
 from holdings_tracker_desktop.models.base import IdentifiedModel as SQLAlchemyBaseModel
+from holdings_tracker_desktop.models.search_index import SEARCH_INDEXES
 from holdings_tracker_desktop.utils.exceptions import (
     NotFoundException,
     DatabaseException,
-    ConflictException
+    ConflictException,
+    ValidationException
 )
 
 # Type variables for generic repository
 ModelType = TypeVar("ModelType", bound=SQLAlchemyBaseModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=PydanticBaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=PydanticBaseModel)
+ItemType = TypeVar("ItemType")
+RowType = TypeVar("RowType", bound=tuple)
+
+# Records fetched per round trip by iter_all() and iter_all_with_counts().
+PAGE_SIZE = 1000
+
+@dataclass
+class Page(Generic[ItemType]):
+    """One page of a keyset-paginated listing"""
+    items: List[ItemType]
+    next_cursor: Optional[str]
+
+@lru_cache(maxsize=None)
+def _batch_adapter(schema: type[PydanticBaseModel]) -> TypeAdapter:
+    """Validator for a list of schema items, built once per schema"""
+    return TypeAdapter(list[schema])
+
+def _encode_cursor(value: Any, id: int) -> str:
+    """Opaque token holding the (order value, id) of the last row of a page"""
+    if isinstance(value, Enum):
+        value = value.value
+    elif isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+
+    return base64.urlsafe_b64encode(json.dumps([value, id]).encode()).decode()
+
+def _decode_cursor(cursor: str, column) -> tuple[Any, int]:
+    """Read a cursor back, restoring the Python type of the order column"""
+    try:
+        value, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        python_type = column.type.python_type
+
+        if value is not None and not isinstance(value, python_type):
+            if hasattr(python_type, "fromisoformat"):
+                value = python_type.fromisoformat(value)
+            else:
+                value = python_type(value)
+
+        return value, int(id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError, NotImplementedError):
+        raise ValidationException(f"Invalid page cursor: {cursor!r}")
+
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
@@ -50,7 +109,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             Model instance or None if not found
         """
         try:
-            return self.db.query(self.model).filter(self.model.id == id).first()
+            return self.db.get(self.model, id)
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error fetching {self.model.__name__}: {str(e)}")
 
@@ -234,6 +293,170 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             msg = error_message or f"{self.model.__name__} with ID {id} not found"
             raise NotFoundException(msg)
 
+    # =========================================================================
+    # BULK OPERATIONS
+    # =========================================================================
+
+    def validate_batch(
+        self,
+        items: Sequence[PydanticBaseModel | Dict[str, Any]],
+        update: bool = False
+    ) -> List[PydanticBaseModel]:
+        """
+        Validate a batch against the create (or update) schema in one pass.
+
+        Args:
+            items: Schemas, which are kept as they are, or dicts of schema data
+            update: Validate against the update schema instead
+
+        Returns:
+            Schemas in the order of items
+
+        Raises:
+            ValidationException: If an item is invalid
+        """
+        schema = self._schema_type(2 if update else 1)
+        pending = [(i, item) for i, item in enumerate(items) if not isinstance(item, PydanticBaseModel)]
+        schemas = list(items)
+
+        if pending:
+            try:
+                validated = _batch_adapter(schema).validate_python([item for _, item in pending])
+            except PydanticValidationError as e:
+                raise ValidationException(f"Invalid {self.model.__name__} batch: {str(e)}")
+
+            for (i, _), item in zip(pending, validated):
+                schemas[i] = item
+
+        return schemas
+
+    def create_many(self, items: Sequence[CreateSchemaType | Dict[str, Any]]) -> List[int]:
+        """
+        Create a batch of records in one transaction.
+
+        Dicts are validated against the create schema in a single pass (see
+        validate_batch); the rows are then written with an executemany
+        INSERT ... RETURNING instead of a commit and refresh per record.
+
+        Args:
+            items: Create schemas, or dicts of create schema data
+
+        Returns:
+            IDs of the created records, in the order of items
+
+        Raises:
+            ValidationException: If an item is invalid
+            ConflictException: If a record violates a constraint
+        """
+        rows = [item.model_dump() for item in self.validate_batch(items)]
+
+        if not rows:
+            return []
+
+        try:
+            ids = self.db.scalars(insert(self.model).returning(self.model.id), rows).all()
+            self.db.commit()
+
+            # Asking SQLAlchemy for RETURNING in parameter order makes it fall
+            # back to one INSERT per row on SQLite. Within the transaction,
+            # rowids are handed out in ascending insert order, so sorting
+            # restores the order of items.
+            return sorted(ids)
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ConflictException(f"Conflict creating {self.model.__name__}: {str(e)}")
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise DatabaseException(f"Error creating {self.model.__name__}: {str(e)}")
+
+    def update_many(self, items: Dict[int, UpdateSchemaType | Dict[str, Any]]) -> int:
+        """
+        Update a batch of records in one transaction.
+
+        Dicts are validated against the update schema in a single pass and
+        only the fields each item sets are written, with executemany UPDATEs
+        by primary key.
+
+        Args:
+            items: Update schemas, or dicts of update schema data, by record ID
+
+        Returns:
+            Number of records updated
+
+        Raises:
+            ValidationException: If an item is invalid
+            NotFoundException: If a record does not exist
+            ConflictException: If a record violates a constraint
+        """
+        schemas = self.validate_batch(list(items.values()), update=True)
+        rows = [{**schema.model_dump(exclude_unset=True), "id": id} for id, schema in zip(items, schemas)]
+
+        if not rows:
+            return 0
+
+        try:
+            self.db.execute(update(self.model), rows)
+            self.db.commit()
+            return len(rows)
+        except StaleDataError:
+            self.db.rollback()
+            raise NotFoundException(f"Some {self.model.__name__} records to update were not found")
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ConflictException(f"Conflict updating {self.model.__name__}: {str(e)}")
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise DatabaseException(f"Error updating {self.model.__name__}: {str(e)}")
+
+    def delete_many(self, ids: Sequence[int]) -> int:
+        """
+        Delete a batch of records by ID in one transaction.
+
+        Records are checked like a single delete: when the model defines
+        validate_for_deletion(), every record must pass it before anything
+        is deleted. Deletes go through the session, so ORM cascades run and
+        the DELETEs are flushed together.
+
+        Args:
+            ids: Record IDs to delete (unknown IDs are skipped)
+
+        Returns:
+            Number of records deleted
+
+        Raises:
+            ConflictException: If a record cannot be deleted
+        """
+        if not ids:
+            return 0
+
+        unique_ids = list(dict.fromkeys(ids))
+        objects = [
+            obj
+            for start in range(0, len(unique_ids), PAGE_SIZE)
+            for obj in self.db.scalars(
+                select(self.model).where(self.model.id.in_(unique_ids[start:start + PAGE_SIZE]))
+            )
+        ]
+
+        if hasattr(self.model, 'validate_for_deletion'):
+            for obj in objects:
+                can_delete, error_message = obj.validate_for_deletion()
+                if not can_delete:
+                    raise ConflictException(error_message)
+
+        try:
+            for obj in objects:
+                self.db.delete(obj)
+
+            self.db.commit()
+            return len(objects)
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ConflictException(f"Conflict deleting {self.model.__name__}: {str(e)}")
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise DatabaseException(f"Error deleting {self.model.__name__}: {str(e)}")
+
     # =========================================================================
     # QUERY OPERATIONS
     # =========================================================================
@@ -316,6 +539,12 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Search records by text in specified fields.
 
+        Tables with an FTS5 search index (see models/search_index.py) are
+        searched through it, best matches first: every word of query_str
+        must start a word of one of the indexed search_fields (all indexed
+        columns when none of them are). Other tables fall back to
+        case-insensitive substring matching.
+
         Args:
             query_str: Search query string
             search_fields: List of field names to search in
@@ -326,29 +555,295 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             List of model instances
         """
+        stmt = self.apply_search(select(self.model).filter_by(**additional_filters), query_str, search_fields)
+
+        if stmt is None:
+            return []
+
         try:
-            q = self.db.query(self.model)
+            return self.db.scalars(stmt.offset(skip).limit(limit)).all()
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error searching {self.model.__name__}: {str(e)}")
 
-            # Apply additional filters
-            if additional_filters:
-                q = q.filter_by(**additional_filters)
+    def search_with_counts(
+        self,
+        query_str: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+        counts: Sequence[str] = (),
+        eager: Sequence[str] = (),
+        limit: int = 100
+    ) -> List[tuple[ModelType, Dict[str, int]]]:
+        """
+        Search records like search(), together with the size of some of
+        their relationships, in a single statement (see get_page_with_counts).
+
+        Args:
+            query_str: Search query string
+            search_fields: List of field names to search in
+            counts: Names of the relationships to count
+            eager: Names of the many-to-one relationships to load with the rows
+            limit: Maximum number of records to return
 
-            # Apply text search if provided
-            if query_str and search_fields:
-                from sqlalchemy import or_
-                conditions = []
-                for field in search_fields:
-                    if hasattr(self.model, field):
-                        column = getattr(self.model, field)
-                        conditions.append(column.ilike(f"%{query_str}%"))
+        Returns:
+            List of (model instance, {relationship name: count}) tuples
+        """
+        stmt = self.apply_search(self._select_with_counts(counts, eager), query_str, search_fields)
 
-                if conditions:
-                    q = q.filter(or_(*conditions))
+        if stmt is None:
+            return []
 
-            return q.offset(skip).limit(limit).all()
+        try:
+            rows = self.db.execute(stmt.limit(limit)).all()
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error searching {self.model.__name__}: {str(e)}")
 
+        return [(row[0], dict(zip(counts, row[1:]))) for row in rows]
+
+    def apply_search(
+        self,
+        stmt: Select,
+        query_str: Optional[str],
+        search_fields: Optional[List[str]] = None
+    ) -> Optional[Select]:
+        """
+        Restrict a select over the model to the records matching query_str,
+        as search() does, best matches first when the table has an index.
+
+        Args:
+            stmt: Select whose FROM clause includes the model
+            query_str: Search query string
+            search_fields: List of field names to search in
+
+        Returns:
+            The filtered select, or None when query_str has no searchable word
+        """
+        index = SEARCH_INDEXES.get(self.model.__tablename__)
+
+        # Apply full-text search through the index
+        if query_str and index is not None:
+            match = index.match(query_str, tuple(search_fields or ()))
+
+            if match is None:
+                return None
+
+            fts = index.fts
+            return (
+                stmt.join(fts, fts.c.rowid == self.model.id)
+                .where(literal_column(index.name).op("MATCH")(match))
+                .order_by(fts.c.rank)
+            )
+
+        # Apply text search if provided
+        if query_str and search_fields:
+            conditions = [
+                getattr(self.model, field).ilike(f"%{query_str}%")
+                for field in search_fields
+                if hasattr(self.model, field)
+            ]
+
+            if conditions:
+                stmt = stmt.where(or_(*conditions))
+
+        return stmt
+
+    def fetch_rows(self, stmt: Executable, row_type: Callable[..., RowType]) -> List[RowType]:
+        """
+        Run a column projection and wrap each result row in a lightweight
+        record, without creating ORM objects or touching the identity map.
+
+        Args:
+            stmt: Select (or lambda statement) of exactly the row_type fields
+            row_type: NamedTuple type (see schemas/ui_rows.py)
+
+        Returns:
+            List of row_type records
+        """
+        try:
+            return list(map(row_type._make, self.db.execute(stmt).tuples()))
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error fetching {self.model.__name__} rows: {str(e)}")
+
+    # =========================================================================
+    # KEYSET PAGINATION
+    # =========================================================================
+
+    def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        eager: Sequence[str] = (),
+        **filters
+    ) -> Page[ModelType]:
+        """
+        Get one page of records using keyset (seek) pagination.
+
+        Pages are ordered by the order column plus id, and each page
+        continues right after the (order value, id) of the previous one, so
+        fetching a deep page costs the same as fetching the first.
+
+        Args:
+            limit: Maximum number of records to return
+            cursor: next_cursor of the previous page (None for the first page)
+            order_by: Column name to order by (defaults to 'id')
+            descending: Order descending if True
+            eager: Names of the many-to-one relationships to load with the rows
+            **filters: Keyword arguments for filtering
+
+        Returns:
+            Page with the model instances and the cursor of the next page
+
+        Raises:
+            ValidationException: If the cursor is malformed
+        """
+        column = self._order_column(order_by)
+        rows, next_cursor = self._fetch_page(
+            select(self.model).options(*self._eager_options(eager)).filter_by(**filters),
+            column, limit, cursor, descending,
+            lambda row: (getattr(row[0], column.key), row[0].id)
+        )
+        return Page([row[0] for row in rows], next_cursor)
+
+    def get_page_with_counts(
+        self,
+        counts: Sequence[str] = (),
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        eager: Sequence[str] = (),
+        **filters
+    ) -> Page[tuple[ModelType, Dict[str, int]]]:
+        """
+        Get one page of records together with the size of some of their
+        relationships, in a single statement.
+
+        Each relationship in counts becomes a correlated COUNT subquery, and
+        each many-to-one relationship in eager is joined in. Every other
+        relationship is left unloaded, so a page costs one round trip
+        however many rows it has.
+
+        Args:
+            counts: Names of the relationships to count
+            limit: Maximum number of records to return
+            cursor: next_cursor of the previous page (None for the first page)
+            order_by: Column name to order by (defaults to 'id')
+            descending: Order descending if True
+            eager: Names of the many-to-one relationships to load with the rows
+            **filters: Keyword arguments for filtering
+
+        Returns:
+            Page of (model instance, {relationship name: count}) tuples
+
+        Raises:
+            ValidationException: If the cursor is malformed
+        """
+        column = self._order_column(order_by)
+        rows, next_cursor = self._fetch_page(
+            self._select_with_counts(counts, eager).filter_by(**filters), column, limit, cursor, descending,
+            lambda row: (getattr(row[0], column.key), row[0].id)
+        )
+        return Page([(row[0], dict(zip(counts, row[1:]))) for row in rows], next_cursor)
+
+    def get_rows_page(
+        self,
+        stmt: Select,
+        row_type: Callable[..., RowType],
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: Any = None,
+        descending: bool = False,
+        order_field: Optional[str] = None
+    ) -> Page[RowType]:
+        """
+        Get one page of a column projection (see fetch_rows) using keyset
+        pagination (see get_page).
+
+        The order column may belong to a joined model. The position of the
+        last row is read back from its row_type fields, so row_type must
+        have an 'id' field holding the model's id.
+
+        Args:
+            stmt: Select of exactly the row_type fields, without ORDER BY or LIMIT
+            row_type: NamedTuple type (see schemas/ui_rows.py)
+            limit: Maximum number of rows to return
+            cursor: next_cursor of the previous page (None for the first page)
+            order_by: Column to order by (defaults to the model's id)
+            descending: Order descending if True
+            order_field: row_type field holding the order column (defaults to its name)
+
+        Returns:
+            Page with the row_type records and the cursor of the next page
+
+        Raises:
+            ValidationException: If the cursor is malformed
+        """
+        column = self.model.id if order_by is None else order_by
+        field = order_field or column.key
+
+        def position(row) -> tuple[Any, int]:
+            record = row_type._make(row)
+            return getattr(record, field), record.id
+
+        rows, next_cursor = self._fetch_page(stmt, column, limit, cursor, descending, position)
+        return Page(list(map(row_type._make, rows)), next_cursor)
+
+    def iter_all(
+        self,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        page_size: int = PAGE_SIZE,
+        eager: Sequence[str] = (),
+        **filters
+    ) -> Iterator[ModelType]:
+        """
+        Iterate over every matching record, fetching them page by page.
+
+        Args:
+            order_by: Column name to order by (defaults to 'id')
+            descending: Order descending if True
+            page_size: Number of records fetched per round trip
+            eager: Names of the many-to-one relationships to load with the rows
+            **filters: Keyword arguments for filtering
+
+        Returns:
+            Iterator of model instances
+        """
+        return self._iter_pages(
+            lambda cursor: self.get_page(page_size, cursor, order_by, descending, eager, **filters)
+        )
+
+    def iter_all_with_counts(
+        self,
+        counts: Sequence[str] = (),
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        eager: Sequence[str] = (),
+        page_size: int = PAGE_SIZE,
+        **filters
+    ) -> Iterator[tuple[ModelType, Dict[str, int]]]:
+        """
+        Iterate over every matching record with its relationship counts,
+        fetching them page by page (see get_page_with_counts).
+
+        Args:
+            counts: Names of the relationships to count
+            order_by: Column name to order by (defaults to 'id')
+            descending: Order descending if True
+            eager: Names of the many-to-one relationships to load with the rows
+            page_size: Number of records fetched per round trip
+            **filters: Keyword arguments for filtering
+
+        Returns:
+            Iterator of (model instance, {relationship name: count}) tuples
+        """
+        return self._iter_pages(
+            lambda cursor: self.get_page_with_counts(
+                counts, page_size, cursor, order_by, descending, eager, **filters
+            )
+        )
+
     # =========================================================================
     # UTILITY METHODS
     # =========================================================================
@@ -388,6 +883,117 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.db.rollback()
 
+    def _schema_type(self, index: int) -> type[PydanticBaseModel]:
+        """Schema type argument of BaseRepository[Model, CreateSchema, UpdateSchema]"""
+        args = get_args(getattr(self, "__orig_class__", None))
+
+        if len(args) != 3:
+            raise TypeError(
+                f"BaseRepository for {self.model.__name__} must be created as "
+                "BaseRepository[Model, CreateSchema, UpdateSchema] to validate batches"
+            )
+
+        return args[index]
+
+    def _select_with_counts(self, counts: Sequence[str], eager: Sequence[str]) -> Select:
+        """Select of the model plus relationship counts, other relationships left unloaded"""
+        return (
+            select(self.model, *[self._relationship_count(name) for name in counts])
+            .options(lazyload("*"), *self._eager_options(eager))
+        )
+
+    def _eager_options(self, eager: Sequence[str]) -> list:
+        """Join in many-to-one relationships, leaving their own relationships unloaded"""
+        return [joinedload(getattr(self.model, name)).lazyload("*") for name in eager]
+
+    def _relationship_count(self, name: str):
+        """Correlated COUNT subquery over a one-to-many relationship"""
+        relationship = getattr(self.model, name).property
+        target = relationship.mapper.local_table
+
+        return (
+            select(func.count())
+            .select_from(target)
+            .where(relationship.primaryjoin)
+            .correlate_except(target)
+            .scalar_subquery()
+            .label(f"{name}_count")
+        )
+
+    def _order_column(self, order_by: Optional[str]):
+        return getattr(self.model, order_by, self.model.id) if order_by else self.model.id
+
+    def _fetch_page(
+        self,
+        stmt: Select,
+        column,
+        limit: int,
+        cursor: Optional[str],
+        descending: bool,
+        position: Callable[[Row], tuple[Any, int]]
+    ) -> tuple[List[Row], Optional[str]]:
+        """
+        Run a keyset-paginated select and build the cursor of the next page
+        from the (order value, id) position of its last row
+        """
+        order_func = desc if descending else asc
+        stmt = stmt.order_by(order_func(column))
+
+        if column is not self.model.id:
+            stmt = stmt.order_by(order_func(self.model.id))
+
+        if cursor is not None:
+            stmt = stmt.where(self._after(column, descending, *_decode_cursor(cursor, column)))
+
+        try:
+            # One extra row tells whether there is a next page.
+            rows = self.db.execute(stmt.limit(limit + 1)).all()
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error fetching all {self.model.__name__}: {str(e)}")
+
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, _encode_cursor(*position(rows[-1]))
+
+    def _after(self, column, descending: bool, value: Any, last_id: int):
+        """
+        Keyset condition for the rows after (value, last_id). SQLite sorts
+        NULL before every other value, so NULL order values come first
+        ascending and last descending.
+        """
+        id_column = self.model.id
+
+        if column is id_column:
+            return id_column < last_id if descending else id_column > last_id
+
+        if value is None:
+            tie = and_(column.is_(None), id_column < last_id if descending else id_column > last_id)
+            return tie if descending else or_(column.is_not(None), tie)
+
+        key = tuple_(column, id_column)
+        position = tuple_(literal(value, column.type), literal(last_id, id_column.type))
+
+        if not descending:
+            return key > position
+
+        after = key < position
+        return or_(after, column.is_(None)) if column.expression.nullable else after
+
+    @staticmethod
+    def _iter_pages(fetch: Callable[[Optional[str]], Page]) -> Iterator:
+        cursor = None
+
+        while True:
+            page = fetch(cursor)
+            yield from page.items
+
+            if page.next_cursor is None:
+                return
+
+            cursor = page.next_cursor
+
     # =========================================================================
     # CONVERSION METHODS
     # =========================================================================
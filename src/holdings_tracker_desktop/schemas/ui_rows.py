@@ -0,0 +1,61 @@
+"""
+Lightweight rows for the UI listing paths.
+
+They are built straight from column projections (see
+BaseRepository.fetch_rows), so listing a table never creates ORM objects
+or touches the identity map. Fields read as attributes or, like the
+to_ui_dict() dictionaries they replace, by key: row['asset_ticker'], row.get('asset_currency').
+"""
+from datetime import date as Date
+from decimal import Decimal
+from typing import NamedTuple
+
+from holdings_tracker_desktop.models.broker_note import OperationType
+
+def _field_or_index(self, key):
+    if isinstance(key, str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    return tuple.__getitem__(self, key)
+
+def _get(self, key: str, default=None):
+    return getattr(self, key, default)
+
+class BrokerNoteRow(NamedTuple):
+    id: int
+    date: Date
+    operation: OperationType
+    broker_name: str
+    asset_ticker: str
+    asset_currency: str
+    quantity: Decimal
+    price: Decimal
+    fees: Decimal
+    taxes: Decimal
+    note_number: str
+
+    __getitem__ = _field_or_index
+    get = _get
+
+    @property
+    def total_value(self) -> Decimal:
+        return (self.quantity * self.price) + self.fees + self.taxes
+
+class PositionSnapshotRow(NamedTuple):
+    id: int
+    asset_ticker: str
+    snapshot_date: Date
+    asset_currency: str
+    quantity: Decimal
+    avg_price: Decimal
+    origin_action: str
+
+    __getitem__ = _field_or_index
+    get = _get
+
+    @property
+    def total_cost(self) -> Decimal:
+        return self.quantity * self.avg_price
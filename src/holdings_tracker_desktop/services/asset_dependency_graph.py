@@ -0,0 +1,138 @@
+import heapq
+from collections.abc import Iterable
+from datetime import date as Date
+
+from sqlalchemy.orm import Session
+
+from holdings_tracker_desktop.models.asset_event import AssetEvent, AssetEventType
+from holdings_tracker_desktop.utils.exceptions import ValidationException
+
+class AssetDependencyGraph:
+    """
+    Directed graph of CONVERSION events between assets.
+
+    An edge source -> target means the target position receives the cost
+    of the source position, so the source snapshots must be rebuilt before
+    the target snapshots. Each edge keeps the dates of its conversions.
+    """
+
+    def __init__(self, conversions: Iterable[tuple[int, int, Date]] = ()):
+        self._edges: dict[int, dict[int, list[Date]]] = {}
+
+        for source_id, target_id, conversion_date in conversions:
+            self.add_conversion(source_id, target_id, conversion_date)
+
+    @classmethod
+    def load(cls, db: Session, exclude_event_id: int | None = None) -> "AssetDependencyGraph":
+        """Build the graph from every CONVERSION event"""
+        conversions = (
+            db.query(AssetEvent.asset_id, AssetEvent.converted_to_asset_id, AssetEvent.date)
+            .filter(
+                AssetEvent.event_type == AssetEventType.CONVERSION,
+                AssetEvent.converted_to_asset_id.is_not(None)
+            )
+        )
+
+        if exclude_event_id is not None:
+            conversions = conversions.filter(AssetEvent.id != exclude_event_id)
+
+        return cls(conversions)
+
+    def add_conversion(self, source_id: int, target_id: int, conversion_date: Date) -> None:
+        self._edges.setdefault(source_id, {}).setdefault(target_id, []).append(conversion_date)
+
+    @property
+    def linked_assets(self) -> set[int]:
+        """Assets appearing on either side of a conversion"""
+        linked = set(self._edges)
+
+        for targets in self._edges.values():
+            linked.update(targets)
+
+        return linked
+
+    def downstream(self, asset_id: int) -> set[int]:
+        """Every asset reachable from asset_id through conversions"""
+        reached: set[int] = set()
+        stack = [asset_id]
+
+        while stack:
+            for target_id in self._edges.get(stack.pop(), {}):
+                if target_id not in reached:
+                    reached.add(target_id)
+                    stack.append(target_id)
+
+        return reached
+
+    def would_create_cycle(self, source_id: int, target_id: int) -> bool:
+        """Check whether a new source -> target conversion closes a cycle"""
+        return source_id == target_id or source_id in self.downstream(target_id)
+
+    def expand_dirty(self, dirty: dict[int, Date]) -> dict[int, Date]:
+        """
+        Add the downstream assets affected by a set of dirty assets.
+
+        A target only becomes dirty through conversions dated on or after
+        the date its source is rebuilt from, and then from the earliest of
+        those conversion dates.
+        """
+        expanded = dict(dirty)
+        stack = list(dirty)
+
+        while stack:
+            source_id = stack.pop()
+            from_date = expanded[source_id]
+
+            for target_id, dates in self._edges.get(source_id, {}).items():
+                affected = [d for d in dates if d >= from_date]
+
+                if not affected:
+                    continue
+
+                target_from = min(affected)
+                current = expanded.get(target_id)
+
+                if current is None or target_from < current:
+                    expanded[target_id] = target_from
+                    stack.append(target_id)
+
+        return expanded
+
+    def topological_order(self, asset_ids: Iterable[int]) -> list[int]:
+        """
+        Order assets so every conversion source comes before its targets.
+
+        Ties are broken by asset id so the order is deterministic.
+
+        Raises:
+            ValidationException: If the conversions form a cycle
+        """
+        asset_ids = set(asset_ids)
+        in_degree = dict.fromkeys(asset_ids, 0)
+
+        for source_id in asset_ids:
+            for target_id in self._edges.get(source_id, {}):
+                if target_id in in_degree:
+                    in_degree[target_id] += 1
+
+        ready = [asset_id for asset_id, degree in in_degree.items() if degree == 0]
+        heapq.heapify(ready)
+        order = []
+
+        while ready:
+            asset_id = heapq.heappop(ready)
+            order.append(asset_id)
+
+            for target_id in self._edges.get(asset_id, {}):
+                if target_id not in in_degree:
+                    continue
+
+                in_degree[target_id] -= 1
+
+                if in_degree[target_id] == 0:
+                    heapq.heappush(ready, target_id)
+
+        if len(order) != len(asset_ids):
+            raise ValidationException("Asset conversions form a cycle")
+
+        return order
@@ -1,11 +1,13 @@
 from typing import List
 from sqlalchemy.orm import Session
-from holdings_tracker_desktop.models.asset_event import AssetEvent
+from holdings_tracker_desktop.models.asset_event import AssetEvent, AssetEventType
 from holdings_tracker_desktop.schemas.asset_event import (
   AssetEventCreate, AssetEventUpdate, AssetEventResponse
 )
 from holdings_tracker_desktop.repositories.base_repository import BaseRepository
-from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
+from holdings_tracker_desktop.services.asset_dependency_graph import AssetDependencyGraph
+from holdings_tracker_desktop.services.snapshot_rebuild_queue import SnapshotRebuildQueue
+from holdings_tracker_desktop.utils.exceptions import ValidationException
 
 class AssetEventService:
     def __init__(self, db: Session):
@@ -13,13 +15,15 @@ class AssetEventService:
             model=AssetEvent,
             db=db
         )
-        self.position_snapshot_service = PositionSnapshotService(db)
+        self.rebuild_queue = SnapshotRebuildQueue.for_session(db)
 
     def create(self, data: AssetEventCreate) -> AssetEventResponse:
         """Create new AssetEvent with validation"""
+        self._ensure_conversion_is_acyclic(data)
+
         asset_event = self.repository.create_from_schema(data)
 
-        self.position_snapshot_service.rebuild_from(
+        self.rebuild_queue.mark_dirty(
             asset_id=asset_event.asset_id,
             from_date=asset_event.date
         )
@@ -37,15 +41,27 @@ class AssetEventService:
 
         old_date = existing.date
         asset_id = existing.asset_id
+        old_converted_to_asset_id = existing.converted_to_asset_id
+
+        self._ensure_conversion_is_acyclic(data, exclude_id=asset_event_id)
 
         updated = self.repository.update_from_schema(asset_event_id, data)
 
         rebuild_from_date = min(old_date, updated.date)
 
-        self.position_snapshot_service.rebuild_from(
-            asset_id=asset_id,
-            from_date=rebuild_from_date
-        )
+        with self.rebuild_queue.deferred():
+            self.rebuild_queue.mark_dirty(
+                asset_id=asset_id,
+                from_date=rebuild_from_date
+            )
+
+            # The new target is reached through the dependency graph, the
+            # previous one no longer is.
+            if old_converted_to_asset_id is not None:
+                self.rebuild_queue.mark_dirty(
+                    asset_id=old_converted_to_asset_id,
+                    from_date=old_date
+                )
 
         return AssetEventResponse.model_validate(updated)
 
@@ -55,31 +71,57 @@ class AssetEventService:
 
         asset_id = asset_event.asset_id
         from_date = asset_event.date
+        converted_to_asset_id = asset_event.converted_to_asset_id
 
         deleted = self.repository.delete(asset_event_id)
 
         if deleted:
-            self.position_snapshot_service.rebuild_from(
-                asset_id=asset_id,
-                from_date=from_date
-            )
+            with self.rebuild_queue.deferred():
+                self.rebuild_queue.mark_dirty(
+                    asset_id=asset_id,
+                    from_date=from_date
+                )
+
+                if converted_to_asset_id is not None:
+                    self.rebuild_queue.mark_dirty(
+                        asset_id=converted_to_asset_id,
+                        from_date=from_date
+                    )
 
         return deleted
 
     def list_all_for_ui(
         self,
-        asset_id: int,
-        skip: int = 0, 
-        limit: int = 100
+        asset_id: int
     ) -> List[dict]:
         """Get AssetEvents already formatted for UI"""
-        asset_events = sorted(
-            self.repository.find_all_by(asset_id=asset_id, skip=skip, limit=limit),
-            key=lambda s: s.date,
-            reverse=True
+        asset_events = self.repository.iter_all(
+            order_by="date",
+            descending=True,
+            eager=("asset",),
+            asset_id=asset_id
         )
         return [ae.to_ui_dict() for ae in asset_events]
 
     def count_all(self) -> int:
         """Count all AssetEvents"""
         return self.repository.count()
+
+    def _ensure_conversion_is_acyclic(
+        self,
+        data: AssetEventCreate | AssetEventUpdate,
+        exclude_id: int | None = None
+    ) -> None:
+        """
+        Validate that a CONVERSION event does not convert an asset into
+        itself, directly or through other conversions.
+        """
+        if data.event_type != AssetEventType.CONVERSION or data.converted_to_asset_id is None:
+            return
+
+        graph = AssetDependencyGraph.load(self.repository.db, exclude_event_id=exclude_id)
+
+        if graph.would_create_cycle(data.asset_id, data.converted_to_asset_id):
+            raise ValidationException(
+                "Conversion would make the asset convert into itself"
+            )
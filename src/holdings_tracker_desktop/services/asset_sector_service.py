@@ -41,18 +41,20 @@ class AssetSectorService:
 
     def list_all_models(self, order_by: str = "name") -> List[AssetSector]:
         """Get all AssetSectors as SQLAlchemy models"""
-        return self.repository.get_all(order_by=order_by)
+        return list(self.repository.iter_all(order_by=order_by))
 
     def list_all_for_ui(
         self, 
-        skip: int = 0, 
-        limit: int = 100,
         order_by: str = "name",
         descending: bool = False
     ) -> List[dict]:
         """Get AssetSectors already formatted for UI"""
-        asset_sectors = self.repository.get_all(skip, limit, order_by, descending)
-        return [at.to_ui_dict() for at in asset_sectors]
+        asset_sectors = self.repository.iter_all_with_counts(
+            ('assets',),
+            order_by, descending,
+            eager=('asset_type',)
+        )
+        return [at.to_ui_dict(counts) for at, counts in asset_sectors]
 
     def count_all(self) -> int:
         """Count all AssetSectors"""
@@ -60,5 +62,5 @@ class AssetSectorService:
 
     def get_by_asset_type(self, asset_type_id: int) -> List[AssetSectorResponse]:
         """Get all AssetSectors for a asset type"""
-        asset_sectors = self.repository.find_all_by(asset_type_id=asset_type_id)
+        asset_sectors = self.repository.iter_all(asset_type_id=asset_type_id)
         return [AssetSectorResponse.model_validate(at) for at in asset_sectors]
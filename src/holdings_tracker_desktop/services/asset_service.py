@@ -1,6 +1,6 @@
 from typing import List
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, lambda_stmt, select
 from holdings_tracker_desktop.models.asset import Asset
 from holdings_tracker_desktop.schemas.asset import (
   AssetCreate, AssetUpdate, AssetResponse
@@ -44,18 +44,30 @@ class AssetService:
 
     def list_all_models(self, order_by: str = "ticker") -> List[Asset]:
         """Get all Assets as SQLAlchemy models"""
-        return self.repository.get_all(order_by=order_by)
+        return list(self.repository.iter_all(order_by=order_by))
 
     def list_all_for_ui(
         self, 
-        skip: int = 0, 
-        limit: int = 100,
         order_by: str = "ticker",
         descending: bool = False
     ) -> List[dict]:
         """Get Assets already formatted for UI"""
-        assets = self.repository.get_all(skip, limit, order_by, descending)
-        return [a.to_ui_dict() for a in assets]
+        assets = self.repository.iter_all_with_counts(
+            ('broker_notes', 'snapshots', 'events', 'ticker_histories'),
+            order_by, descending,
+            eager=('asset_type', 'currency', 'sector')
+        )
+        return [a.to_ui_dict(counts) for a, counts in assets]
+
+    def search_for_ui(self, text: str, limit: int = 50) -> List[dict]:
+        """Get Assets whose current or past tickers match text, best matches first"""
+        assets = self.repository.search_with_counts(
+            text, ["ticker", "past_tickers"],
+            counts=('broker_notes', 'snapshots', 'events', 'ticker_histories'),
+            eager=('asset_type', 'currency', 'sector'),
+            limit=limit
+        )
+        return [a.to_ui_dict(counts) for a, counts in assets]
 
     def count_all(self) -> int:
         """Count all Assets"""
@@ -69,15 +81,15 @@ class AssetService:
         """
         Validate that Asset ticker is unique (case-insensitive).
         """
-        query = (
-            self.repository.db.query(Asset)
-            .filter(func.lower(Asset.ticker) == ticker.lower())
-        )
+        lowered = ticker.lower()
+        stmt = lambda_stmt(lambda: select(Asset.id).where(func.lower(Asset.ticker) == lowered))
 
         if exclude_id is not None:
-            query = query.filter(Asset.id != exclude_id)
+            stmt += lambda s: s.where(Asset.id != exclude_id)
+
+        stmt += lambda s: s.limit(1)
 
-        if self.repository.db.query(query.exists()).scalar():
+        if self.repository.db.scalar(stmt) is not None:
             raise ConflictException(
                 f"Asset '{ticker}' already exists"
             )
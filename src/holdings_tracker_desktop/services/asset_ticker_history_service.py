@@ -56,15 +56,14 @@ class AssetTickerHistoryService:
 
     def list_all_for_ui(
         self,
-        asset_id: int,
-        skip: int = 0, 
-        limit: int = 100
+        asset_id: int
     ) -> List[dict]:
         """Get AssetTickerHistories already formatted for UI"""
-        asset_ticker_histories = sorted(
-            self.repository.find_all_by(asset_id=asset_id, skip=skip, limit=limit),
-            key=lambda s: s.change_date,
-            reverse=True
+        asset_ticker_histories = self.repository.iter_all(
+            order_by="change_date",
+            descending=True,
+            eager=("asset",),
+            asset_id=asset_id
         )
         return [ath.to_ui_dict() for ath in asset_ticker_histories]
 
@@ -1,6 +1,6 @@
 from typing import List
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, lambda_stmt, select
 from holdings_tracker_desktop.models.asset_type import AssetType
 from holdings_tracker_desktop.schemas.asset_type import (
   AssetTypeCreate, AssetTypeUpdate, AssetTypeResponse
@@ -47,18 +47,20 @@ class AssetTypeService:
 
     def list_all_models(self, order_by: str = "name") -> List[AssetType]:
         """Get all AssetTypes as SQLAlchemy models"""
-        return self.repository.get_all(order_by=order_by)
+        return list(self.repository.iter_all(order_by=order_by))
 
     def list_all_for_ui(
         self, 
-        skip: int = 0, 
-        limit: int = 100,
         order_by: str = "name",
         descending: bool = False
     ) -> List[dict]:
         """Get AssetTypes already formatted for UI"""
-        asset_types = self.repository.get_all(skip, limit, order_by, descending)
-        return [at.to_ui_dict() for at in asset_types]
+        asset_types = self.repository.iter_all_with_counts(
+            ('assets', 'sectors'),
+            order_by, descending,
+            eager=('country',)
+        )
+        return [at.to_ui_dict(counts) for at, counts in asset_types]
 
     def count_all(self) -> int:
         """Count all AssetTypes"""
@@ -66,7 +68,7 @@ class AssetTypeService:
 
     def get_by_country(self, country_id: int) -> List[AssetTypeResponse]:
         """Get all AssetTypes for a country"""
-        asset_types = self.repository.find_all_by(country_id=country_id)
+        asset_types = self.repository.iter_all(country_id=country_id)
         return [AssetTypeResponse.model_validate(at) for at in asset_types]
 
     def _ensure_name_is_unique(
@@ -77,15 +79,15 @@ class AssetTypeService:
         """
         Validate that asset type name is unique (case-insensitive).
         """
-        query = (
-            self.repository.db.query(AssetType)
-            .filter(func.lower(AssetType.name) == name.lower())
-        )
+        lowered = name.lower()
+        stmt = lambda_stmt(lambda: select(AssetType.id).where(func.lower(AssetType.name) == lowered))
 
         if exclude_id is not None:
-            query = query.filter(AssetType.id != exclude_id)
+            stmt += lambda s: s.where(AssetType.id != exclude_id)
+
+        stmt += lambda s: s.limit(1)
 
-        if self.repository.db.query(query.exists()).scalar():
+        if self.repository.db.scalar(stmt) is not None:
             raise ConflictException(
                 f"Asset Type '{name}' already exists"
             )
@@ -1,15 +1,37 @@
+from collections import Counter
+from contextlib import contextmanager
 from datetime import date as Date
 from typing import List
 
-from sqlalchemy import func
+from sqlalchemy import func, lambda_stmt, select
 from sqlalchemy.orm import Session
 
+from holdings_tracker_desktop.models import Asset, Broker, Currency, YearSummary
 from holdings_tracker_desktop.models.broker_note import BrokerNote
-from holdings_tracker_desktop.repositories.base_repository import BaseRepository
+from holdings_tracker_desktop.repositories.base_repository import BaseRepository, Page
 from holdings_tracker_desktop.schemas.broker_note import (
   BrokerNoteCreate, BrokerNoteUpdate, BrokerNoteResponse
 )
-from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
+from holdings_tracker_desktop.schemas.ui_rows import BrokerNoteRow
+from holdings_tracker_desktop.services.read_cache import cached_read
+from holdings_tracker_desktop.services.snapshot_rebuild_queue import SnapshotRebuildQueue
+from holdings_tracker_desktop.services.year_summary_service import YearSummaryService
+from holdings_tracker_desktop.utils.dates import year_range
+
+# Columns of a BrokerNoteRow, in field order.
+_UI_ROW_COLUMNS = (
+    BrokerNote.id,
+    BrokerNote.date,
+    BrokerNote.operation,
+    Broker.name,
+    Asset.ticker,
+    Currency.symbol,
+    BrokerNote.quantity,
+    BrokerNote.price,
+    BrokerNote.fees,
+    BrokerNote.taxes,
+    func.coalesce(BrokerNote.note_number, ""),
+)
 
 class BrokerNoteService:
     def __init__(self, db: Session):
@@ -17,19 +39,44 @@ class BrokerNoteService:
             model=BrokerNote,
             db=db
         )
-        self.position_snapshot_service = PositionSnapshotService(db)
+        self.rebuild_queue = SnapshotRebuildQueue.for_session(db)
+        self.year_summaries = YearSummaryService(db)
 
     def create(self, data: BrokerNoteCreate) -> BrokerNoteResponse:
         """Create new BrokerNote with validation"""
-        broker_note = self.repository.create_from_schema(data)
+        with self._adjusting_year_summaries():
+            self.year_summaries.add_broker_notes(data.date.year)
+            broker_note = self.repository.create_from_schema(data)
 
-        self.position_snapshot_service.rebuild_from(
+        self.rebuild_queue.mark_dirty(
             asset_id=broker_note.asset_id,
             from_date=broker_note.date
         )
 
         return BrokerNoteResponse.model_validate(broker_note)
 
+    def create_many(self, data: List[BrokerNoteCreate | dict]) -> List[int]:
+        """
+        Create a batch of BrokerNotes (e.g. an import) in one transaction,
+        rebuilding each affected asset once
+        """
+        notes = self.repository.validate_batch(data)
+
+        with self._adjusting_year_summaries():
+            for year, count in Counter(note.date.year for note in notes).items():
+                self.year_summaries.add_broker_notes(year, count)
+
+            ids = self.repository.create_many(notes)
+
+        with self.rebuild_queue.deferred():
+            for note in notes:
+                self.rebuild_queue.mark_dirty(
+                    asset_id=note.asset_id,
+                    from_date=note.date
+                )
+
+        return ids
+
     def get(self, broker_note_id: int) -> BrokerNoteResponse:
         """Get BrokerNote by ID"""
         broker_note = self.repository.get_or_raise(broker_note_id)
@@ -42,11 +89,13 @@ class BrokerNoteService:
         old_date = existing.date
         asset_id = existing.asset_id
 
-        updated = self.repository.update_from_schema(broker_note_id, data)
+        with self._adjusting_year_summaries():
+            self.year_summaries.move_broker_note(old_date.year, (data.date or old_date).year)
+            updated = self.repository.update_from_schema(broker_note_id, data)
 
         rebuild_from_date = min(old_date, updated.date)
 
-        self.position_snapshot_service.rebuild_from(
+        self.rebuild_queue.mark_dirty(
             asset_id=asset_id,
             from_date=rebuild_from_date
         )
@@ -60,16 +109,19 @@ class BrokerNoteService:
         asset_id = broker_note.asset_id
         from_date = broker_note.date
 
-        deleted = self.repository.delete(broker_note_id)
+        with self._adjusting_year_summaries():
+            self.year_summaries.add_broker_notes(from_date.year, -1)
+            deleted = self.repository.delete(broker_note_id)
 
         if deleted:
-            self.position_snapshot_service.rebuild_from(
+            self.rebuild_queue.mark_dirty(
                 asset_id=asset_id,
                 from_date=from_date
             )
 
         return deleted
 
+    @cached_read(BrokerNote, Broker, Asset, Currency)
     def list_by_year_for_ui(
         self,
         year: int,
@@ -77,40 +129,95 @@ class BrokerNoteService:
         limit: int = 100,
         order_by: Date = "date",
         descending: bool = True
-    ) -> List[dict]:
-        query = (
-            self.repository.db
-            .query(BrokerNote)
-            .filter(func.extract("year", BrokerNote.date) == year)
-        )
-
+    ) -> List[BrokerNoteRow]:
+        """Get the BrokerNotes of a year as lightweight rows for UI"""
+        start, end = year_range(year)
         column = getattr(BrokerNote, order_by) if isinstance(order_by, str) else order_by
 
+        stmt = lambda_stmt(lambda: (
+            select(*_UI_ROW_COLUMNS)
+            .join(Broker, Broker.id == BrokerNote.broker_id)
+            .join(Asset, Asset.id == BrokerNote.asset_id)
+            .join(Currency, Currency.id == Asset.currency_id)
+            .where(BrokerNote.date >= start, BrokerNote.date < end)
+        ))
+
+        # id breaks ties so consecutive pages neither skip nor repeat notes.
         if descending:
-            query = query.order_by(column.desc())
+            stmt += lambda s: s.order_by(column.desc(), BrokerNote.id.desc())
         else:
-            query = query.order_by(column.asc())
+            stmt += lambda s: s.order_by(column.asc(), BrokerNote.id.asc())
+
+        stmt += lambda s: s.offset(skip).limit(limit)
+
+        return self.repository.fetch_rows(stmt, BrokerNoteRow)
 
-        broker_notes = (
-            query
-            .offset(skip)
-            .limit(limit)
-            .all()
+    def page_by_year_for_ui(
+        self,
+        year: int,
+        limit: int = 100,
+        cursor: str | None = None,
+        order_by: str = "date",
+        descending: bool = True
+    ) -> Page[BrokerNoteRow]:
+        """
+        Get one keyset page of the BrokerNotes of a year as rows for UI;
+        pass the page's next_cursor to get the following one
+        """
+        start, end = year_range(year)
+        stmt = (
+            select(*_UI_ROW_COLUMNS)
+            .join(Broker, Broker.id == BrokerNote.broker_id)
+            .join(Asset, Asset.id == BrokerNote.asset_id)
+            .join(Currency, Currency.id == Asset.currency_id)
+            .where(BrokerNote.date >= start, BrokerNote.date < end)
         )
 
-        return [bn.to_ui_dict() for bn in broker_notes]
+        return self.repository.get_rows_page(
+            stmt, BrokerNoteRow, limit, cursor, getattr(BrokerNote, order_by), descending
+        )
 
-    def list_available_years(self) -> list[int]:
-        rows = (
-            self.repository.db
-            .query(func.extract("year", BrokerNote.date).label("year"))
-            .distinct()
-            .order_by(func.extract("year", BrokerNote.date).desc())
-            .all()
+    def search_by_note_number_for_ui(self, note_number: str, limit: int = 50) -> List[BrokerNoteRow]:
+        """Get BrokerNotes whose note number matches as rows for UI, best matches first"""
+        stmt = self.repository.apply_search(
+            select(*_UI_ROW_COLUMNS)
+            .join(Broker, Broker.id == BrokerNote.broker_id)
+            .join(Asset, Asset.id == BrokerNote.asset_id)
+            .join(Currency, Currency.id == Asset.currency_id),
+            note_number,
+            ["note_number"]
         )
 
-        return [int(year) for (year,) in rows]
+        if stmt is None:
+            return []
+
+        return self.repository.fetch_rows(stmt.limit(limit), BrokerNoteRow)
+
+    @cached_read(YearSummary)
+    def list_available_years(self) -> list[int]:
+        return self.year_summaries.list_broker_note_years()
 
     def count_all(self) -> int:
         """Count all BrokerNotes"""
         return self.repository.count()
+
+    @contextmanager
+    def _adjusting_year_summaries(self):
+        """
+        Run a note write and its year summary adjustments in a savepoint.
+
+        The adjustments are made first, so the repository's commit stores
+        them together with the note; if anything fails before that commit,
+        only the savepoint is rolled back and no adjustment is left behind
+        for a later commit.
+        """
+        savepoint = self.repository.db.begin_nested()
+        try:
+            yield
+        except Exception:
+            if savepoint.is_active:
+                savepoint.rollback()
+            raise
+
+        if savepoint.is_active:
+            savepoint.commit()
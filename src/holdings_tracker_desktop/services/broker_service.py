@@ -1,6 +1,6 @@
 from typing import List
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, lambda_stmt, select
 from holdings_tracker_desktop.models.broker import Broker
 from holdings_tracker_desktop.schemas.broker import (
   BrokerCreate, BrokerUpdate, BrokerResponse
@@ -47,18 +47,20 @@ class BrokerService:
 
     def list_all_models(self, order_by: int = "id") -> List[Broker]:
         """Get all Countries as SQLAlchemy models"""
-        return self.repository.get_all(order_by=order_by)
+        return list(self.repository.iter_all(order_by=order_by))
 
     def list_all_for_ui(
         self, 
-        skip: int = 0, 
-        limit: int = 100,
         order_by: str = "name",
         descending: bool = False
     ) -> List[dict]:
         """Get Brokers already formatted for UI"""
-        brokers = self.repository.get_all(skip, limit, order_by, descending)
-        return [at.to_ui_dict() for at in brokers]
+        brokers = self.repository.iter_all_with_counts(
+            ('broker_notes',),
+            order_by, descending,
+            eager=('country',)
+        )
+        return [at.to_ui_dict(counts) for at, counts in brokers]
 
     def count_all(self) -> int:
         """Count all Brokers"""
@@ -66,7 +68,7 @@ class BrokerService:
 
     def get_by_country(self, country_id: int) -> List[BrokerResponse]:
         """Get all Brokers for a country"""
-        brokers = self.repository.find_all_by(country_id=country_id)
+        brokers = self.repository.iter_all(country_id=country_id)
         return [BrokerResponse.model_validate(at) for at in brokers]
 
     def _ensure_name_is_unique(
@@ -77,15 +79,15 @@ class BrokerService:
         """
         Validate that broker name is unique (case-insensitive).
         """
-        query = (
-            self.repository.db.query(Broker)
-            .filter(func.lower(Broker.name) == name.lower())
-        )
+        lowered = name.lower()
+        stmt = lambda_stmt(lambda: select(Broker.id).where(func.lower(Broker.name) == lowered))
 
         if exclude_id is not None:
-            query = query.filter(Broker.id != exclude_id)
+            stmt += lambda s: s.where(Broker.id != exclude_id)
+
+        stmt += lambda s: s.limit(1)
 
-        if self.repository.db.query(query.exists()).scalar():
+        if self.repository.db.scalar(stmt) is not None:
             raise ConflictException(
                 f"Broker '{name}' already exists"
             )
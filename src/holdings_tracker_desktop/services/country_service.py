@@ -1,6 +1,6 @@
 from typing import List
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, lambda_stmt, select
 from holdings_tracker_desktop.models.country import Country
 from holdings_tracker_desktop.schemas.country import ( 
   CountryCreate, CountryUpdate, CountryResponse
@@ -47,18 +47,19 @@ class CountryService:
 
     def list_all_models(self, order_by: str = "name") -> List[Country]:
         """Get all Countries as SQLAlchemy models"""
-        return self.repository.get_all(order_by=order_by)
+        return list(self.repository.iter_all(order_by=order_by))
 
     def list_all_for_ui(
         self, 
-        skip: int = 0, 
-        limit: int = 100,
         order_by: str = "name",
         descending: bool = False
     ) -> List[dict]:
         """Get Countries already formatted for UI"""
-        countries = self.repository.get_all(skip, limit, order_by, descending)
-        return [c.to_ui_dict() for c in countries]
+        countries = self.repository.iter_all_with_counts(
+            ('asset_types', 'brokers'),
+            order_by, descending
+        )
+        return [c.to_ui_dict(counts) for c, counts in countries]
 
     def count_all(self) -> int:
         """Count all Countries"""
@@ -72,15 +73,15 @@ class CountryService:
         """
         Validate that country name is unique (case-insensitive).
         """
-        query = (
-            self.repository.db.query(Country)
-            .filter(func.lower(Country.name) == name.lower())
-        )
+        lowered = name.lower()
+        stmt = lambda_stmt(lambda: select(Country.id).where(func.lower(Country.name) == lowered))
 
         if exclude_id is not None:
-            query = query.filter(Country.id != exclude_id)
+            stmt += lambda s: s.where(Country.id != exclude_id)
+
+        stmt += lambda s: s.limit(1)
 
-        if self.repository.db.query(query.exists()).scalar():
+        if self.repository.db.scalar(stmt) is not None:
             raise ConflictException(
                 f"Country '{name}' already exists"
             )
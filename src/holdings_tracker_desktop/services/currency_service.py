@@ -1,6 +1,6 @@
 from typing import List
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, lambda_stmt, select
 from holdings_tracker_desktop.models.currency import Currency
 from holdings_tracker_desktop.schemas.currency import (
   CurrencyCreate, CurrencyUpdate, CurrencyResponse
@@ -47,18 +47,19 @@ class CurrencyService:
 
     def list_all_models(self, order_by: str = "code") -> List[Currency]:
         """Get all Currencies as SQLAlchemy models"""
-        return self.repository.get_all(order_by=order_by)
+        return list(self.repository.iter_all(order_by=order_by))
 
     def list_all_for_ui(
         self, 
-        skip: int = 0, 
-        limit: int = 100,
         order_by: str = "code",
         descending: bool = False
     ) -> List[dict]:
         """Get Currencies already formatted for UI"""
-        currencies = self.repository.get_all(skip, limit, order_by, descending)
-        return [c.to_ui_dict() for c in currencies]
+        currencies = self.repository.iter_all_with_counts(
+            ('assets',),
+            order_by, descending
+        )
+        return [c.to_ui_dict(counts) for c, counts in currencies]
 
     def count_all(self) -> int:
         """Count all Currencies"""
@@ -72,15 +73,15 @@ class CurrencyService:
         """
         Validate that Currency code is unique (case-insensitive).
         """
-        query = (
-            self.repository.db.query(Currency)
-            .filter(func.lower(Currency.code) == code.lower())
-        )
+        lowered = code.lower()
+        stmt = lambda_stmt(lambda: select(Currency.id).where(func.lower(Currency.code) == lowered))
 
         if exclude_id is not None:
-            query = query.filter(Currency.id != exclude_id)
+            stmt += lambda s: s.where(Currency.id != exclude_id)
+
+        stmt += lambda s: s.limit(1)
 
-        if self.repository.db.query(query.exists()).scalar():
+        if self.repository.db.scalar(stmt) is not None:
             raise ConflictException(
                 f"Currency '{code}' already exists"
             )
@@ -0,0 +1,251 @@
+"""
+Replay kernel for position snapshot timelines.
+
+Broker notes and asset events are encoded into plain tuples, either from
+selected columns or from ORM objects, and replayed in a single loop without
+per-item attribute access or method dispatch. Rebuilds only run the kernel;
+apply_item() keeps the per-object Decimal rules it replaced as the
+reference implementation, which the tests and benchmarks/replay_kernels.py
+check it against.
+
+A CONVERSION event closes the source position; the position it opens on
+the converted-to asset is a ConversionInflow, replayed like a purchase.
+"""
+from collections.abc import Iterable, Iterator
+from datetime import date as Date
+from decimal import Decimal
+from typing import NamedTuple
+
+from holdings_tracker_desktop.models import AssetEvent, BrokerNote
+from holdings_tracker_desktop.models.asset_event import AssetEventType
+from holdings_tracker_desktop.models.broker_note import OperationType
+
+STEP_BUY = 0
+STEP_SELL = 1
+STEP_SPLIT = 2
+STEP_AMORTIZATION = 3
+STEP_SUBSCRIPTION = 4
+STEP_NOOP = 5
+STEP_CONVERSION = 6
+
+ZERO = Decimal("0")
+
+CONVERSION_ACTION = AssetEventType.CONVERSION.value.lower()
+
+# (kind, date, origin_action, operand_a, operand_b)
+ReplayStep = tuple[int, Date, str, Decimal | None, Decimal | None]
+
+class ConversionInflow(NamedTuple):
+    """Position received by the converted-to asset of a CONVERSION event"""
+    date: Date
+    quantity: Decimal
+    total_cost: Decimal
+
+def conversion_inflow(
+    conversion_date: Date,
+    source_quantity: Decimal,
+    source_cost: Decimal,
+    conversion_quantity: Decimal | None,
+    residual_value: Decimal | None
+) -> ConversionInflow:
+    """
+    Build the inflow of a conversion from the source position right before
+    it. The residual value paid out on conversion is deducted from the cost
+    carried over; nothing is carried when the source position is empty.
+    """
+    if source_quantity <= 0:
+        return ConversionInflow(conversion_date, ZERO, ZERO)
+
+    carried_cost = source_cost - (residual_value or ZERO)
+
+    return ConversionInflow(
+        conversion_date,
+        conversion_quantity or ZERO,
+        carried_cost if carried_cost > 0 else ZERO
+    )
+
+def encode_item(item) -> ReplayStep:
+    if isinstance(item, AssetEvent):
+        return encode_event(item.date, item.event_type, item.factor, item.quantity, item.price)
+
+    if isinstance(item, ConversionInflow):
+        return STEP_BUY, item.date, CONVERSION_ACTION, item.quantity, item.total_cost
+
+    return encode_note(item.date, item.operation, item.quantity, item.price, item.fees, item.taxes)
+
+def encode_note(
+    note_date: Date,
+    operation: OperationType,
+    quantity: Decimal,
+    price: Decimal,
+    fees: Decimal,
+    taxes: Decimal
+) -> ReplayStep:
+    action = operation.value.lower()
+
+    if operation == OperationType.BUY:
+        # Same expression as BrokerNote.total_value
+        return STEP_BUY, note_date, action, quantity, (quantity * price) + fees + taxes
+
+    if operation == OperationType.SELL:
+        return STEP_SELL, note_date, action, quantity, None
+
+    return STEP_NOOP, note_date, action, None, None
+
+def encode_event(
+    event_date: Date,
+    event_type: AssetEventType,
+    factor: Decimal | None,
+    quantity: Decimal | None,
+    price: Decimal | None
+) -> ReplayStep:
+    action = event_type.value.lower()
+
+    match event_type:
+        case AssetEventType.SPLIT | AssetEventType.REVERSE_SPLIT:
+            return STEP_SPLIT, event_date, action, factor, None
+
+        case AssetEventType.AMORTIZATION:
+            return STEP_AMORTIZATION, event_date, action, quantity, price or ZERO
+
+        case AssetEventType.SUBSCRIPTION:
+            return STEP_SUBSCRIPTION, event_date, action, quantity or ZERO, price or ZERO
+
+        case AssetEventType.CONVERSION:
+            return STEP_CONVERSION, event_date, action, None, None
+
+        case _:
+            return STEP_NOOP, event_date, action, None, None
+
+def replay(
+    steps: Iterable[ReplayStep],
+    quantity: Decimal,
+    total_cost: Decimal
+) -> Iterator[tuple[Date, str, Decimal, Decimal]]:
+    """Yield (date, origin_action, quantity, total_cost) after each step"""
+    for kind, step_date, action, a, b in steps:
+        if kind == STEP_BUY:
+            quantity = quantity + a
+            total_cost = total_cost + b
+
+        elif quantity > 0:
+            if kind == STEP_SELL:
+                avg_price = total_cost / quantity
+                new_quantity = quantity - a
+
+                if new_quantity <= 0:
+                    quantity, total_cost = ZERO, ZERO
+                else:
+                    quantity, total_cost = new_quantity, total_cost - (avg_price * a)
+
+            elif kind == STEP_SPLIT:
+                if a and a > 0:
+                    new_quantity = quantity / a
+
+                    if new_quantity <= 0:
+                        quantity, total_cost = ZERO, ZERO
+                    else:
+                        quantity = new_quantity
+
+            elif kind == STEP_AMORTIZATION:
+                new_total_cost = total_cost - ((a or quantity) * b)
+                total_cost = ZERO if new_total_cost <= 0 else new_total_cost
+
+            elif kind == STEP_SUBSCRIPTION:
+                quantity, total_cost = quantity + a, total_cost + (a * b)
+
+            elif kind == STEP_CONVERSION:
+                quantity, total_cost = ZERO, ZERO
+
+        yield step_date, action, quantity, total_cost
+
+def replay_state(
+    steps: Iterable[ReplayStep],
+    quantity: Decimal,
+    total_cost: Decimal
+) -> tuple[Decimal, Decimal]:
+    """(quantity, total_cost) after every step"""
+    for _, _, quantity, total_cost in replay(steps, quantity, total_cost):
+        pass
+
+    return quantity, total_cost
+
+def apply_item(item, quantity: Decimal, total_cost: Decimal) -> tuple[Decimal, Decimal, str]:
+    """
+    Reference rules: the position after one BrokerNote, AssetEvent or
+    ConversionInflow, with its origin action
+    """
+    if isinstance(item, AssetEvent):
+        quantity, total_cost = apply_asset_event(item, quantity, total_cost)
+        return quantity, total_cost, item.event_type.value.lower()
+
+    if isinstance(item, ConversionInflow):
+        return quantity + item.quantity, total_cost + item.total_cost, CONVERSION_ACTION
+
+    quantity, total_cost = apply_broker_note(item, quantity, total_cost)
+    return quantity, total_cost, item.operation.value.lower()
+
+def apply_asset_event(event: AssetEvent, quantity: Decimal, total_cost: Decimal) -> tuple[Decimal, Decimal]:
+    if quantity <= 0:
+        return quantity, total_cost
+
+    match event.event_type:
+        case AssetEventType.SPLIT | AssetEventType.REVERSE_SPLIT:
+            if not event.factor or event.factor <= 0:
+                return quantity, total_cost
+
+            new_quantity = quantity / event.factor
+
+            if new_quantity <= 0:
+                return ZERO, ZERO
+
+            return new_quantity, total_cost
+
+        case AssetEventType.AMORTIZATION:
+            event_quantity = event.quantity or quantity
+            event_price = event.price or ZERO
+
+            amortized_value = event_quantity * event_price
+            new_total_cost = total_cost - amortized_value
+
+            if new_total_cost <= 0:
+                return quantity, ZERO
+
+            return quantity, new_total_cost
+
+        case AssetEventType.SUBSCRIPTION:
+            event_quantity = event.quantity or ZERO
+            event_price = event.price or ZERO
+
+            added_cost = event_quantity * event_price
+
+            return (
+                quantity + event_quantity,
+                total_cost + added_cost,
+            )
+
+        case AssetEventType.CONVERSION:
+            # The position moves to converted_to_asset_id as a ConversionInflow
+            return ZERO, ZERO
+
+        case _:
+            return quantity, total_cost
+
+def apply_broker_note(note: BrokerNote, quantity: Decimal, total_cost: Decimal) -> tuple[Decimal, Decimal]:
+    if note.operation == OperationType.BUY:
+        return (
+            quantity + note.quantity,
+            total_cost + note.total_value
+        )
+
+    if note.operation == OperationType.SELL and quantity > 0:
+        avg_price = total_cost / quantity
+        new_quantity = quantity - note.quantity
+        new_cost = total_cost - (avg_price * note.quantity)
+
+        if new_quantity <= 0:
+            return ZERO, ZERO
+
+        return new_quantity, new_cost
+
+    return quantity, total_cost
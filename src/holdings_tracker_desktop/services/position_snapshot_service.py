@@ -1,17 +1,93 @@
+import heapq
+import math
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date as Date
 from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
 from typing import List
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Row, bindparam, create_engine, delete, exists, func, insert, lambda_stmt, select, tuple_, update
+)
+from sqlalchemy.orm import Session, aliased, sessionmaker
 
-from holdings_tracker_desktop.models import Asset, AssetEvent, AssetSector, BrokerNote, PositionSnapshot
+from holdings_tracker_desktop.models import (
+  Asset, AssetEvent, AssetSector, BrokerNote, Currency, PositionCheckpoint, PositionSnapshot
+)
 from holdings_tracker_desktop.models.asset_event import AssetEventType
-from holdings_tracker_desktop.models.broker_note import OperationType
-from holdings_tracker_desktop.repositories.base_repository import BaseRepository
+from holdings_tracker_desktop.repositories.base_repository import BaseRepository, Page
 from holdings_tracker_desktop.schemas.position_snapshot import (
   PositionSnapshotCreate, PositionSnapshotUpdate, PositionSnapshotResponse
 )
+from holdings_tracker_desktop.schemas.ui_rows import PositionSnapshotRow
+from holdings_tracker_desktop.services import position_replay
+from holdings_tracker_desktop.services.asset_dependency_graph import AssetDependencyGraph
+from holdings_tracker_desktop.services.position_replay import ConversionInflow, ReplayStep
+from holdings_tracker_desktop.services.read_cache import cached_read
+from holdings_tracker_desktop.services.year_summary_service import YearSummaryService
+from holdings_tracker_desktop.utils.dates import year_range
+
+# Matches the Numeric(20, 6) scale of the position_snapshots columns.
+SNAPSHOT_SCALE = Decimal("0.000001")
+
+# Upper bound of assets handed to a rebuild worker at once (keeps the
+# asset_id IN (...) lists well below SQLite's bound parameter limit).
+MAX_ASSETS_PER_WORKER_CHUNK = 500
+
+# Rows fetched per round trip when streaming an asset timeline.
+TIMELINE_BATCH_SIZE = 1000
+
+# Checkpoint alias and aggregate columns shared by the cached UI statements.
+_EarlierCheckpoint = aliased(PositionCheckpoint, name="earlier_checkpoint")
+_ALLOCATED_COST = func.sum(PositionCheckpoint.total_cost).label("total_cost")
+_SECTOR_NAME = func.coalesce(AssetSector.name, "Unclassified").label("sector_name")
+
+# Columns of a PositionSnapshotRow, in field order.
+_UI_ROW_COLUMNS = (
+    PositionSnapshot.id,
+    Asset.ticker,
+    PositionSnapshot.snapshot_date,
+    Currency.symbol,
+    PositionSnapshot.quantity,
+    PositionSnapshot.avg_price,
+    PositionSnapshot.origin_action,
+)
+
+# Session factory owned by each rebuild worker process.
+_worker_session_factory: sessionmaker | None = None
+
+def _init_rebuild_worker(database_url: str) -> None:
+    global _worker_session_factory
+
+    engine = create_engine(database_url)
+    _worker_session_factory = sessionmaker(autoflush=False, bind=engine)
+
+def _replay_assets_in_worker(asset_ids: list[int]) -> list[dict]:
+    db = _worker_session_factory()
+    try:
+        return PositionSnapshotService(db)._replay_assets(asset_ids)
+    finally:
+        db.close()
+
+def _is_checkpoint_as_of(year: int):
+    """
+    Condition keeping, for each asset, the PositionCheckpoint of its latest
+    year <= year: the shared filter of every "as of year" query.
+
+    The (asset_id, latest year) pairs come from one GROUP BY pass over the
+    unique (asset_id, year) index, and each pair is then a single index
+    lookup; checkpoints are unique per asset and year, so no asset is ever
+    counted twice. See benchmarks/as_of_year.py for the alternatives.
+    """
+    latest_years = (
+        select(_EarlierCheckpoint.asset_id, func.max(_EarlierCheckpoint.year))
+        .where(_EarlierCheckpoint.year <= year)
+        .group_by(_EarlierCheckpoint.asset_id)
+    )
+
+    return tuple_(PositionCheckpoint.asset_id, PositionCheckpoint.year).in_(latest_years)
 
 class PositionSnapshotService:
     def __init__(self, db: Session):
@@ -20,6 +96,7 @@ class PositionSnapshotService:
             db=db
         )
         self.db = db
+        self.year_summaries = YearSummaryService(db)
 
     def create(self, data: PositionSnapshotCreate) -> PositionSnapshotResponse:
         """Create new PositionSnapshot with validation"""
@@ -36,55 +113,80 @@ class PositionSnapshotService:
         asset_id: int,
         skip: int = 0,
         limit: int = 150
-    ) -> List[dict]:
-        """Get PositionSnapshots already formatted for UI"""
-        snapshots = (
-            self.db.query(PositionSnapshot)
-            .filter(PositionSnapshot.asset_id == asset_id)
+    ) -> List[PositionSnapshotRow]:
+        """Get PositionSnapshots of an asset as lightweight rows for UI"""
+        stmt = lambda_stmt(lambda: (
+            select(*_UI_ROW_COLUMNS)
+            .join(Asset, Asset.id == PositionSnapshot.asset_id)
+            .join(Currency, Currency.id == Asset.currency_id)
+            .where(PositionSnapshot.asset_id == asset_id)
             .order_by(
                 PositionSnapshot.snapshot_date.desc(),
                 PositionSnapshot.id.desc()
             )
             .offset(skip)
             .limit(limit)
-            .all()
-        )
+        ))
 
-        return [s.to_ui_dict() for s in snapshots]
+        return self.repository.fetch_rows(stmt, PositionSnapshotRow)
 
+    @cached_read(PositionSnapshot, PositionCheckpoint, Asset, Currency)
     def list_all_for_ui_by_year(
         self,
         year: int,
         skip: int = 0,
         limit: int = 150
-    ) -> List[dict]:
-        """Get PositionSnapshots already formatted for UI"""
-        subquery = (
-            self.db.query(
-                PositionSnapshot.asset_id,
-                func.max(PositionSnapshot.snapshot_date).label("max_date"),
-                func.max(PositionSnapshot.id).label("max_id")
-            )
-            .filter(func.extract("year", PositionSnapshot.snapshot_date) <= year)
-            .group_by(PositionSnapshot.asset_id)
-            .subquery()
-        )
-
-        snapshots = (
-            self.db.query(PositionSnapshot)
-            .join(
-                subquery,
-                (PositionSnapshot.asset_id == subquery.c.asset_id) &
-                (PositionSnapshot.id == subquery.c.max_id)
-            )
+    ) -> List[PositionSnapshotRow]:
+        """Get the latest PositionSnapshot of each asset up to a year as lightweight rows for UI"""
+        stmt = lambda_stmt(lambda: (
+            select(*_UI_ROW_COLUMNS)
+            .join(PositionCheckpoint, PositionCheckpoint.snapshot_id == PositionSnapshot.id)
+            .where(_is_checkpoint_as_of(year))
             .join(Asset, Asset.id == PositionSnapshot.asset_id)
+            .join(Currency, Currency.id == Asset.currency_id)
             .order_by(Asset.ticker.asc())
             .offset(skip)
             .limit(limit)
-            .all()
+        ))
+
+        return self.repository.fetch_rows(stmt, PositionSnapshotRow)
+
+    def page_for_ui_by_asset(
+        self,
+        asset_id: int,
+        limit: int = 150,
+        cursor: str | None = None
+    ) -> Page[PositionSnapshotRow]:
+        """Get one keyset page of the PositionSnapshots of an asset as rows for UI, latest first"""
+        stmt = (
+            select(*_UI_ROW_COLUMNS)
+            .join(Asset, Asset.id == PositionSnapshot.asset_id)
+            .join(Currency, Currency.id == Asset.currency_id)
+            .where(PositionSnapshot.asset_id == asset_id)
         )
 
-        return [s.to_ui_dict() for s in snapshots]
+        return self.repository.get_rows_page(
+            stmt, PositionSnapshotRow, limit, cursor, PositionSnapshot.snapshot_date, descending=True
+        )
+
+    def page_for_ui_by_year(
+        self,
+        year: int,
+        limit: int = 150,
+        cursor: str | None = None
+    ) -> Page[PositionSnapshotRow]:
+        """Get one keyset page of the positions held up to a year as rows for UI, by ticker"""
+        stmt = (
+            select(*_UI_ROW_COLUMNS)
+            .join(PositionCheckpoint, PositionCheckpoint.snapshot_id == PositionSnapshot.id)
+            .where(_is_checkpoint_as_of(year))
+            .join(Asset, Asset.id == PositionSnapshot.asset_id)
+            .join(Currency, Currency.id == Asset.currency_id)
+        )
+
+        return self.repository.get_rows_page(
+            stmt, PositionSnapshotRow, limit, cursor, Asset.ticker, order_field="asset_ticker"
+        )
 
     def count_all(self) -> int:
         """Count all PositionSnapshots"""
@@ -94,23 +196,16 @@ class PositionSnapshotService:
         min_date: Date | None = self.db.query(func.min(PositionSnapshot.snapshot_date)).scalar()
         return min_date
 
-    def get_allocation_by_asset(self, year: int, asset_type_id: int | None = None) -> list[dict]:
-        query, total_cost = self._base_allocation_query(year)
-
-        query = query.with_entities(
-            Asset.ticker, 
-            total_cost
-        )
+    def get_earliest_snapshot_year(self) -> int | None:
+        return self.year_summaries.get_earliest_snapshot_year()
 
-        if asset_type_id is not None:
-            query = query.filter(Asset.type_id == asset_type_id)
+    @cached_read(PositionCheckpoint, Asset)
+    def get_allocation_by_asset(self, year: int, asset_type_id: int | None = None) -> list[dict]:
+        stmt = lambda_stmt(lambda: select(Asset.ticker, _ALLOCATED_COST).select_from(Asset))
+        stmt = self._filter_allocation(stmt, year, asset_type_id)
+        stmt += lambda s: s.group_by(Asset.ticker).order_by(_ALLOCATED_COST.desc())
 
-        rows = (
-            query
-            .group_by(Asset.ticker)
-            .order_by(total_cost.desc())
-            .all()
-        )
+        rows = self.db.execute(stmt).all()
 
         return [
             {"label": ticker, "value": float(total)}
@@ -118,28 +213,17 @@ class PositionSnapshotService:
             if total > 0
         ]
 
+    @cached_read(PositionCheckpoint, Asset, AssetSector)
     def get_allocation_by_sector(self, year: int, asset_type_id: int | None = None) -> list[dict]:
-        query, total_cost = self._base_allocation_query(year)
-
-        sector_label = func.coalesce(AssetSector.name, "Unclassified").label("sector_name")
-
-        query = query.with_entities(
-            sector_label,
-            total_cost
-        ).outerjoin(
-            AssetSector,
-            AssetSector.id == Asset.sector_id
-        )
-
-        if asset_type_id is not None:
-            query = query.filter(Asset.type_id == asset_type_id)
+        stmt = lambda_stmt(lambda: (
+            select(_SECTOR_NAME, _ALLOCATED_COST)
+            .select_from(Asset)
+            .outerjoin(AssetSector, AssetSector.id == Asset.sector_id)
+        ))
+        stmt = self._filter_allocation(stmt, year, asset_type_id)
+        stmt += lambda s: s.group_by(_SECTOR_NAME).order_by(_ALLOCATED_COST.desc())
 
-        rows = (
-            query
-            .group_by(sector_label)
-            .order_by(total_cost.desc())
-            .all()
-        )
+        rows = self.db.execute(stmt).all()
 
         return [
             {"label": sector, "value": float(total)}
@@ -147,174 +231,592 @@ class PositionSnapshotService:
             if total and total > 0
         ]
 
-    def _base_allocation_query(self, year: int):
-        subquery = (
-            self.db.query(
-                PositionSnapshot.asset_id,
-                func.max(PositionSnapshot.snapshot_date).label("max_date")
-            )
-            .filter(func.extract("year", PositionSnapshot.snapshot_date) <= year)
-            .group_by(PositionSnapshot.asset_id)
-            .subquery()
+    def _filter_allocation(self, stmt, year: int, asset_type_id: int | None):
+        """Restrict an allocation statement to each asset's checkpoint as of a year"""
+        stmt += lambda s: (
+            s.join(PositionCheckpoint, PositionCheckpoint.asset_id == Asset.id)
+            .where(_is_checkpoint_as_of(year))
         )
 
-        total_cost = func.sum(
-            PositionSnapshot.quantity * PositionSnapshot.avg_price
-        ).label("total_cost")
-
-        query = (
-            self.db.query(total_cost)
-            .select_from(Asset)
-            .join(PositionSnapshot, PositionSnapshot.asset_id == Asset.id)
-            .join(
-                subquery,
-                (PositionSnapshot.asset_id == subquery.c.asset_id) &
-                (PositionSnapshot.snapshot_date == subquery.c.max_date)
-            )
-        )
+        if asset_type_id is not None:
+            stmt += lambda s: s.where(Asset.type_id == asset_type_id)
 
-        return query, total_cost
+        return stmt
 
     def rebuild_from(self, asset_id: int, from_date: Date) -> None:
         """
         Rebuild incremental snapshots for an asset starting from a given date.
-        All snapshots >= from_date are deleted and rebuilt.
+        The series from from_date is replayed and diffed against the stored
+        snapshots, so only changed rows are written, unless the change only
+        appends to the end of the timeline, in which case the new snapshots
+        are computed from the last persisted state. Year-end checkpoints
+        from from_date's year onwards are refreshed as well, together with
+        the snapshot years of the year summaries.
         """
         try:
-            self._delete_snapshots_from(asset_id, from_date)
-            qty, cost = self._load_state_before(asset_id, from_date)
-            timeline = self._load_timeline(asset_id, from_date)
-            self._build_from_timeline(asset_id, timeline, qty, cost)
+            old_years = self._checkpoint_years(asset_id, from_date.year)
+            self._delete_checkpoints_from(asset_id, from_date.year)
+
+            if not self._try_append_from(asset_id, from_date):
+                qty, cost = self._load_state_before(asset_id, from_date)
+                steps = self._stream_timeline(asset_id, from_date)
+                self._sync_snapshots_from(asset_id, from_date, steps, qty, cost)
+
+            self.db.flush()
+            self._insert_checkpoints(asset_id, from_date.year)
+            self.year_summaries.replace_snapshot_years(
+                old_years,
+                self._checkpoint_years(asset_id, from_date.year)
+            )
             self.repository.save_changes()
         except Exception:
             self.repository.rollback()
             raise
 
-    def _delete_snapshots_from(self, asset_id: int, from_date: Date) -> None:
-        self.db.query(PositionSnapshot).filter(
-            PositionSnapshot.asset_id == asset_id,
-            PositionSnapshot.snapshot_date >= from_date
-        ).delete(synchronize_session=False)
+    def rebuild_all(self, workers: int = 1) -> int:
+        """
+        Rebuild the snapshots of every asset from scratch.
+
+        All broker notes and asset events are loaded in two ordered queries,
+        replayed per asset in memory and written back with a single bulk
+        insert inside one transaction, followed by the year-end checkpoints.
+        The year summaries are recomputed from scratch as well.
+
+        Args:
+            workers: Number of worker processes replaying assets in parallel.
+                Each worker opens its own engine on the same database and
+                returns its rows for the single bulk write. Assets linked
+                by CONVERSION events and in-memory databases are always
+                replayed in this process. Process start-up and pickling
+                the rows back outweigh the replay on small portfolios, so
+                the default stays 1: benchmarks/parallel_rebuild.py on a
+                single core measured workers=4 at 0.50s vs 0.35s for 300
+                assets and 13.6s vs 12.4s for 10000 assets.
+
+        Returns:
+            Number of snapshots written
+        """
+        try:
+            if workers > 1 and self._supports_worker_processes():
+                rows = self._replay_assets_in_parallel(workers)
+            else:
+                rows = self._replay_assets()
 
-    def _load_state_before(self, asset_id: int, from_date: Date) -> tuple[Decimal, Decimal]:
-        snapshot = (
-            self.db.query(PositionSnapshot)
-            .filter(
+            self.db.query(PositionCheckpoint).delete(synchronize_session=False)
+            self.db.query(PositionSnapshot).delete(synchronize_session=False)
+
+            if rows:
+                self.db.execute(insert(PositionSnapshot), rows)
+                self._insert_checkpoints()
+
+            self.year_summaries.refresh()
+            self.repository.save_changes()
+            return len(rows)
+        except Exception:
+            self.repository.rollback()
+            raise
+
+    def _supports_worker_processes(self) -> bool:
+        url = self.db.get_bind().engine.url
+        return url.database not in (None, "", ":memory:")
+
+    def _replay_assets_in_parallel(self, workers: int) -> list[dict]:
+        database_url = self.db.get_bind().engine.url.render_as_string(hide_password=False)
+
+        # Conversions carry positions across assets, so linked assets are
+        # replayed together, in dependency order, by this process.
+        linked_ids = sorted(AssetDependencyGraph.load(self.db).linked_assets)
+        asset_ids = [
+            asset_id
+            for (asset_id,) in self.db.query(Asset.id).order_by(Asset.id)
+            if asset_id not in linked_ids
+        ]
+
+        chunk_size = min(
+            MAX_ASSETS_PER_WORKER_CHUNK,
+            max(1, math.ceil(len(asset_ids) / (workers * 4)))
+        )
+        chunks = [
+            asset_ids[i:i + chunk_size]
+            for i in range(0, len(asset_ids), chunk_size)
+        ]
+
+        rows = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_rebuild_worker,
+            initargs=(database_url,)
+        ) as executor:
+            for chunk_rows in executor.map(_replay_assets_in_worker, chunks):
+                rows.extend(chunk_rows)
+
+        if linked_ids:
+            rows.extend(self._replay_assets(linked_ids))
+
+        return rows
+
+    def _replay_assets(self, asset_ids: list[int] | None = None) -> list[dict]:
+        """
+        Replay every asset in conversion dependency order.
+
+        The position right before each CONVERSION step of a source asset
+        becomes a ConversionInflow step on its converted-to asset, which is
+        always replayed later.
+        """
+        events, notes = self._load_all_steps(asset_ids)
+        conversions = self._load_all_conversions(asset_ids)
+
+        graph = AssetDependencyGraph(
+            (c.asset_id, c.converted_to_asset_id, c.date)
+            for c in conversions
+            if c.converted_to_asset_id is not None
+        )
+
+        outgoing: dict[int, list] = {}
+        for conversion in conversions:
+            outgoing.setdefault(conversion.asset_id, []).append(conversion)
+
+        # target asset_id -> [(date, conversion id, inflow step)]
+        incoming: dict[int, list] = {}
+
+        rows = []
+        for asset_id in graph.topological_order(events.keys() | notes.keys() | graph.linked_assets):
+            inflows = [step for _, _, step in sorted(incoming.pop(asset_id, []))]
+
+            # Events first, then inflows, then notes: the stable sort by date
+            # keeps that precedence within the same day.
+            steps = events.get(asset_id, []) + inflows + notes.get(asset_id, [])
+            steps.sort(key=itemgetter(1))
+
+            if asset_id not in outgoing:
+                rows.extend(self._replay_steps(asset_id, steps, Decimal("0"), Decimal("0")))
+                continue
+
+            pending = iter(outgoing[asset_id])
+            quantity, total_cost = Decimal("0"), Decimal("0")
+
+            for (kind, *_), (step_date, action, new_quantity, new_cost) in zip(
+                steps, position_replay.replay(steps, quantity, total_cost)
+            ):
+                if kind == position_replay.STEP_CONVERSION:
+                    conversion = next(pending)
+
+                    if conversion.converted_to_asset_id is not None:
+                        inflow = position_replay.conversion_inflow(
+                            step_date, quantity, total_cost,
+                            conversion.conversion_quantity, conversion.residual_value
+                        )
+                        incoming.setdefault(conversion.converted_to_asset_id, []).append(
+                            (step_date, conversion.id, position_replay.encode_item(inflow))
+                        )
+
+                quantity, total_cost = new_quantity, new_cost
+                rows.append(self._snapshot_row(asset_id, step_date, quantity, total_cost, action))
+
+        return rows
+
+    def _try_append_from(self, asset_id: int, from_date: Date) -> bool:
+        """
+        Fast path for notes/events landing at or after the last snapshot.
+
+        Snapshots already persisted on from_date are kept only if replaying
+        the timeline reproduces them exactly; otherwise the caller falls
+        back to the diff-based rebuild.
+        """
+        has_later_snapshots = self.db.scalar(lambda_stmt(lambda: select(
+            exists().where(
                 PositionSnapshot.asset_id == asset_id,
-                PositionSnapshot.snapshot_date < from_date
+                PositionSnapshot.snapshot_date > from_date
             )
-            .order_by(PositionSnapshot.snapshot_date.desc())
-            .first()
+        )))
+
+        if has_later_snapshots:
+            return False
+
+        existing = self.db.execute(lambda_stmt(lambda: (
+            select(
+                PositionSnapshot.snapshot_date, PositionSnapshot.origin_action,
+                PositionSnapshot.quantity, PositionSnapshot.avg_price
+            )
+            .where(
+                PositionSnapshot.asset_id == asset_id,
+                PositionSnapshot.snapshot_date == from_date
+            )
+            .order_by(PositionSnapshot.id.asc())
+        ))).all()
+
+        quantity, total_cost = self._load_state_before(asset_id, from_date)
+        replayed = position_replay.replay(self._stream_timeline(asset_id, from_date), quantity, total_cost)
+        count = 0
+
+        for step_date, action, quantity, total_cost in replayed:
+            if count < len(existing):
+                if not self._snapshot_matches(existing[count], step_date, quantity, total_cost, action):
+                    return False
+            else:
+                self._add_snapshot(asset_id, step_date, quantity, total_cost, action)
+
+            count += 1
+
+        # A shorter timeline means stored snapshots must be removed
+        return count >= len(existing)
+
+    def _snapshot_matches(
+            self,
+            snapshot: Row,
+            snapshot_date: Date,
+            quantity: Decimal,
+            total_cost: Decimal,
+            origin_action: str
+        ) -> bool:
+        avg_price = total_cost / quantity if quantity > 0 else Decimal("0")
+
+        return (
+            snapshot.snapshot_date == snapshot_date
+            and snapshot.origin_action == origin_action
+            and snapshot.quantity == quantity.quantize(SNAPSHOT_SCALE)
+            and snapshot.avg_price == avg_price.quantize(SNAPSHOT_SCALE)
         )
 
-        if not snapshot:
-            return Decimal("0"), Decimal("0")
+    def _sync_snapshots_from(
+            self,
+            asset_id: int,
+            from_date: Date,
+            steps: Iterable[ReplayStep],
+            quantity: Decimal,
+            total_cost: Decimal
+        ) -> None:
+        """
+        Persist the replayed series from from_date as a diff against the
+        stored snapshots.
+
+        Rows are keyed by (date, origin_action, sequence), sequence being the
+        position among same-action rows of that date. On each date the
+        leading rows whose keys match are kept and only updated when their
+        values changed; the remaining stored rows are deleted and the
+        remaining replayed rows inserted, so ids keep following timeline
+        order within a date.
+
+        Stored and replayed rows are merged as two date-ordered streams, so
+        only one date of each is held at a time. Writes are buffered and
+        issued in bulk once both streams are exhausted.
+        """
+        stored = self.db.execute(
+            lambda_stmt(lambda: (
+                select(
+                    PositionSnapshot.id, PositionSnapshot.snapshot_date, PositionSnapshot.origin_action,
+                    PositionSnapshot.quantity, PositionSnapshot.avg_price
+                )
+                .where(
+                    PositionSnapshot.asset_id == asset_id,
+                    PositionSnapshot.snapshot_date >= from_date
+                )
+                .order_by(PositionSnapshot.snapshot_date, PositionSnapshot.id)
+            )),
+            execution_options={"yield_per": TIMELINE_BATCH_SIZE}
+        )
+        replayed = position_replay.replay(steps, quantity, total_cost)
+
+        merged = heapq.merge(
+            ((row.snapshot_date, True, row) for row in stored),
+            ((row[0], False, row) for row in replayed),
+            key=itemgetter(0)
+        )
+
+        updates, deleted_ids, inserts = [], [], []
+
+        for snapshot_date, entries in groupby(merged, key=itemgetter(0)):
+            old_rows, new_rows = [], []
+
+            for _, is_stored, row in entries:
+                (old_rows if is_stored else new_rows).append(row)
+
+            kept = 0
+
+            for old, (_, action, new_quantity, new_cost) in zip(old_rows, new_rows):
+                if old.origin_action != action:
+                    break
+
+                if not self._snapshot_matches(old, snapshot_date, new_quantity, new_cost, action):
+                    row = self._snapshot_row(asset_id, snapshot_date, new_quantity, new_cost, action)
+                    updates.append({"id": old.id, "quantity": row["quantity"], "avg_price": row["avg_price"]})
 
-        return snapshot.quantity, snapshot.total_cost
+                kept += 1
 
-    def _load_timeline(self, asset_id: int, from_date: Date) -> list:
-        notes = (
-            self.db.query(BrokerNote)
-            .filter(
-                BrokerNote.asset_id == asset_id,
-                BrokerNote.date >= from_date,
+            deleted_ids.extend(old.id for old in old_rows[kept:])
+            inserts.extend(
+                self._snapshot_row(asset_id, snapshot_date, new_quantity, new_cost, action)
+                for _, action, new_quantity, new_cost in new_rows[kept:]
             )
-            .all()
-        )
 
-        events = (
-            self.db.query(AssetEvent)
-            .filter(
-                AssetEvent.asset_id == asset_id,
-                AssetEvent.date >= from_date,
+        if updates:
+            self.db.execute(update(PositionSnapshot), updates)
+
+        if deleted_ids:
+            self.db.execute(
+                delete(PositionSnapshot.__table__).where(PositionSnapshot.id == bindparam("snapshot_id")),
+                [{"snapshot_id": snapshot_id} for snapshot_id in deleted_ids]
             )
-            .all()
-        )
 
-        timeline = notes + events
+        if inserts:
+            self.db.execute(insert(PositionSnapshot), inserts)
 
-        # AssetEvent takes precedence over BrokerNote
-        timeline.sort(
-            key=lambda x: (
-                x.date,
-                0 if isinstance(x, AssetEvent) else 1
+    def _checkpoint_years(self, asset_id: int, from_year: int) -> list[int]:
+        return self.db.scalars(lambda_stmt(lambda: (
+            select(PositionCheckpoint.year)
+            .where(
+                PositionCheckpoint.asset_id == asset_id,
+                PositionCheckpoint.year >= from_year
             )
+        ))).all()
+
+    def _delete_checkpoints_from(self, asset_id: int, from_year: int) -> None:
+        self.db.query(PositionCheckpoint).filter(
+            PositionCheckpoint.asset_id == asset_id,
+            PositionCheckpoint.year >= from_year
+        ).delete(synchronize_session=False)
+
+    def _insert_checkpoints(self, asset_id: int | None = None, from_year: int | None = None) -> None:
+        """
+        Write one checkpoint per (asset, year) from the persisted snapshots.
+
+        Snapshot ids follow timeline order within a date, so the last
+        snapshot of a year is the first one by (snapshot_date, id) descending.
+        """
+        year = func.extract("year", PositionSnapshot.snapshot_date)
+        ranked = select(
+            PositionSnapshot.id,
+            func.row_number().over(
+                partition_by=(PositionSnapshot.asset_id, year),
+                order_by=(PositionSnapshot.snapshot_date.desc(), PositionSnapshot.id.desc())
+            ).label("position")
         )
 
-        return timeline
+        if asset_id is not None:
+            ranked = ranked.where(PositionSnapshot.asset_id == asset_id)
 
-    def _build_from_timeline(self, asset_id: int, timeline: list, quantity: Decimal, total_cost: Decimal) -> None:
-        for item in timeline:
-            if isinstance(item, AssetEvent):
-                quantity, total_cost = self._apply_asset_event(item, quantity, total_cost)
-                action = item.event_type.value.lower()
+        if from_year is not None:
+            ranked = ranked.where(PositionSnapshot.snapshot_date >= Date(from_year, 1, 1))
 
-            elif isinstance(item, BrokerNote):
-                quantity, total_cost = self._apply_broker_note(item, quantity, total_cost)
-                action = item.operation.value.lower()
+        ranked = ranked.subquery()
+        last_ids = select(ranked.c.id).where(ranked.c.position == 1)
 
-            self._add_snapshot(asset_id, item.date, quantity, total_cost, action)
+        checkpoints = select(
+            PositionSnapshot.asset_id,
+            year,
+            PositionSnapshot.id,
+            PositionSnapshot.quantity,
+            PositionSnapshot.quantity * PositionSnapshot.avg_price
+        ).where(PositionSnapshot.id.in_(last_ids))
 
-    def _apply_asset_event(self, event: AssetEvent, quantity: Decimal, total_cost: Decimal) -> tuple[Decimal, Decimal]:
-        if quantity <= 0:
-            return quantity, total_cost
+        self.db.execute(
+            insert(PositionCheckpoint).from_select(
+                ["asset_id", "year", "snapshot_id", "quantity", "total_cost"],
+                checkpoints
+            )
+        )
+
+    def _load_state_before(self, asset_id: int, from_date: Date) -> tuple[Decimal, Decimal]:
+        """
+        Position right before from_date.
 
-        match event.event_type:
-            case AssetEventType.SPLIT | AssetEventType.REVERSE_SPLIT:
-                if not event.factor or event.factor <= 0:
-                    return quantity, total_cost
+        Only from_date's own year is searched in position_snapshots; earlier
+        years are seeded from the latest year-end checkpoint.
+        """
+        year_start, _ = year_range(from_date.year)
 
-                new_quantity = quantity / event.factor
+        snapshot = self.db.execute(lambda_stmt(lambda: (
+            select(PositionSnapshot.quantity, PositionSnapshot.avg_price)
+            .where(
+                PositionSnapshot.asset_id == asset_id,
+                PositionSnapshot.snapshot_date >= year_start,
+                PositionSnapshot.snapshot_date < from_date
+            )
+            .order_by(
+                PositionSnapshot.snapshot_date.desc(),
+                PositionSnapshot.id.desc()
+            )
+            .limit(1)
+        ))).first()
 
-                if new_quantity <= 0:
-                    return Decimal("0"), Decimal("0")
+        if not snapshot:
+            from_year = from_date.year
+
+            snapshot = self.db.execute(lambda_stmt(lambda: (
+                select(PositionSnapshot.quantity, PositionSnapshot.avg_price)
+                .join(PositionCheckpoint, PositionCheckpoint.snapshot_id == PositionSnapshot.id)
+                .where(
+                    PositionCheckpoint.asset_id == asset_id,
+                    PositionCheckpoint.year < from_year
+                )
+                .order_by(PositionCheckpoint.year.desc())
+                .limit(1)
+            ))).first()
 
-                return new_quantity, total_cost
+        if not snapshot:
+            return Decimal("0"), Decimal("0")
 
-            case AssetEventType.AMORTIZATION:
-                event_quantity = event.quantity or quantity
-                event_price = event.price or Decimal("0")
+        return snapshot.quantity, snapshot.quantity * snapshot.avg_price
 
-                amortized_value = event_quantity * event_price
-                new_total_cost = total_cost - amortized_value
+    def _stream_timeline(self, asset_id: int, from_date: Date) -> Iterator[ReplayStep]:
+        """
+        Replay steps of an asset from a date, streamed in timeline order.
 
-                if new_total_cost <= 0:
-                    return quantity, Decimal("0")
+        Notes and events are read from two date-ordered cursors over the
+        replayed columns only and merged lazily; on the same day events
+        come first, then conversion inflows, then notes.
+        """
+        # Computed up front: they query other assets' snapshots
+        inflows = self._load_conversion_inflows(asset_id, from_date)
+
+        events = self.db.execute(
+            lambda_stmt(lambda: (
+                select(
+                    AssetEvent.date, AssetEvent.event_type, AssetEvent.factor,
+                    AssetEvent.quantity, AssetEvent.price
+                )
+                .where(
+                    AssetEvent.asset_id == asset_id,
+                    AssetEvent.date >= from_date,
+                )
+                .order_by(AssetEvent.date, AssetEvent.id)
+            )),
+            execution_options={"yield_per": TIMELINE_BATCH_SIZE}
+        )
 
-                return quantity, new_total_cost
+        notes = self.db.execute(
+            lambda_stmt(lambda: (
+                select(
+                    BrokerNote.date, BrokerNote.operation, BrokerNote.quantity,
+                    BrokerNote.price, BrokerNote.fees, BrokerNote.taxes
+                )
+                .where(
+                    BrokerNote.asset_id == asset_id,
+                    BrokerNote.date >= from_date,
+                )
+                .order_by(BrokerNote.date, BrokerNote.id)
+            )),
+            execution_options={"yield_per": TIMELINE_BATCH_SIZE}
+        )
 
-            case AssetEventType.SUBSCRIPTION:
-                event_quantity = event.quantity or Decimal("0")
-                event_price = event.price or Decimal("0")
+        # heapq.merge yields ties in the order of its inputs
+        return heapq.merge(
+            (position_replay.encode_event(*row) for row in events),
+            (position_replay.encode_item(inflow) for inflow in inflows),
+            (position_replay.encode_note(*row) for row in notes),
+            key=itemgetter(1)
+        )
 
-                added_cost = event_quantity * event_price
+    def _load_conversion_inflows(self, asset_id: int, from_date: Date) -> list[ConversionInflow]:
+        """
+        Positions converted into an asset from other assets since a date.
 
-                return (
-                    quantity + event_quantity,
-                    total_cost + added_cost,
+        Each inflow is computed from the source snapshots, so source assets
+        must be rebuilt before the assets they convert into.
+        """
+        conversions = self.db.scalars(lambda_stmt(lambda: (
+            select(AssetEvent)
+            .where(
+                AssetEvent.converted_to_asset_id == asset_id,
+                AssetEvent.event_type == AssetEventType.CONVERSION,
+                AssetEvent.date >= from_date,
+            )
+            .order_by(AssetEvent.date, AssetEvent.id)
+        ))).all()
+
+        inflows = []
+        for conversion in conversions:
+            quantity, total_cost = self._load_state_before_conversion(conversion)
+            inflows.append(
+                position_replay.conversion_inflow(
+                    conversion.date, quantity, total_cost,
+                    conversion.conversion_quantity, conversion.residual_value
                 )
+            )
+
+        return inflows
 
-            case _:
-                return quantity, total_cost
+    def _load_state_before_conversion(self, conversion: AssetEvent) -> tuple[Decimal, Decimal]:
+        """
+        Position of the source asset right before a CONVERSION step.
+
+        Steps of a day are ordered like _stream_timeline and _replay_assets
+        order them: events by id, then conversion inflows, then notes. So
+        only the source's earlier events of that day precede the conversion;
+        positions converted into the source that day arrive after it.
+        """
+        quantity, total_cost = self._load_state_before(conversion.asset_id, conversion.date)
+        source_id, conversion_date, conversion_id = conversion.asset_id, conversion.date, conversion.id
 
-    def _apply_broker_note(self, note: BrokerNote, quantity: Decimal, total_cost: Decimal) -> tuple[Decimal, Decimal]:
-        if note.operation == OperationType.BUY:
-            return (
-                quantity + note.quantity,
-                total_cost + note.total_value
+        same_day_events = self.db.execute(lambda_stmt(lambda: (
+            select(
+                AssetEvent.date, AssetEvent.event_type, AssetEvent.factor,
+                AssetEvent.quantity, AssetEvent.price
             )
+            .where(
+                AssetEvent.asset_id == source_id,
+                AssetEvent.date == conversion_date,
+                AssetEvent.id < conversion_id,
+            )
+            .order_by(AssetEvent.id)
+        )))
+
+        steps = [position_replay.encode_event(*values) for values in same_day_events]
+        return position_replay.replay_state(steps, quantity, total_cost)
+
+    def _load_all_conversions(self, asset_ids: list[int] | None = None) -> list:
+        """CONVERSION events of many assets, ordered like their replay steps"""
+        query = self.db.query(
+            AssetEvent.id, AssetEvent.asset_id, AssetEvent.date, AssetEvent.converted_to_asset_id,
+            AssetEvent.conversion_quantity, AssetEvent.residual_value
+        ).filter(AssetEvent.event_type == AssetEventType.CONVERSION)
+
+        if asset_ids is not None:
+            query = query.filter(AssetEvent.asset_id.in_(asset_ids))
+
+        return query.order_by(AssetEvent.asset_id, AssetEvent.date, AssetEvent.id).all()
+
+    def _load_all_steps(self, asset_ids: list[int] | None = None) -> tuple[dict[int, list], dict[int, list]]:
+        """
+        Load replay steps for many assets at once, as event steps and note
+        steps grouped by asset_id, each in (date, id) order.
+
+        Only the columns needed by the replay are selected, so no ORM
+        objects are hydrated.
+        """
+        notes_query = self.db.query(
+            BrokerNote.asset_id, BrokerNote.date, BrokerNote.operation,
+            BrokerNote.quantity, BrokerNote.price, BrokerNote.fees, BrokerNote.taxes
+        )
+        events_query = self.db.query(
+            AssetEvent.asset_id, AssetEvent.date, AssetEvent.event_type,
+            AssetEvent.factor, AssetEvent.quantity, AssetEvent.price
+        )
+
+        if asset_ids is not None:
+            notes_query = notes_query.filter(BrokerNote.asset_id.in_(asset_ids))
+            events_query = events_query.filter(AssetEvent.asset_id.in_(asset_ids))
 
-        if note.operation == OperationType.SELL and quantity > 0:
-            avg_price = total_cost / quantity
-            new_quantity = quantity - note.quantity
-            new_cost = total_cost - (avg_price * note.quantity)
+        notes = notes_query.order_by(BrokerNote.asset_id, BrokerNote.date, BrokerNote.id)
+        events = events_query.order_by(AssetEvent.asset_id, AssetEvent.date, AssetEvent.id)
 
-            if new_quantity <= 0:
-                return Decimal("0"), Decimal("0")
+        event_steps: dict[int, list] = {}
+        note_steps: dict[int, list] = {}
 
-            return new_quantity, new_cost
+        for asset_id, *values in events:
+            event_steps.setdefault(asset_id, []).append(position_replay.encode_event(*values))
 
-        return quantity, total_cost
+        for asset_id, *values in notes:
+            note_steps.setdefault(asset_id, []).append(position_replay.encode_note(*values))
+
+        return event_steps, note_steps
+
+    def _replay_steps(self, asset_id: int, steps: list, quantity: Decimal, total_cost: Decimal) -> list[dict]:
+        return [
+            self._snapshot_row(asset_id, step_date, step_quantity, step_cost, action)
+            for step_date, action, step_quantity, step_cost
+            in position_replay.replay(steps, quantity, total_cost)
+        ]
 
     def _add_snapshot(
             self, 
@@ -325,14 +827,27 @@ class PositionSnapshotService:
             origin_action: str
         ) -> None:
 
-        avg_price = total_cost / quantity if quantity > 0 else Decimal("0")
-
         self.db.add(
             PositionSnapshot(
-                asset_id=asset_id,
-                snapshot_date=snapshot_date,
-                quantity=quantity,
-                avg_price=avg_price,
-                origin_action=origin_action
+                **self._snapshot_row(asset_id, snapshot_date, quantity, total_cost, origin_action)
             )
         )
+
+    def _snapshot_row(
+            self,
+            asset_id: int,
+            snapshot_date: Date,
+            quantity: Decimal,
+            total_cost: Decimal,
+            origin_action: str
+        ) -> dict:
+
+        avg_price = total_cost / quantity if quantity > 0 else Decimal("0")
+
+        return {
+            "asset_id": asset_id,
+            "snapshot_date": snapshot_date,
+            "quantity": quantity,
+            "avg_price": avg_price,
+            "origin_action": origin_action
+        }
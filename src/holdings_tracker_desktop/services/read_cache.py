@@ -0,0 +1,361 @@
+"""
+Result cache for pure service read methods.
+
+cached_read(*models) memoizes a service method on its call arguments (and
+the engine behind the service's session) in a process-wide LRU, bounded by
+entry count and by the estimated size of the cached results. Each entry is
+tagged with the tables its query reads.
+
+Entries are invalidated from committed writes rather than from UI signals,
+so rebuilds, imports and seeds are covered as well: every engine records
+the tables touched by the INSERT, UPDATE and DELETE statements of each
+connection, and when that transaction commits the data version of those
+tables is bumped and the entries reading them are dropped.
+
+Those events only see the engines of this process. For writes made by
+another process on the same SQLite file (rebuild_positions.py or seed.py
+run while the app is open), each lookup reads PRAGMA data_version on a
+connection kept per database file, which changes whenever any other
+connection commits. The commits of this process move its baseline forward
+once they are settled, so only a change nobody here accounts for drops
+every entry (the tables written are unknown then). An outside commit that
+lands between one of ours and its settling is taken for ours.
+
+A session whose open transaction wrote to one of a method's tables reads
+around the cache, and a result read from a snapshot older than the last
+write to its tables is returned but not stored.
+
+Cached results are shared between callers and must not be mutated.
+"""
+import functools
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import Pool
+
+MAX_ENTRIES = 256
+MAX_BYTES = 64 * 2**20
+
+# Elements measured per collection when estimating a result's size; the
+# rest are assumed to be alike.
+SIZE_SAMPLE = 64
+
+# Marks a write whose tables are unknown (raw SQL, DDL).
+ALL_TABLES = "*"
+
+# connection.info keys
+_PENDING_KEY = "read_cache_pending_tables"
+_COMMITTED_KEY = "read_cache_committed_tables"
+_BEGIN_KEY = "read_cache_begin_version"
+_WATCH_KEY = "read_cache_data_version_watch"
+
+_WRITE_KEYWORDS = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER")
+
+@dataclass
+class _Entry:
+    value: object
+    tables: frozenset[str]
+    size: int
+
+class ReadCache:
+    """LRU of read results, invalidated per table"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._clock = 0
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def clock(self) -> int:
+        """Data version of the most recent invalidation"""
+        return self._clock
+
+    @property
+    def size(self) -> int:
+        """Estimated bytes held by the cached results"""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def version(self, tables: Iterable[str]) -> int:
+        """Data version of the most recently written of the given tables"""
+        with self._lock:
+            return max(
+                (self._versions.get(table, 0) for table in (*tables, ALL_TABLES)),
+                default=0
+            )
+
+    def get(self, key: tuple) -> tuple[bool, object]:
+        """(True, value) for a cached key, (False, None) otherwise"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.value
+
+    def put(self, key: tuple, value, tables: frozenset[str], as_of: int) -> None:
+        """
+        Store a result read at data version as_of, unless one of its tables
+        has been written since or it does not fit in the cache.
+        """
+        size = _estimate_size(value)
+
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if self.version(tables) > as_of:
+                return
+
+            self._discard(key)
+            self._entries[key] = _Entry(value, tables, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        """Bump the data version of tables and drop the entries reading them"""
+        tables = set(tables)
+
+        with self._lock:
+            self._clock += 1
+
+            for table in tables:
+                self._versions[table] = self._clock
+
+            stale = [
+                key for key, entry in self._entries.items()
+                if ALL_TABLES in tables or entry.tables & tables
+            ]
+
+            for key in stale:
+                self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _discard(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self._bytes -= entry.size
+
+read_cache = ReadCache()
+
+def cached_read(*models):
+    """
+    Cache a service read method in read_cache.
+
+    models are the mapped classes whose tables the method's queries read;
+    a committed write to any of them invalidates the cached results.
+    """
+    tables = frozenset(model.__tablename__ for model in models)
+
+    def decorator(method):
+        name = method.__qualname__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            db = self.repository.db
+
+            if not read_cache.enabled:
+                return method(self, *args, **kwargs)
+
+            if _pending_writes(db) & (tables | {ALL_TABLES}):
+                return method(self, *args, **kwargs)
+
+            _check_external_writes(db)
+            key = (name, db.get_bind().engine, args, tuple(sorted(kwargs.items())))
+            found, value = read_cache.get(key)
+
+            if found:
+                return value
+
+            as_of = read_cache.clock
+            value = method(self, *args, **kwargs)
+
+            # The transaction may have begun (and taken its snapshot) before the call.
+            as_of = min(as_of, db.connection().info.get(_BEGIN_KEY, as_of))
+            read_cache.put(key, value, tables, as_of)
+
+            return value
+
+        return wrapper
+
+    return decorator
+
+def _pending_writes(db: Session) -> set[str]:
+    """Tables written by the session's uncommitted transaction"""
+    # A session of a unit of work is bound to the connection holding its transaction.
+    bind = db.connection() if db.in_transaction() else db.get_bind()
+
+    if not isinstance(bind, Connection):
+        return set()
+
+    return bind.info.get(_PENDING_KEY, set())
+
+class _DataVersionWatch:
+    """
+    PRAGMA data_version of one SQLite file, read on a connection of its own
+    so that every commit made through any other connection changes it.
+    """
+
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(
+            f"file:{path}?mode=ro", uri=True, check_same_thread=False, isolation_level=None
+        )
+        self._lock = threading.Lock()
+        self.baseline = self._read()
+
+    def _read(self) -> int:
+        with self._lock:
+            return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def changed(self) -> bool:
+        """Whether the file changed since the baseline (which then moves forward)"""
+        data_version = self._read()
+
+        if data_version == self.baseline:
+            return False
+
+        self.baseline = data_version
+        return True
+
+    def advance(self) -> None:
+        """Accept the changes made so far as known"""
+        self.baseline = self._read()
+
+_watches: dict[str, _DataVersionWatch | None] = {}
+_watches_lock = threading.Lock()
+
+def _watch_for(engine: Engine) -> _DataVersionWatch | None:
+    """The data_version watch of an engine's SQLite file (None for other databases)"""
+    url = engine.url
+
+    if engine.dialect.name != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+
+    database = url.database
+    if url.query.get("uri") == "true" and database.startswith("file:"):
+        database = database[len("file:"):]
+
+    path = os.path.abspath(database)
+
+    with _watches_lock:
+        if path not in _watches:
+            try:
+                _watches[path] = _DataVersionWatch(path)
+            except sqlite3.Error:
+                _watches[path] = None
+
+        return _watches[path]
+
+def _check_external_writes(db: Session) -> None:
+    """Drop every entry when another process has committed to the database file"""
+    watch = _watch_for(db.get_bind().engine)
+
+    if watch is not None and watch.changed():
+        read_cache.invalidate({ALL_TABLES})
+
+def _statement_tables(statement: str, context) -> set[str]:
+    """Tables written by a statement (ALL_TABLES when unknown)"""
+    if context.isinsert or context.isupdate or context.isdelete:
+        table = getattr(context.compiled.statement, "table", None)
+
+        if table is not None and getattr(table, "name", None):
+            return {table.name}
+
+        return {ALL_TABLES}
+
+    if statement.lstrip().upper().startswith(_WRITE_KEYWORDS):
+        return {ALL_TABLES}
+
+    return set()
+
+def _settle_committed(info: dict) -> None:
+    """
+    Invalidate again the tables of the last commit, and move the data_version
+    baseline past it. The commit event fires before the database commits, so
+    a read racing with it may have cached the old rows in between.
+    """
+    committed = info.pop(_COMMITTED_KEY, None)
+    watch = info.pop(_WATCH_KEY, None)
+
+    if committed:
+        read_cache.invalidate(committed)
+
+    if watch is not None:
+        watch.advance()
+
+@event.listens_for(Engine, "begin")
+def _on_begin(connection) -> None:
+    _settle_committed(connection.info)
+    connection.info[_BEGIN_KEY] = read_cache.clock
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _on_execute(connection, cursor, statement, parameters, context, executemany) -> None:
+    tables = _statement_tables(statement, context)
+
+    if tables:
+        connection.info.setdefault(_PENDING_KEY, set()).update(tables)
+
+@event.listens_for(Engine, "commit")
+def _on_commit(connection) -> None:
+    written = connection.info.pop(_PENDING_KEY, None)
+
+    if written:
+        read_cache.invalidate(written)
+        connection.info.setdefault(_COMMITTED_KEY, set()).update(written)
+        connection.info[_WATCH_KEY] = _watch_for(connection.engine)
+
+@event.listens_for(Engine, "rollback")
+def _on_rollback(connection) -> None:
+    connection.info.pop(_PENDING_KEY, None)
+
+@event.listens_for(Pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    _settle_committed(connection_record.info)
+
+def _estimate_size(value) -> int:
+    """Approximate deep size of a result made of lists, tuples, dicts and scalars"""
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        items = list(value.items())
+        sample = items[:SIZE_SAMPLE]
+        measured = sum(_estimate_size(k) + _estimate_size(v) for k, v in sample)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value if isinstance(value, (list, tuple)) else list(value)
+        sample = items[:SIZE_SAMPLE]
+        measured = sum(_estimate_size(item) for item in sample)
+    else:
+        return size
+
+    if sample:
+        size += measured * len(items) // len(sample)
+
+    return size
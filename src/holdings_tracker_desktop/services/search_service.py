@@ -0,0 +1,49 @@
+from typing import List
+
+from sqlalchemy import literal_column, select
+from sqlalchemy.orm import Session
+
+from holdings_tracker_desktop.models.search_index import SEARCH_INDEXES, match_query
+
+class SearchService:
+    """
+    Ranked lookup across every FTS5 search index: assets (by current and
+    past tickers), brokers, asset types, asset sectors and broker notes
+    (by note number).
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search_for_ui(self, text: str, limit: int = 20) -> List[dict]:
+        """
+        Best matches of text across all indexes, formatted for UI.
+
+        Each result holds the indexed table ('kind'), the id of the row, a
+        label (its ticker, name or note number) and its bm25 rank, lower
+        being better.
+        """
+        match = match_query(text)
+
+        if match is None:
+            return []
+
+        results = []
+
+        for index in SEARCH_INDEXES.values():
+            fts = index.fts
+            label = fts.c[index.columns[0]]
+            stmt = (
+                select(fts.c.rowid, label, fts.c.rank)
+                .where(literal_column(index.name).op("MATCH")(match))
+                .order_by(fts.c.rank)
+                .limit(limit)
+            )
+
+            results.extend(
+                {'kind': index.source, 'id': id, 'label': value, 'rank': rank}
+                for id, value, rank in self.db.execute(stmt)
+            )
+
+        results.sort(key=lambda result: result['rank'])
+        return results[:limit]
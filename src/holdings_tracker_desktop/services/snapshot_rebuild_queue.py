@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+from datetime import date as Date
+
+from sqlalchemy.orm import Session
+
+from holdings_tracker_desktop.services.asset_dependency_graph import AssetDependencyGraph
+from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
+
+class SnapshotRebuildQueue:
+    """
+    Coalesces position snapshot rebuilds triggered by note/event writes.
+
+    Each session owns a single queue that keeps the earliest affected date
+    per asset. Outside a deferred() block every write is rebuilt right away;
+    inside it, writes only mark their asset as dirty and one rebuild per
+    asset runs when the outermost block exits or flush() is called.
+
+    Assets receiving CONVERSION positions from a dirty asset are rebuilt as
+    well, after their sources.
+    """
+
+    SESSION_KEY = "snapshot_rebuild_queue"
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._pending: dict[int, Date] = {}
+        self._defer_depth = 0
+
+    @classmethod
+    def for_session(cls, db: Session) -> "SnapshotRebuildQueue":
+        """Get the queue bound to a session, creating it on first use"""
+        queue = db.info.get(cls.SESSION_KEY)
+
+        if queue is None:
+            queue = cls(db)
+            db.info[cls.SESSION_KEY] = queue
+
+        return queue
+
+    @property
+    def is_deferred(self) -> bool:
+        return self._defer_depth > 0
+
+    @property
+    def pending(self) -> dict[int, Date]:
+        """Dirty assets mapped to the earliest date that must be rebuilt"""
+        return dict(self._pending)
+
+    def mark_dirty(self, asset_id: int, from_date: Date) -> None:
+        """Register that an asset's snapshots are stale from a given date"""
+        current = self._pending.get(asset_id)
+
+        if current is None or from_date < current:
+            self._pending[asset_id] = from_date
+
+        if not self.is_deferred:
+            self.flush()
+
+    def flush(self) -> None:
+        """Rebuild every dirty asset once, from its earliest affected date"""
+        if not self._pending:
+            return
+
+        graph = AssetDependencyGraph.load(self.db)
+        self._pending = graph.expand_dirty(self._pending)
+        service = PositionSnapshotService(self.db)
+
+        for asset_id in graph.topological_order(self._pending):
+            service.rebuild_from(
+                asset_id=asset_id,
+                from_date=self._pending[asset_id]
+            )
+            del self._pending[asset_id]
+
+    @contextmanager
+    def deferred(self):
+        """
+        Defer rebuilds until the outermost block exits.
+
+        Notes and events are committed as they are written, so the queue is
+        flushed even when the block exits with an exception.
+        """
+        self._defer_depth += 1
+        try:
+            yield self
+        finally:
+            self._defer_depth -= 1
+
+            if not self.is_deferred:
+                self.flush()
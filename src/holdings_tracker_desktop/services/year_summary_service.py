@@ -0,0 +1,113 @@
+from collections.abc import Iterable
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from holdings_tracker_desktop.models import BrokerNote, PositionCheckpoint, YearSummary
+
+class YearSummaryService:
+    """
+    Keeps the year_summaries table in step with broker notes and snapshots.
+
+    Broker note writes adjust the note count of their year. Snapshot years
+    are derived from the position checkpoints, which exist exactly for the
+    (asset, year) pairs that have snapshots.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_broker_note_years(self) -> list[int]:
+        """Years with at least one broker note, most recent first"""
+        rows = (
+            self.db.query(YearSummary.year)
+            .filter(YearSummary.broker_note_count > 0)
+            .order_by(YearSummary.year.desc())
+            .all()
+        )
+
+        return [year for (year,) in rows]
+
+    def get_earliest_snapshot_year(self) -> int | None:
+        return (
+            self.db.query(func.min(YearSummary.year))
+            .filter(YearSummary.snapshot_asset_count > 0)
+            .scalar()
+        )
+
+    def add_broker_notes(self, year: int, count: int = 1) -> None:
+        """Adjust the note count of a year (negative counts remove notes)"""
+        self._adjust(year, broker_notes=count)
+
+    def move_broker_note(self, old_year: int, new_year: int) -> None:
+        if old_year != new_year:
+            self._adjust(old_year, broker_notes=-1)
+            self._adjust(new_year, broker_notes=1)
+
+    def replace_snapshot_years(self, old_years: Iterable[int], new_years: Iterable[int]) -> None:
+        """Record that an asset's snapshot years changed from old_years to new_years"""
+        old_years, new_years = set(old_years), set(new_years)
+
+        for year in old_years - new_years:
+            self._adjust(year, snapshot_assets=-1)
+
+        for year in new_years - old_years:
+            self._adjust(year, snapshot_assets=1)
+
+    def refresh_snapshot_counts(self) -> None:
+        """Recompute every snapshot count from the position checkpoints"""
+        counts = dict(
+            self.db.query(PositionCheckpoint.year, func.count())
+            .group_by(PositionCheckpoint.year)
+            .all()
+        )
+
+        self._replace_counts("snapshot_asset_count", counts)
+
+    def refresh(self) -> None:
+        """Recompute the whole table from broker notes and checkpoints"""
+        year = func.extract("year", BrokerNote.date)
+        note_counts = dict(
+            (int(note_year), count)
+            for note_year, count in self.db.query(year, func.count()).group_by(year)
+        )
+
+        self._replace_counts("broker_note_count", note_counts)
+        self.refresh_snapshot_counts()
+
+    def _replace_counts(self, column: str, counts: dict[int, int]) -> None:
+        summaries = {summary.year: summary for summary in self.db.query(YearSummary)}
+
+        for year in summaries.keys() | counts.keys():
+            summary = summaries.get(year)
+            count = counts.get(year, 0)
+
+            if summary is None:
+                summary = YearSummary(year=year, broker_note_count=0, snapshot_asset_count=0)
+                self.db.add(summary)
+
+            setattr(summary, column, count)
+            self._delete_if_empty(summary)
+
+        self.db.flush()
+
+    def _adjust(self, year: int, broker_notes: int = 0, snapshot_assets: int = 0) -> None:
+        summary = self.db.get(YearSummary, year)
+
+        if summary is None:
+            summary = YearSummary(year=year, broker_note_count=0, snapshot_asset_count=0)
+            self.db.add(summary)
+
+        summary.broker_note_count += broker_notes
+        summary.snapshot_asset_count += snapshot_assets
+        self._delete_if_empty(summary)
+        self.db.flush()
+
+    def _delete_if_empty(self, summary: YearSummary) -> None:
+        if summary.broker_note_count > 0 or summary.snapshot_asset_count > 0:
+            return
+
+        if summary in self.db.new:
+            self.db.expunge(summary)
+        else:
+            self.db.delete(summary)
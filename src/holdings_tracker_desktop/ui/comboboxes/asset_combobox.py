@@ -6,12 +6,12 @@ class AssetComboBox(BaseComboBox):
         self.reload()
 
     def reload(self):
-        from holdings_tracker_desktop.database import get_db
+        from holdings_tracker_desktop.database import get_read_db
         from holdings_tracker_desktop.services.asset_service import AssetService
 
         self._setup_placeholder()
 
-        with get_db() as db:
+        with get_read_db() as db:
             service = AssetService(db)
             for asset in service.list_all_models():
                 self.addItem(asset.ticker, asset.id)
@@ -6,12 +6,12 @@ class AssetTypeComboBox(BaseComboBox):
         self.reload()
 
     def reload(self):
-        from holdings_tracker_desktop.database import get_db
+        from holdings_tracker_desktop.database import get_read_db
         from holdings_tracker_desktop.services.asset_type_service import AssetTypeService
 
         self._setup_placeholder()
 
-        with get_db() as db:
+        with get_read_db() as db:
             service = AssetTypeService(db)
             for asset_type in service.list_all_models():
                 self.addItem(asset_type.name, asset_type.id)
@@ -6,12 +6,12 @@ class BrokerComboBox(BaseComboBox):
         self.reload()
 
     def reload(self):
-        from holdings_tracker_desktop.database import get_db
+        from holdings_tracker_desktop.database import get_read_db
         from holdings_tracker_desktop.services.broker_service import BrokerService
 
         self._setup_placeholder()
 
-        with get_db() as db:
+        with get_read_db() as db:
             service = BrokerService(db)
             for broker in service.list_all_models():
                 self.addItem(broker.name, broker.id)
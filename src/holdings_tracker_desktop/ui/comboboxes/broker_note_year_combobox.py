@@ -40,10 +40,10 @@ class BrokerNoteYearComboBox(BaseComboBox):
         self.setItemText(0, t(self.placeholder_key))
 
     def _load_years(self) -> list[int]:
-        from holdings_tracker_desktop.database import get_db
+        from holdings_tracker_desktop.database import get_read_db
         from holdings_tracker_desktop.services.broker_note_service import BrokerNoteService
 
-        with get_db() as db:
+        with get_read_db() as db:
             service = BrokerNoteService(db)
             years = service.list_available_years()
 
@@ -6,12 +6,12 @@ class CountryComboBox(BaseComboBox):
         self.reload()
 
     def reload(self):
-        from holdings_tracker_desktop.database import get_db
+        from holdings_tracker_desktop.database import get_read_db
         from holdings_tracker_desktop.services.country_service import CountryService
 
         self._setup_placeholder()
 
-        with get_db() as db:
+        with get_read_db() as db:
             service = CountryService(db)
             for country in service.list_all_models():
                 self.addItem(country.name, country.id)
@@ -6,12 +6,12 @@ class CurrencyComboBox(BaseComboBox):
         self.reload()
 
     def reload(self):
-        from holdings_tracker_desktop.database import get_db
+        from holdings_tracker_desktop.database import get_read_db
         from holdings_tracker_desktop.services.currency_service import CurrencyService
 
         self._setup_placeholder()
 
-        with get_db() as db:
+        with get_read_db() as db:
             service = CurrencyService(db)
             for currency in service.list_all_models():
                 self.addItem(currency.code, currency.id)
@@ -34,13 +34,13 @@ class PositionSnapshotYearComboBox(BaseComboBox):
         self.setItemText(0, t(self.placeholder_key))
 
     def _load_years(self) -> list[int]:
-        from holdings_tracker_desktop.database import get_db
+        from holdings_tracker_desktop.database import get_read_db
         from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
 
-        with get_db() as db:
+        with get_read_db() as db:
             service = PositionSnapshotService(db)
-            min_date = service.get_earliest_snapshot_date()
+            min_year = service.get_earliest_snapshot_year()
 
         current_year = Date.today().year
-        start_year = min_date.year if min_date else current_year
+        start_year = min_year or current_year
         return list(range(current_year, start_year - 1, -1))
@@ -0,0 +1,96 @@
+"""
+Background loading for widgets.
+
+AsyncLoader runs a fetch function on a QThreadPool worker and delivers
+its result back on the GUI thread. Starting a new load supersedes the
+pending one: the old worker still runs, but its result is dropped, so a
+quick change of filter never shows the data of the previous selection.
+
+Fetch functions run off the GUI thread and must open their own session
+(get_read_db()), and must not touch widgets.
+"""
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+class _LoadSignals(QObject):
+    finished = Signal(int, object)
+    failed = Signal(int, str)
+
+class _LoadTask(QRunnable):
+    def __init__(self, generation: int, fetch: Callable[[], Any]):
+        super().__init__()
+        self.generation = generation
+        self.fetch = fetch
+        self.signals = _LoadSignals()
+
+    def run(self) -> None:
+        try:
+            result = self.fetch()
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+        else:
+            self.signals.finished.emit(self.generation, result)
+
+class AsyncLoader(QObject):
+    """Runs one load at a time off the GUI thread; only the latest is delivered"""
+
+    loading_changed = Signal(bool)
+
+    def __init__(self, parent=None, pool: QThreadPool | None = None):
+        super().__init__(parent)
+        self._pool = pool or QThreadPool.globalInstance()
+        self._generation = 0
+        self._callbacks: tuple[Callable, Callable | None] | None = None
+
+    @property
+    def is_loading(self) -> bool:
+        return self._callbacks is not None
+
+    def load(
+        self,
+        fetch: Callable[[], Any],
+        on_loaded: Callable[[Any], None],
+        on_failed: Callable[[str], None] | None = None
+    ) -> None:
+        """Run fetch on a worker and pass its result to on_loaded (or the error to on_failed)"""
+        was_loading = self.is_loading
+        self._generation += 1
+        self._callbacks = (on_loaded, on_failed)
+
+        task = _LoadTask(self._generation, fetch)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self._pool.start(task)
+
+        if not was_loading:
+            self.loading_changed.emit(True)
+
+    def cancel(self) -> None:
+        """Drop the pending load, if any; its result will be discarded"""
+        self._generation += 1
+
+        if self._finish() is not None:
+            self.loading_changed.emit(False)
+
+    def _on_finished(self, generation: int, result) -> None:
+        if generation != self._generation:
+            return
+
+        on_loaded, _ = self._finish()
+        self.loading_changed.emit(False)
+        on_loaded(result)
+
+    def _on_failed(self, generation: int, message: str) -> None:
+        if generation != self._generation:
+            return
+
+        _, on_failed = self._finish()
+        self.loading_changed.emit(False)
+
+        if on_failed is not None:
+            on_failed(message)
+
+    def _finish(self):
+        callbacks, self._callbacks = self._callbacks, None
+        return callbacks
@@ -0,0 +1,167 @@
+"""
+Model/view backing for EntityManagerWidget tables.
+
+PagedTableModel holds the row records fetched so far and formats a cell
+only when a view asks for it, which views do for visible cells. Rows are
+pulled from the service a keyset page at a time through
+canFetchMore()/fetchMore() as the view scrolls, each page continuing from
+the cursor of the previous one, so opening a year with 100k broker notes
+costs one page query and no per-cell items, and a deep page costs the
+same as the first. Pages are fetched on a worker thread (see
+async_loader.py); a page still in flight when the model is reset is
+discarded.
+"""
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Optional, Sequence
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+
+from holdings_tracker_desktop.repositories.base_repository import Page
+from holdings_tracker_desktop.ui.core.async_loader import AsyncLoader
+from holdings_tracker_desktop.ui.core.formatters import format_date, format_decimal
+from holdings_tracker_desktop.ui.core.translations import t
+from holdings_tracker_desktop.ui.core.ui_helpers import ALIGN_CENTER, ALIGN_NUMBER
+
+# Rows requested per fetchMore() call.
+PAGE_SIZE = 500
+
+# (cursor, limit) -> Page of up to limit rows supporting row["field"]
+# access; cursor is None for the first page. Runs on a worker thread.
+FetchPage = Callable[[Optional[str], int], Page]
+
+@dataclass(frozen=True)
+class Column:
+    """Table column: header translation key, cell formatter and alignment"""
+    header: str
+    format: Callable[[Any], str]
+    align: Qt.AlignmentFlag = ALIGN_CENTER
+
+def text_column(header: str, field: str, translate: bool = False) -> Column:
+    if translate:
+        return Column(header, lambda row: t(row[field]))
+
+    return Column(header, lambda row: row[field])
+
+def date_column(header: str, field: str) -> Column:
+    return Column(header, lambda row: format_date(row[field]))
+
+def decimal_column(header: str, field: str, decimals: int = 2, currency_field: str | None = None) -> Column:
+    def format_cell(row) -> str:
+        value = row[field]
+
+        if value is None:
+            return ""
+
+        currency = row[currency_field] if currency_field else ""
+        return f"{currency} {format_decimal(value, decimals)}".strip()
+
+    return Column(header, format_cell, ALIGN_NUMBER)
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    Read-only table over rows fetched page by page.
+
+    The id of each row is exposed as Qt.UserRole on its first column, like
+    the items built by ui_helpers.table_item().
+    """
+
+    fetch_failed = Signal(str)
+
+    def __init__(self, parent=None, page_size: int = PAGE_SIZE):
+        super().__init__(parent)
+        self.page_size = page_size
+        self._columns: list[Column] = []
+        self._rows: list = []
+        self._fetch_page: FetchPage | None = None
+        self._cursor: str | None = None
+        self._exhausted = True
+        self.loader = AsyncLoader(self)
+
+    def reset(self, columns: Sequence[Column], fetch_page: FetchPage | None = None) -> None:
+        """Replace the columns and rows, and start fetching the first page"""
+        self.loader.cancel()
+        self.beginResetModel()
+        self._columns = list(columns)
+        self._rows = []
+        self._fetch_page = fetch_page
+        self._cursor = None
+        self._exhausted = fetch_page is None
+        self.endResetModel()
+
+        self.fetchMore(QModelIndex())
+
+    def retranslate(self) -> None:
+        """Repaint headers and cells after a language change"""
+        if self._columns:
+            self.headerDataChanged.emit(Qt.Horizontal, 0, len(self._columns) - 1)
+
+        if self._rows and self._columns:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(len(self._rows) - 1, len(self._columns) - 1),
+                [Qt.DisplayRole]
+            )
+
+    def row_id(self, row: int) -> int | None:
+        if 0 <= row < len(self._rows):
+            return self._rows[row]["id"]
+
+        return None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        column = self._columns[index.column()]
+        row = self._rows[index.row()]
+
+        if role == Qt.DisplayRole:
+            return column.format(row)
+
+        if role == Qt.TextAlignmentRole:
+            return column.align
+
+        if role == Qt.UserRole and index.column() == 0:
+            return row["id"]
+
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section < len(self._columns):
+            return t(self._columns[section].header)
+
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted and not self.loader.is_loading
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if not self.canFetchMore(parent):
+            return
+
+        self.loader.load(
+            partial(self._fetch_page, self._cursor, self.page_size),
+            self._append_page,
+            self._on_fetch_failed
+        )
+
+    def _append_page(self, page: Page) -> None:
+        self._cursor = page.next_cursor
+        self._exhausted = page.next_cursor is None
+
+        if page.items:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page.items) - 1)
+            self._rows.extend(page.items)
+            self.endInsertRows()
+
+    def _on_fetch_failed(self, message: str) -> None:
+        self._exhausted = True
+        self.fetch_failed.emit(message)
@@ -75,6 +75,7 @@ TRANSLATIONS = {
         "fees": "Fees",
         "id": "ID",
         "languages": "Languages",
+        "loading": "Loading…",
         "name": "Name",
         "new_asset": "New Asset",
         "new_asset_event": "New Event",
@@ -180,6 +181,7 @@ TRANSLATIONS = {
         "fees": "Taxas",
         "id": "Código",
         "languages": "Idiomas",
+        "loading": "Carregando…",
         "name": "Nome",
         "new_asset": "Novo Ativo",
         "new_asset_event": "Novo Evento",
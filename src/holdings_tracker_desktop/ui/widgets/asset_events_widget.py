@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import QTableWidgetItem, QDialog
 
-from holdings_tracker_desktop.database import get_db
+from holdings_tracker_desktop.database import get_db, get_read_db
 from holdings_tracker_desktop.models.asset_event import AssetEventType
 from holdings_tracker_desktop.services.asset_event_service import AssetEventService
 from holdings_tracker_desktop.ui.core import t, global_signals
@@ -14,16 +14,14 @@ class AssetEventsWidget(EntityManagerWidget):
         self.asset_id = asset_id
 
     def load_data(self):
-        try:
-            with get_db() as db:
-                service = AssetEventService(db)
-                ui_data = service.list_all_for_ui(asset_id=self.asset_id)
-                self._populate_table(ui_data)
+        self.load_async(self._fetch_ui_data, self._on_data_loaded, "Error loading asset events")
 
-        except Exception as e:
-            self.show_error(f"Error loading asset events: {str(e)}")
-            self.table.setRowCount(0)
+    def _fetch_ui_data(self):
+        with get_read_db() as db:
+            return AssetEventService(db).list_all_for_ui(asset_id=self.asset_id)
 
+    def _on_data_loaded(self, ui_data):
+        self._populate_table(ui_data)
         self.translate_ui()
 
     def translate_ui(self):
@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import QDialog
 
-from holdings_tracker_desktop.database import get_db
+from holdings_tracker_desktop.database import get_db, get_read_db
 from holdings_tracker_desktop.services.asset_ticker_history_service import AssetTickerHistoryService
 from holdings_tracker_desktop.ui.core import t
 from holdings_tracker_desktop.ui.core.formatters import format_date
@@ -11,17 +11,17 @@ class AssetTickerHistoriesWidget(EntityManagerWidget):
     def __init__(self, asset_id: int, parent=None):
         super().__init__(parent)
         self.asset_id = asset_id
+        self.ui_data = []
 
     def load_data(self):
-        try:
-            with get_db() as db:
-                service = AssetTickerHistoryService(db)
-                self.ui_data = service.list_all_for_ui(asset_id=self.asset_id)
+        self.load_async(self._fetch_ui_data, self._on_data_loaded, "Error loading asset ticker histories")
 
-        except Exception as e:
-            self.show_error(f"Error loading asset ticker histories: {str(e)}")
-            self.table.setRowCount(0)
+    def _fetch_ui_data(self):
+        with get_read_db() as db:
+            return AssetTickerHistoryService(db).list_all_for_ui(asset_id=self.asset_id)
 
+    def _on_data_loaded(self, ui_data):
+        self.ui_data = ui_data
         self.translate_ui()
 
     def translate_ui(self):
@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import QDialog
 
-from holdings_tracker_desktop.database import get_db
+from holdings_tracker_desktop.database import get_db, get_read_db
 from holdings_tracker_desktop.services.asset_service import AssetService
 from holdings_tracker_desktop.ui.core import t
 from holdings_tracker_desktop.ui.core.ui_helpers import prepare_table, table_item
@@ -11,16 +11,14 @@ class AssetsWidget(EntityManagerWidget):
         super().__init__(parent)
 
     def load_data(self):
-        try:
-            with get_db() as db:
-                service = AssetService(db)
-                ui_data = service.list_all_for_ui()
-                self._populate_table(ui_data)
+        self.load_async(self._fetch_ui_data, self._on_data_loaded, "Error loading assets")
 
-        except Exception as e:
-            self.show_error(f"Error loading assets: {str(e)}")
-            self.table.setRowCount(0)
+    def _fetch_ui_data(self):
+        with get_read_db() as db:
+            return AssetService(db).list_all_for_ui()
 
+    def _on_data_loaded(self, ui_data):
+        self._populate_table(ui_data)
         self.translate_ui()
 
     def translate_ui(self):
@@ -1,14 +1,31 @@
-from PySide6.QtWidgets import QTableWidgetItem, QDialog
+from functools import partial
 
-from holdings_tracker_desktop.database import get_db
+from PySide6.QtWidgets import QDialog
+
+from holdings_tracker_desktop.database import get_db, get_read_db
 from holdings_tracker_desktop.models.broker_note import OperationType
 from holdings_tracker_desktop.services.broker_note_service import BrokerNoteService
 from holdings_tracker_desktop.ui.comboboxes import BrokerNoteYearComboBox
 from holdings_tracker_desktop.ui.core import t, global_signals
-from holdings_tracker_desktop.ui.core.formatters import format_date
-from holdings_tracker_desktop.ui.core.ui_helpers import prepare_table, table_item, decimal_table_item
+from holdings_tracker_desktop.ui.core.table_model import Column, date_column, decimal_column, text_column
 from holdings_tracker_desktop.ui.widgets.entity_manager_widget import EntityManagerWidget
 
+OPERATION_LABELS = {
+    OperationType.BUY: "buy",
+    OperationType.SELL: "sell",
+}
+
+COLUMNS = (
+    date_column("date", "date"),
+    Column("operation_abbr", lambda row: t(OPERATION_LABELS.get(row["operation"], str(row["operation"])))),
+    text_column("asset", "asset_ticker"),
+    decimal_column("quantity_abbr", "quantity", 0),
+    decimal_column("price", "price", 2, "asset_currency"),
+    decimal_column("fees", "fees", 2, "asset_currency"),
+    decimal_column("taxes", "taxes", 2, "asset_currency"),
+    decimal_column("total_value", "total_value", 2, "asset_currency"),
+)
+
 class BrokerNotesWidget(EntityManagerWidget):
     """
     BrokerNotes UI update flow (by year filter):
@@ -25,7 +42,7 @@ class BrokerNotesWidget(EntityManagerWidget):
             ↓
         BrokerNotesWidget.load_data()
             ↓
-        _populate_table()
+        table_model.reset() (further pages load as the table scrolls)
 
     Notes:
     - The ComboBox is the single source of truth for filtering.
@@ -33,6 +50,8 @@ class BrokerNotesWidget(EntityManagerWidget):
     - Table reloads only in response to filter changes.
     """
 
+    PAGED_TABLE = True
+
     def __init__(self, parent=None):
         self.year_filter = BrokerNoteYearComboBox()
         self.year_filter.currentIndexChanged.connect(self.load_data)
@@ -43,26 +62,19 @@ class BrokerNotesWidget(EntityManagerWidget):
         return [self.year_filter]
 
     def load_data(self):
-        self.ui_data = []
-
-        try:
-            with get_db() as db:
-                service = BrokerNoteService(db)
-                year = self.year_filter.currentData()
-
-                if year is not None:
-                    self.ui_data = service.list_by_year_for_ui(year)
-
-        except Exception as e:
-            self.show_error(f"Error loading broker notes: {str(e)}")
+        year = self.year_filter.currentData()
+        fetch_page = partial(self._fetch_page, year) if year is not None else None
 
+        self.table_model.reset(COLUMNS, fetch_page)
         self.translate_ui()
 
     def translate_ui(self):
         super().translate_ui()
         self.title_widget.setText(t("broker_notes"))
         self.year_filter.translate_placeholder()
-        self._populate_table(self.ui_data)
+
+    def on_fetch_failed(self, message: str):
+        self.show_error(f"Error loading broker notes: {message}")
 
     def open_new_form(self):
         from holdings_tracker_desktop.ui.forms.broker_note_form import BrokerNoteForm
@@ -120,30 +132,6 @@ class BrokerNotesWidget(EntityManagerWidget):
         except Exception as e:
             self.show_error(f"Error deleting broker note: {str(e)}")
 
-    def _populate_table(self, items):
-        prepare_table(self.table, 8, len(items))
-
-        self.table.setHorizontalHeaderLabels(
-            [t("date"), t("operation_abbr"), t("asset"), t("quantity_abbr"), 
-             t("price"), t("fees"), t("taxes"), t("total_value")]
-        )
-
-        for row, item in enumerate(items):
-            self.table.setItem(row, 0, table_item(format_date(item['date']), item['id']))
-            self.table.setItem(row, 1, self._operation_item(item['operation']))
-            self.table.setItem(row, 2, table_item(item['asset_ticker']))
-            self.table.setItem(row, 3, decimal_table_item(item['quantity'], 0))
-            currency = item.get("asset_currency", "")
-            self.table.setItem(row, 4, decimal_table_item(item['price'], 2, currency))
-            self.table.setItem(row, 5, decimal_table_item(item['fees'], 2, currency))
-            self.table.setItem(row, 6, decimal_table_item(item['taxes'], 2, currency))
-            self.table.setItem(row, 7, decimal_table_item(item['total_value'], 2, currency))
-
-    def _operation_item(self, operation: OperationType) -> QTableWidgetItem:
-        label_map = {
-            OperationType.BUY: t("buy"),
-            OperationType.SELL: t("sell"),
-        }
-
-        text = label_map.get(operation, str(operation))
-        return table_item(text)
+    def _fetch_page(self, year: int, cursor: str | None, limit: int):
+        with get_read_db() as db:
+            return BrokerNoteService(db).page_by_year_for_ui(year, limit, cursor)
@@ -4,7 +4,7 @@ from typing import Optional
 
 from PySide6.QtWidgets import QVBoxLayout, QMenuBar
 
-from holdings_tracker_desktop.database import get_db
+from holdings_tracker_desktop.database import get_read_db, unit_of_work
 from holdings_tracker_desktop.services.asset_type_service import AssetTypeService
 from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
 from holdings_tracker_desktop.ui.core import t, global_signals
@@ -124,7 +124,7 @@ class ChartsWidget(TranslatableWidget):
             key="all"
         )
 
-        with get_db() as db:
+        with get_read_db() as db:
             service = AssetTypeService(db)
             for asset_type in service.list_all_models():
                 self._add_action(
@@ -137,12 +137,12 @@ class ChartsWidget(TranslatableWidget):
         self._refresh_chart()
 
     def _load_years(self, menu):
-        with get_db() as db:
+        with get_read_db() as db:
             service = PositionSnapshotService(db)
-            min_date = service.get_earliest_snapshot_date()
+            min_year = service.get_earliest_snapshot_year()
 
         current_year = Date.today().year
-        start_year = min_date.year if min_date else current_year
+        start_year = min_year or current_year
 
         earliest_allowed_year = max(start_year, current_year - 19)
 
@@ -170,8 +170,10 @@ class ChartsWidget(TranslatableWidget):
         if not self.state.year:
             return
 
-        title = self._build_chart_title()
-        data = self._load_chart_data()
+        # Title and data helpers share one read session and snapshot
+        with unit_of_work(read_only=True):
+            title = self._build_chart_title()
+            data = self._load_chart_data()
 
         self.pie_chart.render_chart(
             data,
@@ -195,7 +197,7 @@ class ChartsWidget(TranslatableWidget):
         return self._get_asset_type_name(self.state.asset_type_id)
 
     def _get_asset_type_name(self, asset_type_id: int) -> str:
-        with get_db() as db:
+        with get_read_db() as db:
             service = AssetTypeService(db)
             asset_type = service.get(asset_type_id)
             return asset_type.name
@@ -205,7 +207,7 @@ class ChartsWidget(TranslatableWidget):
         if not loader:
             return []
 
-        with get_db() as db:
+        with get_read_db() as db:
             service = PositionSnapshotService(db)
             return loader(
                 service,
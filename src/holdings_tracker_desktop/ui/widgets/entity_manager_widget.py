@@ -2,11 +2,13 @@ import qtawesome as qta
 
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
-    QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, 
-    QFrame, QHeaderView, QMessageBox, QDialog
+    QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableView,
+    QAbstractItemView, QFrame, QHeaderView, QLabel, QMessageBox, QDialog
 )
 
 from holdings_tracker_desktop.ui.core import t
+from holdings_tracker_desktop.ui.core.async_loader import AsyncLoader
+from holdings_tracker_desktop.ui.core.table_model import PagedTableModel
 from holdings_tracker_desktop.ui.dialogs.confirm_dialog import ConfirmDialog
 from holdings_tracker_desktop.ui.widgets.title_widget import TitleWidget
 from holdings_tracker_desktop.ui.widgets.translatable_widget import TranslatableWidget
@@ -20,11 +22,21 @@ BUTTONS_CONFIG = {
 }
 
 class EntityManagerWidget(TranslatableWidget):
+    # Subclasses listing large tables set this to show them through a
+    # QTableView over self.table_model instead of a QTableWidget.
+    PAGED_TABLE = False
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.buttons = {}
+        self.loader = AsyncLoader(self)
         self._setup_ui()
 
+        self.loader.loading_changed.connect(self._set_loading)
+
+        if self.PAGED_TABLE:
+            self.table_model.loader.loading_changed.connect(self._set_loading)
+
     def translate_ui(self):
         for action in self.get_enabled_actions():
             self.buttons[action].setText(t(action))
@@ -32,9 +44,28 @@ class EntityManagerWidget(TranslatableWidget):
         for name, _, _ in self.get_extra_buttons():
             self.buttons[name].setText(t(name))
 
+        self.loading_label.setText(t("loading"))
+
+        if self.PAGED_TABLE:
+            self.table_model.retranslate()
+
     def load_data(self):
         pass
 
+    def load_async(self, fetch, on_loaded, error_message: str):
+        """
+        Run fetch on a worker thread and hand its result to on_loaded on the
+        GUI thread. fetch must open its own session (get_read_db()). The
+        result of a load still pending when load_async() is called again is
+        discarded.
+        """
+        def on_failed(message: str):
+            self.show_error(f"{error_message}: {message}")
+            self.table.setRowCount(0)
+            self.translate_ui()
+
+        self.loader.load(fetch, on_loaded, on_failed)
+
     def on_show(self):
         """
         Called whenever the widget is displayed by OperationsWidget.
@@ -51,6 +82,9 @@ class EntityManagerWidget(TranslatableWidget):
         pass
 
     def get_selected_id(self):
+        if self.PAGED_TABLE:
+            return self.table_model.row_id(self.table.currentIndex().row())
+
         row = self.table.currentRow()
         if row < 0: 
             return None
@@ -75,6 +109,9 @@ class EntityManagerWidget(TranslatableWidget):
     def show_error(self, message: str):
         QMessageBox.critical(self, "Error", message)
 
+    def on_fetch_failed(self, message: str):
+        self.show_error(f"Error loading data: {message}")
+
     def ask_confirmation(self, title: str, message: str) -> bool:
         dialog = ConfirmDialog(
             title=title,
@@ -108,6 +145,11 @@ class EntityManagerWidget(TranslatableWidget):
     def get_toolbar_filters(self):
         return []
 
+    def _set_loading(self, loading: bool):
+        self.loading_label.setVisible(self.loader.is_loading or (
+            self.PAGED_TABLE and self.table_model.loader.is_loading
+        ))
+
     def _setup_ui(self):
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 5, 0, 0)
@@ -134,6 +176,10 @@ class EntityManagerWidget(TranslatableWidget):
         for widget in self.get_toolbar_filters():
             toolbar.addWidget(widget)
 
+        self.loading_label = QLabel()
+        self.loading_label.setVisible(False)
+        toolbar.addWidget(self.loading_label)
+
         toolbar.addStretch()
 
         for action in self.get_enabled_actions():
@@ -158,6 +204,10 @@ class EntityManagerWidget(TranslatableWidget):
         body_layout.addLayout(toolbar)
 
     def _setup_table(self, body_layout):
+        if self.PAGED_TABLE:
+            self._setup_table_view(body_layout)
+            return
+
         self.table = QTableWidget()
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(False)
@@ -171,3 +221,23 @@ class EntityManagerWidget(TranslatableWidget):
         self.table.setEditTriggers(QTableWidget.NoEditTriggers)
 
         body_layout.addWidget(self.table)
+
+    def _setup_table_view(self, body_layout):
+        self.table_model = PagedTableModel(self)
+        self.table_model.fetch_failed.connect(self.on_fetch_failed)
+
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
+        self.table.setAlternatingRowColors(True)
+        self.table.setShowGrid(False)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+        self.table.horizontalHeader().setStretchLastSection(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
+        body_layout.addWidget(self.table)
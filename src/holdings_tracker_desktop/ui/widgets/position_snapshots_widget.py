@@ -1,12 +1,31 @@
-from holdings_tracker_desktop.database import get_db
+from functools import partial
+
+from holdings_tracker_desktop.database import get_read_db
 from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
 from holdings_tracker_desktop.ui.comboboxes import PositionSnapshotYearComboBox
 from holdings_tracker_desktop.ui.core import t
-from holdings_tracker_desktop.ui.core.formatters import format_date
-from holdings_tracker_desktop.ui.core.ui_helpers import prepare_table, table_item, decimal_table_item
+from holdings_tracker_desktop.ui.core.table_model import date_column, decimal_column, text_column
 from holdings_tracker_desktop.ui.widgets.entity_manager_widget import EntityManagerWidget
 
+SINGLE_ASSET_COLUMNS = (
+    text_column("asset", "asset_ticker"),
+    date_column("date", "snapshot_date"),
+    decimal_column("quantity_abbr", "quantity", 0),
+    decimal_column("avg_price", "avg_price", 2, "asset_currency"),
+    decimal_column("total_cost", "total_cost", 2, "asset_currency"),
+    text_column("origin", "origin_action", translate=True),
+)
+
+ALL_ASSETS_COLUMNS = (
+    text_column("asset", "asset_ticker"),
+    decimal_column("quantity_abbr", "quantity", 0),
+    decimal_column("avg_price", "avg_price", 2, "asset_currency"),
+    decimal_column("total_cost", "total_cost", 2, "asset_currency"),
+)
+
 class PositionSnapshotsWidget(EntityManagerWidget):
+    PAGED_TABLE = True
+
     def __init__(self, asset_id: int | None = None, parent=None):
         self.asset_id = asset_id
         self.year = None
@@ -23,21 +42,12 @@ class PositionSnapshotsWidget(EntityManagerWidget):
         return [self.year_filter] if self.year_filter else []
 
     def load_data(self):
-        self.ui_data = []
-
-        try:
-            with get_db() as db:
-                service = PositionSnapshotService(db)
-
-                if self.asset_id:
-                    self.ui_data = service.list_all_for_ui_by_asset(self.asset_id)
-                else:
-                    self.year = self.year_filter.currentData()
-                    if self.year is not None:
-                        self.ui_data = service.list_all_for_ui_by_year(self.year)
-
-        except Exception as e:
-            self.show_error(f"Error loading position snapshots: {str(e)}")
+        if self.asset_id:
+            self.table_model.reset(SINGLE_ASSET_COLUMNS, self._fetch_asset_page)
+        else:
+            self.year = self.year_filter.currentData()
+            fetch_page = partial(self._fetch_year_page, self.year) if self.year is not None else None
+            self.table_model.reset(ALL_ASSETS_COLUMNS, fetch_page)
 
         self.translate_ui()
 
@@ -52,7 +62,8 @@ class PositionSnapshotsWidget(EntityManagerWidget):
         if self.year_filter:
             self.year_filter.translate_placeholder()
 
-        self._populate_table(self.ui_data)
+    def on_fetch_failed(self, message: str):
+        self.show_error(f"Error loading position snapshots: {message}")
 
     def get_enabled_actions(self):
         return ()
@@ -64,36 +75,10 @@ class PositionSnapshotsWidget(EntityManagerWidget):
         from holdings_tracker_desktop.ui.widgets.assets_widget import AssetsWidget
         self.navigate_to(AssetsWidget)
 
-    def _populate_table(self, items):
-        if self.asset_id is not None:
-            self._populate_table_single_asset(items)
-        else:
-            self._populate_table_all_assets(items)
-
-    def _populate_table_single_asset(self, items):
-        prepare_table(self.table, 6, len(items))
-        self.table.setHorizontalHeaderLabels(
-            [t("asset"), t("date"), t("quantity_abbr"), t("avg_price"), t("total_cost"), t("origin")]
-        )
-
-        for row, item in enumerate(items):
-            self.table.setItem(row, 0, table_item(item['asset_ticker'], item['id']))
-            self.table.setItem(row, 1, table_item(format_date(item['snapshot_date'])))
-            self.table.setItem(row, 2, decimal_table_item(item['quantity'], 0))
-            currency = item.get("asset_currency", "")
-            self.table.setItem(row, 3, decimal_table_item(item['avg_price'], 2, currency))
-            self.table.setItem(row, 4, decimal_table_item(item['total_cost'], 2, currency))
-            self.table.setItem(row, 5, table_item(t(item['origin_action'])))
-
-    def _populate_table_all_assets(self, items):
-        prepare_table(self.table, 4, len(items))
-        self.table.setHorizontalHeaderLabels(
-            [t("asset"), t("quantity_abbr"), t("avg_price"), t("total_cost")]
-        )
-
-        for row, item in enumerate(items):
-            self.table.setItem(row, 0, table_item(item['asset_ticker'], item['id']))
-            self.table.setItem(row, 1, decimal_table_item(item['quantity'], 0))
-            currency = item.get("asset_currency", "")
-            self.table.setItem(row, 2, decimal_table_item(item['avg_price'], 2, currency))
-            self.table.setItem(row, 3, decimal_table_item(item['total_cost'], 2, currency))
+    def _fetch_asset_page(self, cursor: str | None, limit: int):
+        with get_read_db() as db:
+            return PositionSnapshotService(db).page_for_ui_by_asset(self.asset_id, limit, cursor)
+
+    def _fetch_year_page(self, year: int, cursor: str | None, limit: int):
+        with get_read_db() as db:
+            return PositionSnapshotService(db).page_for_ui_by_year(year, limit, cursor)
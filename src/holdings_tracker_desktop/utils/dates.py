@@ -0,0 +1,10 @@
+from datetime import date as Date
+
+def year_range(year: int) -> tuple[Date, Date]:
+    """
+    Half-open [start, end) date range covering a calendar year.
+
+    Filtering with column >= start and column < end keeps the date column
+    usable by an index, unlike extract("year", column) == year.
+    """
+    return Date(year, 1, 1), Date(year + 1, 1, 1)
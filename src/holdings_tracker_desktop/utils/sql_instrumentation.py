@@ -0,0 +1,216 @@
+"""
+Engine-level SQL instrumentation.
+
+Once an engine is instrumented, every statement is timed and attributed to a
+logical operation: the innermost operation() block if one is active,
+otherwise the outermost service method on the call stack (for example
+"BrokerNoteService.create", including the snapshot rebuild it triggers).
+
+Statements are collected by the recorders active in the current context:
+- record_queries(): collect per-operation counts, total time and slowest
+  statements, optionally dumped to a JSON-lines file
+- query_budget(max_queries=3): fail a test when a block issues too many
+  statements
+- enable_sql_stats(path, engine): process-wide recorder appended to a
+  JSON-lines file at exit (set SQL_STATS_FILE in the environment)
+"""
+import atexit
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SERVICES_PACKAGE = "holdings_tracker_desktop.services."
+
+# Slowest statements kept per operation.
+SLOWEST_STATEMENTS = 5
+
+_operations: ContextVar[tuple[str, ...]] = ContextVar("sql_operations", default=())
+_recorders: ContextVar[tuple["QueryRecorder", ...]] = ContextVar("sql_recorders", default=())
+_global_recorder: "QueryRecorder | None" = None
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by query_budget() when a block issues more statements than allowed"""
+
+@dataclass
+class OperationStats:
+    count: int = 0
+    total_time: float = 0.0
+    slowest: list[tuple[float, str, str]] = field(default_factory=list)
+
+    def add(self, statement: str, elapsed: float, caller: str) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        entry = (elapsed, statement, caller)
+
+        if len(self.slowest) < SLOWEST_STATEMENTS:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_time * 1000, 3),
+            "slowest": [
+                {"ms": round(elapsed * 1000, 3), "caller": caller, "statement": statement}
+                for elapsed, statement, caller in sorted(self.slowest, reverse=True)
+            ]
+        }
+
+class QueryRecorder:
+    """Statement statistics grouped by logical operation"""
+
+    def __init__(self):
+        self.operations: dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return sum(stats.count for stats in self.operations.values())
+
+    @property
+    def total_time(self) -> float:
+        return sum(stats.total_time for stats in self.operations.values())
+
+    def add(self, operation: str, statement: str, elapsed: float, caller: str) -> None:
+        with self._lock:
+            self.operations.setdefault(operation, OperationStats()).add(statement, elapsed, caller)
+
+    def summary(self) -> str:
+        lines = []
+
+        for operation, stats in sorted(self.operations.items(), key=lambda item: -item[1].count):
+            lines.append(f"{operation}: {stats.count} queries, {stats.total_time * 1000:.1f} ms")
+
+            for elapsed, statement, caller in sorted(stats.slowest, reverse=True):
+                lines.append(f"    {elapsed * 1000:8.2f} ms  [{caller}] {' '.join(statement.split())[:160]}")
+
+        return "\n".join(lines)
+
+    def dump_jsonl(self, path: str) -> None:
+        """Append one JSON line per operation to a file"""
+        recorded_at = datetime.now(timezone.utc).isoformat()
+
+        with self._lock:
+            lines = [
+                json.dumps({"recorded_at": recorded_at, "pid": os.getpid(), "operation": operation, **stats.to_dict()})
+                for operation, stats in self.operations.items()
+            ]
+
+        with open(path, "a", encoding="utf-8") as file:
+            for line in lines:
+                file.write(line + "\n")
+
+def instrument_engine(engine: Engine) -> None:
+    """Register the timing hooks on an engine (idempotent)"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+@contextmanager
+def operation(name: str):
+    """Attribute the statements of a block to a named logical operation"""
+    token = _operations.set((*_operations.get(), name))
+    try:
+        yield
+    finally:
+        _operations.reset(token)
+
+@contextmanager
+def record_queries(dump_path: str | None = None):
+    """Collect the statements issued in a block, optionally dumping them on exit"""
+    recorder = QueryRecorder()
+    token = _recorders.set((*_recorders.get(), recorder))
+
+    try:
+        yield recorder
+    finally:
+        _recorders.reset(token)
+
+        if dump_path:
+            recorder.dump_jsonl(dump_path)
+
+@contextmanager
+def query_budget(max_queries: int, max_time: float | None = None):
+    """
+    Fail when a block issues more than max_queries statements, or spends
+    more than max_time seconds in them. Only instrumented engines count.
+
+    Raises:
+        QueryBudgetExceeded: With the per-operation breakdown of the block
+    """
+    with record_queries() as recorder:
+        yield recorder
+
+    if recorder.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{recorder.count} queries issued, budget is {max_queries}\n{recorder.summary()}"
+        )
+
+    if max_time is not None and recorder.total_time > max_time:
+        raise QueryBudgetExceeded(
+            f"{recorder.total_time:.3f}s spent in queries, budget is {max_time:.3f}s\n{recorder.summary()}"
+        )
+
+def enable_sql_stats(path: str, *engines: Engine) -> QueryRecorder:
+    """
+    Instrument engines with a process-wide recorder whose statistics are
+    appended to a JSON-lines file when the process exits.
+    """
+    global _global_recorder
+
+    for engine in engines:
+        instrument_engine(engine)
+
+    if _global_recorder is None:
+        _global_recorder = QueryRecorder()
+        atexit.register(_global_recorder.dump_jsonl, path)
+
+    return _global_recorder
+
+def _service_methods() -> tuple[str | None, str | None]:
+    """Outermost and innermost service methods on the current call stack"""
+    outermost = innermost = None
+    frame = sys._getframe(2)
+
+    while frame is not None:
+        if frame.f_globals.get("__name__", "").startswith(SERVICES_PACKAGE):
+            outermost = frame.f_code.co_qualname
+            innermost = innermost or outermost
+
+        frame = frame.f_back
+
+    return outermost, innermost
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_instrumentation_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["sql_instrumentation_started"].pop()
+    recorders = _recorders.get()
+
+    if _global_recorder is not None:
+        recorders = (*recorders, _global_recorder)
+
+    if not recorders:
+        return
+
+    outermost, innermost = _service_methods()
+    operations = _operations.get()
+    name = operations[-1] if operations else outermost or "<no service>"
+    caller = innermost or "<no service>"
+
+    for recorder in recorders:
+        recorder.add(name, statement, elapsed, caller)
@@ -0,0 +1,112 @@
+"""
+SQLite pragma profiles applied to every new DBAPI connection.
+
+Profiles:
+- safe: WAL journal with fully synchronous commits
+- fast: WAL with synchronous=NORMAL, a larger page cache and memory-mapped I/O
+- bulk-import: for one-off loads and rebuilds; commits are not synced to
+  disk
+
+No profile changes foreign key enforcement, which SQLite leaves off and
+existing databases may not satisfy. Individual pragmas can be overridden
+with a "name=value,name=value" string (e.g. "foreign_keys=ON").
+
+Read-only engines get the same profile without the writer pragmas, plus
+query_only=ON.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_PROFILE = "safe"
+
+# busy_timeout comes first so the remaining pragmas wait on locks too, and
+# journal_mode before synchronous, whose meaning depends on it.
+SQLITE_PROFILES: dict[str, dict[str, str | int]] = {
+    "safe": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+    },
+    "fast": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,           # 64 MiB
+        "mmap_size": 268435456,         # 256 MiB
+        "temp_store": "MEMORY",
+    },
+    "bulk-import": {
+        "busy_timeout": 30000,
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262144,          # 256 MiB
+        "mmap_size": 1073741824,        # 1 GiB
+        "temp_store": "MEMORY",
+    },
+}
+
+# Pragmas that only concern writers. Setting journal_mode fails on a mode=ro
+# connection, and since WAL is persistent readers inherit it from the writer.
+WRITE_PRAGMAS = {"journal_mode", "synchronous"}
+
+def resolve_pragmas(profile: str = DEFAULT_PROFILE, overrides: str | None = None) -> dict[str, str | int]:
+    """
+    Get the pragmas of a named profile with optional overrides applied.
+
+    Raises:
+        ValueError: If the profile is unknown or an override is malformed
+    """
+    if profile not in SQLITE_PROFILES:
+        available = ", ".join(SQLITE_PROFILES)
+        raise ValueError(f"Unknown SQLite profile '{profile}' (available: {available})")
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+
+    for override in (overrides or "").split(","):
+        if not override.strip():
+            continue
+
+        name, separator, value = override.partition("=")
+
+        if not separator or not name.strip() or not value.strip():
+            raise ValueError(f"Invalid SQLite pragma override '{override}', expected name=value")
+
+        pragmas[name.strip().lower()] = value.strip()
+
+    return pragmas
+
+def apply_sqlite_profile(
+    engine: Engine,
+    profile: str = DEFAULT_PROFILE,
+    overrides: str | None = None,
+    read_only: bool = False
+) -> dict[str, str | int]:
+    """
+    Register a connect hook that sets the profile pragmas on every new
+    connection of a SQLite engine. Other dialects are left untouched.
+
+    With read_only=True the write pragmas are skipped and query_only=ON is
+    added, so any statement that would modify the database is rejected.
+
+    Returns:
+        The pragmas that will be applied
+    """
+    pragmas = resolve_pragmas(profile, overrides)
+
+    if read_only:
+        pragmas = {name: value for name, value in pragmas.items() if name not in WRITE_PRAGMAS}
+        pragmas["query_only"] = "ON"
+
+    if engine.dialect.name != "sqlite":
+        return pragmas
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return pragmas
@@ -0,0 +1,87 @@
+from datetime import date as Date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from holdings_tracker_desktop.models import (
+    Asset, AssetSector, AssetType, Broker, Country, Currency
+)
+from holdings_tracker_desktop.models.base import Base
+from holdings_tracker_desktop.models.broker_note import OperationType
+from holdings_tracker_desktop.schemas.broker_note import BrokerNoteCreate
+from holdings_tracker_desktop.services.read_cache import read_cache
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine on a fresh file database with the application schema"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'holdings.db'}")
+    Base.metadata.create_all(engine)
+
+    yield engine
+
+    engine.dispose()
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autoflush=False, bind=engine)
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as session:
+        yield session
+
+@pytest.fixture(autouse=True)
+def empty_read_cache():
+    read_cache.clear()
+    yield
+    read_cache.clear()
+
+@pytest.fixture
+def broker_id(db) -> int:
+    """Reference rows (country, currency, asset type and sector) and a broker"""
+    db.add(Country(id=1, name="Brasil"))
+    db.add(Currency(id=1, code="BRL", name="Real Brasileiro", symbol="R$"))
+    db.flush()
+    db.add(AssetType(id=1, name="FII", country_id=1))
+    db.flush()
+    db.add(AssetSector(id=1, name="Logísticos", asset_type_id=1))
+    db.add(Broker(id=1, name="BB-BI S.A.", country_id=1))
+    db.commit()
+
+    return 1
+
+@pytest.fixture
+def asset_ids(db, broker_id) -> list[int]:
+    """Five assets, every other one in a sector"""
+    return add_assets(db, 5)
+
+def add_assets(db: Session, count: int) -> list[int]:
+    assets = [
+        Asset(ticker=f"TEST{i:02d}", type_id=1, currency_id=1, sector_id=1 if i % 2 else None)
+        for i in range(count)
+    ]
+    db.add_all(assets)
+    db.commit()
+
+    return [asset.id for asset in assets]
+
+def note(
+    asset_id: int,
+    day: Date,
+    operation: OperationType = OperationType.BUY,
+    quantity: int = 10,
+    price: str = "10",
+    fees: str = "0"
+) -> BrokerNoteCreate:
+    return BrokerNoteCreate(
+        date=day,
+        operation=operation,
+        broker_id=1,
+        asset_id=asset_id,
+        quantity=Decimal(quantity),
+        price=Decimal(price),
+        fees=Decimal(fees),
+        taxes=Decimal("0")
+    )
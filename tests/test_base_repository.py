@@ -0,0 +1,189 @@
+from datetime import date as Date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from holdings_tracker_desktop.models import Asset
+from holdings_tracker_desktop.models.broker_note import BrokerNote, OperationType
+from holdings_tracker_desktop.repositories.base_repository import (
+    BaseRepository, _decode_cursor, _encode_cursor
+)
+from holdings_tracker_desktop.schemas.asset import AssetCreate, AssetUpdate
+from holdings_tracker_desktop.schemas.broker_note import BrokerNoteCreate, BrokerNoteUpdate
+from holdings_tracker_desktop.services.broker_note_service import BrokerNoteService
+from holdings_tracker_desktop.utils.exceptions import (
+    ConflictException, NotFoundException, ValidationException
+)
+from tests.conftest import note
+
+@pytest.fixture
+def repository(db):
+    return BaseRepository[BrokerNote, BrokerNoteCreate, BrokerNoteUpdate](model=BrokerNote, db=db)
+
+@pytest.fixture
+def notes(db, asset_ids) -> list[BrokerNote]:
+    """Notes with repeated dates and prices and every third note number NULL"""
+    items = []
+
+    for i in range(25):
+        item = note(
+            asset_ids[i % 2], Date(2021, 1, 4) + timedelta(days=i % 6),
+            OperationType.SELL if i % 4 == 0 else OperationType.BUY,
+            price=str(10 + i % 5)
+        )
+        item.note_number = None if i % 3 == 0 else f"N{i % 7}"
+        items.append(item)
+
+    BrokerNoteService(db).create_many(items)
+
+    return db.query(BrokerNote).all()
+
+def all_pages(fetch, limit: int) -> list[int]:
+    ids, cursor = [], None
+
+    while True:
+        page = fetch(limit, cursor)
+        assert len(page.items) <= limit
+        ids.extend(item.id for item in page.items)
+
+        if page.next_cursor is None:
+            return ids
+
+        cursor = page.next_cursor
+
+def expected_order(notes, key, descending: bool) -> list[int]:
+    """SQLite order: NULL before every other value, ties broken by id"""
+    ordered = sorted(notes, key=lambda n: (key(n) is not None, key(n) or 0, n.id))
+    return [n.id for n in (reversed(ordered) if descending else ordered)]
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("limit", [1, 4, 7, 100])
+@pytest.mark.parametrize("order_by, key", [
+    ("note_number", lambda n: n.note_number),
+    ("date", lambda n: n.date),
+    ("price", lambda n: n.price),
+    ("operation", lambda n: n.operation.name),
+    (None, lambda n: n.id),
+])
+def test_get_page_walks_every_row_once(repository, notes, order_by, key, descending, limit):
+    ids = all_pages(
+        lambda limit, cursor: repository.get_page(limit, cursor, order_by, descending),
+        limit
+    )
+
+    assert ids == expected_order(notes, key, descending)
+
+def test_get_page_applies_filters(repository, notes, asset_ids):
+    ids = all_pages(
+        lambda limit, cursor: repository.get_page(limit, cursor, "note_number", True, asset_id=asset_ids[1]),
+        3
+    )
+
+    assert ids == expected_order([n for n in notes if n.asset_id == asset_ids[1]], lambda n: n.note_number, True)
+
+def test_iter_all_loads_eager_relationships_with_the_rows(db, engine, repository, notes):
+    def statements(eager) -> tuple[list[int], int]:
+        executed = []
+        db.expire_all()
+        listener = lambda *args: executed.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+
+        try:
+            ids = [item.id for item in repository.iter_all("date", page_size=7, eager=eager)]
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        return ids, len(executed)
+
+    eager_ids, eager_count = statements(("asset",))
+    lazy_ids, lazy_count = statements(())
+
+    assert eager_ids == lazy_ids == expected_order(notes, lambda n: n.date, False)
+    # The joined assets skip their own selectin chain on every page
+    assert eager_count < lazy_count
+
+@pytest.mark.parametrize("column, value", [
+    (BrokerNote.date, Date(2021, 3, 5)),
+    (BrokerNote.price, Decimal("12.345600")),
+    (BrokerNote.operation, OperationType.SELL),
+    (BrokerNote.note_number, None),
+    (BrokerNote.note_number, "N3"),
+])
+def test_cursor_round_trip_keeps_the_value_type(column, value):
+    assert _decode_cursor(_encode_cursor(value, 42), column) == (value, 42)
+
+@pytest.mark.parametrize("cursor", ["not base64!", "bm90IGpzb24=", "WzFd", "WyJ4IiwgMV0="])
+def test_malformed_cursor_is_rejected(repository, notes, cursor):
+    # "WzFd" is [1] and "WyJ4IiwgMV0=" is ["x", 1], not a date.
+    with pytest.raises(ValidationException):
+        repository.get_page(5, cursor, "date")
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("order_by", ["date", "price"])
+def test_get_rows_page_matches_full_listing(db, notes, order_by, descending):
+    service = BrokerNoteService(db)
+    rows = all_pages(
+        lambda limit, cursor: service.page_by_year_for_ui(2021, limit, cursor, order_by, descending),
+        4
+    )
+
+    listing = service.list_by_year_for_ui(2021, limit=1000, order_by=order_by, descending=descending)
+
+    assert rows == [row.id for row in listing]
+    assert len(rows) == len(notes)
+
+def test_create_many_returns_ids_in_item_order(repository, asset_ids):
+    items = [note(asset_ids[0], Date(2022, 1, 3), price="11").model_dump(), note(asset_ids[1], Date(2022, 1, 2))]
+    items[0]["note_number"] = "FIRST"
+
+    ids = repository.create_many(items)
+
+    assert [repository.get(id).note_number for id in ids] == ["FIRST", None]
+    assert repository.get(ids[1]).asset_id == asset_ids[1]
+
+def test_create_many_rejects_the_whole_batch(repository, asset_ids):
+    valid = note(asset_ids[0], Date(2022, 1, 3)).model_dump()
+    invalid = {**valid, "quantity": Decimal("-1")}
+
+    with pytest.raises(ValidationException):
+        repository.create_many([valid, invalid])
+
+    assert repository.count() == 0
+
+def test_update_many_writes_only_set_fields(repository, notes):
+    first, second = notes[1], notes[2]
+
+    assert repository.update_many({
+        first.id: {"price": Decimal("99")},
+        second.id: BrokerNoteUpdate(note_number="CHANGED"),
+    }) == 2
+
+    repository.db.expire_all()
+    assert (first.price, first.note_number) == (Decimal("99"), "N1")
+    assert (second.price, second.note_number) == (Decimal("12"), "CHANGED")
+
+def test_update_many_of_missing_record_changes_nothing(repository, notes):
+    with pytest.raises(NotFoundException):
+        repository.update_many({notes[1].id: {"price": Decimal("99")}, 10_000: {"price": Decimal("1")}})
+
+    repository.db.expire_all()
+    assert notes[1].price == Decimal("11")
+
+def test_delete_many_removes_records_and_forgets_them(repository, notes):
+    ids = [notes[0].id, notes[5].id, 10_000]
+
+    assert repository.delete_many(ids) == 2
+    assert repository.count() == len(notes) - 2
+    assert repository.get(notes[0].id) is None
+    assert repository.delete_many([]) == 0
+
+def test_delete_many_validates_every_record_first(db, notes, asset_ids):
+    assets = BaseRepository[Asset, AssetCreate, AssetUpdate](model=Asset, db=db)
+    unused = asset_ids[4]
+
+    with pytest.raises(ConflictException):
+        assets.delete_many([unused, asset_ids[0]])
+
+    assert assets.count() == len(asset_ids)
+    assert assets.delete_many([unused]) == 1
@@ -0,0 +1,69 @@
+"""The tuple replay kernel must reproduce the per-object reference rules"""
+import random
+from datetime import date as Date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from holdings_tracker_desktop.models import AssetEvent, BrokerNote
+from holdings_tracker_desktop.models.asset_event import AssetEventType
+from holdings_tracker_desktop.models.broker_note import OperationType
+from holdings_tracker_desktop.services import position_replay
+from holdings_tracker_desktop.services.position_replay import ConversionInflow
+
+ZERO = Decimal("0")
+
+def random_item(rng: random.Random, day: Date):
+    roll = rng.random()
+    quantity = Decimal(rng.randint(1, 100))
+    price = Decimal(rng.randint(1, 20000)) / 100
+
+    if roll < 0.5:
+        return BrokerNote(
+            date=day, operation=OperationType.BUY, quantity=quantity, price=price,
+            fees=Decimal(rng.randint(0, 500)) / 100, taxes=Decimal(rng.randint(0, 50)) / 100
+        )
+
+    if roll < 0.75:
+        return BrokerNote(
+            date=day, operation=OperationType.SELL, quantity=quantity, price=price, fees=ZERO, taxes=ZERO
+        )
+
+    if roll < 0.82:
+        factor = rng.choice([Decimal("0.5"), Decimal("2"), Decimal("3"), Decimal("7")])
+        event_type = rng.choice([AssetEventType.SPLIT, AssetEventType.REVERSE_SPLIT])
+        return AssetEvent(date=day, event_type=event_type, factor=factor)
+
+    if roll < 0.88:
+        return AssetEvent(date=day, event_type=AssetEventType.SUBSCRIPTION, quantity=quantity, price=price)
+
+    if roll < 0.94:
+        return AssetEvent(
+            date=day, event_type=AssetEventType.AMORTIZATION,
+            quantity=rng.choice([None, quantity]), price=Decimal(rng.randint(1, 300)) / 100
+        )
+
+    if roll < 0.97:
+        return ConversionInflow(day, quantity, quantity * price)
+
+    return AssetEvent(date=day, event_type=AssetEventType.CONVERSION)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_kernel_matches_reference_rules(seed):
+    rng = random.Random(seed)
+    day = Date(2015, 1, 5)
+    items = []
+
+    for _ in range(2000):
+        day += timedelta(days=rng.randint(0, 3))
+        items.append(random_item(rng, day))
+
+    quantity, total_cost = ZERO, ZERO
+    expected = []
+    for item in items:
+        quantity, total_cost, action = position_replay.apply_item(item, quantity, total_cost)
+        expected.append((item.date, action, quantity, total_cost))
+
+    steps = [position_replay.encode_item(item) for item in items]
+
+    assert list(position_replay.replay(steps, ZERO, ZERO)) == expected
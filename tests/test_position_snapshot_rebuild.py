@@ -0,0 +1,238 @@
+"""
+Incremental rebuilds (append and diff paths) must leave the rows a full
+rebuild_all would write: snapshots, year-end checkpoints and the snapshot
+years of the year summaries.
+
+An incremental rebuild resumes from a stored snapshot, whose quantity and
+average price are rounded to the column scale, while rebuild_all carries
+full precision from the first note. Quantities and costs are therefore
+compared up to that rounding; everything else must match exactly.
+"""
+import random
+from datetime import date as Date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from holdings_tracker_desktop.models import (
+    BrokerNote, PositionCheckpoint, PositionSnapshot, YearSummary
+)
+from holdings_tracker_desktop.models.asset_event import AssetEventType
+from holdings_tracker_desktop.models.broker_note import OperationType
+from holdings_tracker_desktop.schemas.asset_event import AssetEventCreate, AssetEventUpdate
+from holdings_tracker_desktop.schemas.broker_note import BrokerNoteUpdate
+from holdings_tracker_desktop.services import position_snapshot_service
+from holdings_tracker_desktop.services.asset_event_service import AssetEventService
+from holdings_tracker_desktop.services.broker_note_service import BrokerNoteService
+from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
+from tests.conftest import note
+
+START = Date(2020, 1, 6)
+
+def stored_state(db) -> tuple[list, list, list]:
+    snapshots = db.execute(
+        select(
+            PositionSnapshot.asset_id, PositionSnapshot.snapshot_date,
+            PositionSnapshot.origin_action, PositionSnapshot.quantity, PositionSnapshot.avg_price
+        )
+        .order_by(PositionSnapshot.asset_id, PositionSnapshot.snapshot_date, PositionSnapshot.id)
+    ).all()
+
+    checkpoints = db.execute(
+        select(
+            PositionCheckpoint.asset_id, PositionCheckpoint.year,
+            PositionSnapshot.snapshot_date, PositionCheckpoint.quantity, PositionCheckpoint.total_cost
+        )
+        .join(PositionSnapshot, PositionSnapshot.id == PositionCheckpoint.snapshot_id)
+        .order_by(PositionCheckpoint.asset_id, PositionCheckpoint.year)
+    ).all()
+
+    years = db.execute(
+        select(YearSummary.year, YearSummary.snapshot_asset_count)
+        .where(YearSummary.snapshot_asset_count != 0)
+        .order_by(YearSummary.year)
+    ).all()
+
+    return snapshots, checkpoints, years
+
+# Rows end with two numeric columns (quantity, then average price or cost).
+NUMERIC_COLUMNS = 2
+RELATIVE_TOLERANCE = Decimal("1e-7")
+
+def assert_rows_match(actual: list, expected: list, tolerance: Decimal) -> None:
+    assert [row[:-NUMERIC_COLUMNS] for row in actual] == [row[:-NUMERIC_COLUMNS] for row in expected]
+
+    for row, other in zip(actual, expected):
+        for value, other_value in zip(row[-NUMERIC_COLUMNS:], other[-NUMERIC_COLUMNS:]):
+            # Converting a large position into a small quantity scales the
+            # rounding of the source position up in the average price.
+            assert abs(value - other_value) <= max(tolerance, abs(other_value) * RELATIVE_TOLERANCE), (row, other)
+
+def assert_matches_rebuild_all(db) -> None:
+    snapshots, checkpoints, years = stored_state(db)
+    PositionSnapshotService(db).rebuild_all()
+    expected_snapshots, expected_checkpoints, expected_years = stored_state(db)
+
+    assert_rows_match(snapshots, expected_snapshots, Decimal("0.00001"))
+    assert_rows_match(checkpoints, expected_checkpoints, Decimal("0.01"))
+    assert years == expected_years
+
+def random_day(rng: random.Random) -> Date:
+    return START + timedelta(days=rng.randint(1, 700))
+
+@pytest.fixture
+def opening_positions(db, asset_ids):
+    """A large opening buy per asset, so random sells never go short"""
+    service = BrokerNoteService(db)
+
+    for asset_id in asset_ids:
+        service.create(note(asset_id, START, quantity=1000, price="20"))
+
+    return asset_ids
+
+def test_appended_notes_match_rebuild_all(db, opening_positions):
+    service = BrokerNoteService(db)
+    day = START
+
+    for i in range(30):
+        day += timedelta(days=i % 3 * 20)
+        operation = OperationType.SELL if i % 5 == 4 else OperationType.BUY
+        service.create(note(opening_positions[i % 3], day, operation, quantity=7, price=f"{10 + i}"))
+
+    assert_matches_rebuild_all(db)
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_random_note_and_event_writes_match_rebuild_all(db, opening_positions, seed):
+    rng = random.Random(seed)
+    notes = BrokerNoteService(db)
+    events = AssetEventService(db)
+    tracked = opening_positions[:4]
+    target = opening_positions[4]
+
+    # Positions of the first asset flow into the last one, so its writes
+    # rebuild the conversion target too.
+    events.create(AssetEventCreate(
+        asset_id=tracked[0],
+        event_type=AssetEventType.CONVERSION,
+        date=START + timedelta(days=400),
+        converted_to_asset_id=target,
+        conversion_quantity=Decimal("0.5")
+    ))
+
+    split_ids = []
+    for asset_id in tracked[1:]:
+        split_ids.append(events.create(AssetEventCreate(
+            asset_id=asset_id,
+            event_type=AssetEventType.SPLIT,
+            date=random_day(rng),
+            factor=Decimal("2")
+        )).id)
+
+    note_ids = []
+
+    for _ in range(60):
+        action = rng.random()
+        asset_id = rng.choice(tracked)
+
+        if action < 0.5 or not note_ids:
+            operation = OperationType.SELL if rng.random() < 0.3 else OperationType.BUY
+            created = notes.create(note(
+                asset_id, random_day(rng), operation,
+                quantity=rng.randint(1, 20), price=str(rng.randint(5, 50)), fees=str(rng.randint(0, 3))
+            ))
+            note_ids.append(created.id)
+        elif action < 0.75:
+            note_id = rng.choice(note_ids)
+            notes.update(note_id, BrokerNoteUpdate(
+                date=random_day(rng),
+                broker_id=1,
+                quantity=Decimal(rng.randint(1, 20)),
+                price=Decimal(rng.randint(5, 50)),
+                fees=Decimal("0"),
+                taxes=Decimal("0")
+            ))
+        elif action < 0.9:
+            notes.delete(note_ids.pop(rng.randrange(len(note_ids))))
+        else:
+            event_id = rng.choice(split_ids)
+            existing = events.get(event_id)
+            events.update(event_id, AssetEventUpdate(
+                asset_id=existing.asset_id,
+                event_type=AssetEventType.SPLIT,
+                date=random_day(rng),
+                factor=Decimal(rng.choice(["2", "3", "0.5"]))
+            ))
+
+    assert_matches_rebuild_all(db)
+
+def test_deleting_last_note_drops_its_snapshots_and_checkpoint(db, opening_positions):
+    service = BrokerNoteService(db)
+    asset_id = opening_positions[0]
+    later = service.create(note(asset_id, Date(2022, 3, 1), OperationType.SELL, quantity=5))
+
+    service.delete(later.id)
+
+    assert_matches_rebuild_all(db)
+    assert db.scalar(
+        select(PositionCheckpoint.year)
+        .where(PositionCheckpoint.asset_id == asset_id, PositionCheckpoint.year == 2022)
+    ) is None
+
+def test_small_timeline_batches_match_rebuild_all(db, opening_positions, monkeypatch):
+    monkeypatch.setattr(position_snapshot_service, "TIMELINE_BATCH_SIZE", 3)
+    service = BrokerNoteService(db)
+    rng = random.Random(7)
+
+    service.create_many([
+        note(asset_id, random_day(rng), quantity=rng.randint(1, 20), price=str(rng.randint(5, 50)))
+        for asset_id in opening_positions
+        for _ in range(20)
+    ])
+
+    # An early note replays the whole stored timeline through the batches.
+    first = db.scalar(select(BrokerNote.id).where(BrokerNote.asset_id == opening_positions[0]).limit(1))
+    service.update(first, BrokerNoteUpdate(
+        date=START, broker_id=1, quantity=Decimal(900), price=Decimal(19),
+        fees=Decimal("0"), taxes=Decimal("0")
+    ))
+
+    assert_matches_rebuild_all(db)
+
+@pytest.mark.parametrize("seed", range(8))
+def test_same_day_chained_conversions_match_rebuild_all(db, opening_positions, seed):
+    rng = random.Random(seed)
+    notes = BrokerNoteService(db)
+    events = AssetEventService(db)
+    chain = opening_positions[:4]
+    day = Date(2021, 5, 3)
+
+    def convert(source, target):
+        events.create(AssetEventCreate(
+            asset_id=source, event_type=AssetEventType.CONVERSION, date=day,
+            converted_to_asset_id=target, conversion_quantity=Decimal(rng.randint(1, 900)),
+            residual_value=Decimal(rng.randint(0, 50))
+        ))
+
+    # Each asset of the chain receives a position and converts its own on
+    # the same day, written in random order together with same-day events
+    # and notes around the conversions.
+    writes = [
+        *(lambda source=source, target=target: convert(source, target) for source, target in zip(chain, chain[1:])),
+        lambda: events.create(AssetEventCreate(
+            asset_id=rng.choice(chain[:3]), event_type=AssetEventType.SPLIT, date=day, factor=Decimal("3")
+        )),
+        lambda: events.create(AssetEventCreate(
+            asset_id=rng.choice(chain[:3]), event_type=AssetEventType.SUBSCRIPTION, date=day,
+            quantity=Decimal(40), price=Decimal(15)
+        )),
+        lambda: notes.create(note(rng.choice(chain), day, quantity=rng.randint(1, 50), price="33")),
+        lambda: notes.create(note(rng.choice(chain), Date(2021, 4, rng.randint(1, 30)), quantity=20, price="31")),
+        lambda: notes.create(note(chain[-1], Date(2021, 6, 1), OperationType.SELL, quantity=5)),
+    ]
+    rng.shuffle(writes)
+
+    for write in writes:
+        write()
+
+    assert_matches_rebuild_all(db)
@@ -0,0 +1,138 @@
+"""
+The UI lists and snapshot rebuilds must be served by the indexes declared
+on the models: every statement they run is replayed with EXPLAIN QUERY PLAN
+and the plan is searched for the expected index.
+"""
+from contextlib import contextmanager
+from datetime import date as Date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from holdings_tracker_desktop.models.broker_note import OperationType
+from holdings_tracker_desktop.services.broker_note_service import BrokerNoteService
+from holdings_tracker_desktop.services.position_snapshot_service import PositionSnapshotService
+from holdings_tracker_desktop.services.read_cache import read_cache
+from holdings_tracker_desktop.services.year_summary_service import YearSummaryService
+from tests.conftest import note
+
+@pytest.fixture
+def plans(engine, session_factory, asset_ids):
+    """Notes over two years for every asset, then a full rebuild"""
+    with session_factory() as db:
+        notes = [
+            note(asset_id, Date(2020, 1, 6) + timedelta(days=30 * i),
+                 OperationType.SELL if i % 4 == 3 else OperationType.BUY)
+            for asset_id in asset_ids
+            for i in range(24)
+        ]
+        BrokerNoteService(db).create_many(notes)
+        PositionSnapshotService(db).rebuild_all()
+
+    read_cache.enabled = False
+    yield QueryPlans(engine, session_factory)
+    read_cache.enabled = True
+
+class QueryPlans:
+    def __init__(self, engine, session_factory):
+        self.engine = engine
+        self.session_factory = session_factory
+
+    @contextmanager
+    def capture(self):
+        """Collect the plan of every query (plain or INSERT ... SELECT) run inside the block"""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "SELECT" in statement.upper() and not executemany:
+                statements.append((statement, parameters))
+
+        plans = []
+        event.listen(self.engine, "before_cursor_execute", record)
+        try:
+            with self.session_factory() as db:
+                yield db, plans
+        finally:
+            event.remove(self.engine, "before_cursor_execute", record)
+
+        with self.engine.connect() as conn:
+            for statement, parameters in statements:
+                rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+                plans.append((statement, [row[3] for row in rows]))
+
+def uses_index(plans, table: str, index: str) -> bool:
+    return any(
+        f"{table} USING INDEX {index}" in detail
+        or f"{table} USING COVERING INDEX {index}" in detail
+        for _, details in plans
+        for detail in details
+    )
+
+def scans(plans, table: str) -> bool:
+    return any(
+        detail == f"SCAN {table}"
+        for _, details in plans
+        for detail in details
+    )
+
+def test_year_lists_use_note_date_index(plans):
+    with plans.capture() as (db, captured):
+        service = BrokerNoteService(db)
+        service.list_by_year_for_ui(2020)
+        page = service.page_by_year_for_ui(2020, limit=10)
+        service.page_by_year_for_ui(2020, limit=10, cursor=page.next_cursor)
+
+    assert uses_index(captured, "broker_notes", "ix_broker_notes_date")
+    assert not scans(captured, "broker_notes")
+
+def test_available_note_years_count_uses_note_date_index(plans):
+    # list_available_years reads year_summaries; the years are counted from
+    # the notes when the summaries are refreshed.
+    with plans.capture() as (db, captured):
+        assert BrokerNoteService(db).list_available_years() == [2021, 2020]
+        YearSummaryService(db).refresh()
+
+    assert uses_index(captured, "broker_notes", "ix_broker_notes_date")
+
+def test_rebuild_from_loads_use_asset_date_indexes(plans, asset_ids):
+    with plans.capture() as (db, captured):
+        PositionSnapshotService(db).rebuild_from(asset_ids[2], Date(2020, 6, 1))
+
+    assert uses_index(captured, "broker_notes", "ix_broker_notes_asset_id_date")
+    assert uses_index(captured, "asset_events", "ix_asset_events_asset_id_date")
+    assert uses_index(captured, "position_snapshots", "ix_position_snapshots_asset_id_snapshot_date_id")
+    assert not scans(captured, "broker_notes")
+    assert not scans(captured, "asset_events")
+    assert not scans(captured, "position_snapshots")
+
+def test_checkpoints_are_derived_through_snapshot_index(plans, asset_ids):
+    with plans.capture() as (db, captured):
+        PositionSnapshotService(db).rebuild_from(asset_ids[1], Date(2021, 1, 1))
+
+    checkpoint_inserts = [
+        (statement, details) for statement, details in captured
+        if statement.lstrip().upper().startswith("INSERT INTO POSITION_CHECKPOINTS")
+    ]
+
+    assert checkpoint_inserts
+    assert uses_index(checkpoint_inserts, "position_snapshots", "ix_position_snapshots_asset_id_snapshot_date_id")
+    assert not scans(checkpoint_inserts, "position_snapshots")
+
+def test_snapshot_pages_use_snapshot_index(plans, asset_ids):
+    with plans.capture() as (db, captured):
+        page = PositionSnapshotService(db).page_for_ui_by_asset(asset_ids[0], limit=5)
+        PositionSnapshotService(db).page_for_ui_by_asset(asset_ids[0], limit=5, cursor=page.next_cursor)
+
+    assert uses_index(captured, "position_snapshots", "ix_position_snapshots_asset_id_snapshot_date_id")
+    assert not scans(captured, "position_snapshots")
+
+def test_allocations_read_checkpoints_by_key(plans):
+    # Allocations are served by the year-end checkpoints, whose (asset_id,
+    # year) unique constraint replaces a snapshot lookup per asset.
+    with plans.capture() as (db, captured):
+        service = PositionSnapshotService(db)
+        assert service.get_allocation_by_asset(2021)
+        assert service.get_allocation_by_sector(2021)
+
+    assert uses_index(captured, "position_checkpoints", "sqlite_autoindex_position_checkpoints_1")
+    assert not scans(captured, "position_snapshots")
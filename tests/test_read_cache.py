@@ -0,0 +1,90 @@
+import sqlite3
+from datetime import date as Date
+
+import pytest
+
+from holdings_tracker_desktop.models import BrokerNote, Country
+from holdings_tracker_desktop.services.broker_note_service import BrokerNoteService
+from holdings_tracker_desktop.services.read_cache import read_cache
+from tests.conftest import note
+
+@pytest.fixture
+def read_note_ids(session_factory, asset_ids):
+    """Note ids of 2021 read through the cache, in a session of their own"""
+    with session_factory() as db:
+        BrokerNoteService(db).create(note(asset_ids[0], Date(2021, 2, 1)))
+
+    def read() -> list[int]:
+        with session_factory() as db:
+            return [row.id for row in BrokerNoteService(db).list_by_year_for_ui(2021)]
+
+    return read
+
+def test_repeated_read_is_served_from_cache(read_note_ids):
+    first = read_note_ids()
+    hits = read_cache.hits
+
+    assert read_note_ids() == first
+    assert read_note_ids() == first
+    assert read_cache.hits == hits + 2
+
+def test_committed_write_drops_cached_reads(read_note_ids, session_factory, asset_ids):
+    before = read_note_ids()
+
+    with session_factory() as db:
+        created = BrokerNoteService(db).create(note(asset_ids[1], Date(2021, 3, 1)))
+
+    assert sorted(read_note_ids()) == sorted(before + [created.id])
+
+def test_committed_write_keeps_reads_of_other_tables(read_note_ids, session_factory):
+    before = read_note_ids()
+    hits = read_cache.hits
+
+    with session_factory() as db:
+        db.add(Country(name="Portugal"))
+        db.commit()
+
+    assert read_note_ids() == before
+    assert read_cache.hits == hits + 1
+
+def test_rolled_back_write_keeps_cached_reads(read_note_ids, session_factory, asset_ids):
+    before = read_note_ids()
+    cached = len(read_cache)
+
+    with session_factory() as db:
+        db.add(BrokerNote(**note(asset_ids[1], Date(2021, 3, 1)).model_dump()))
+        db.flush()
+        db.rollback()
+
+    hits = read_cache.hits
+    assert read_note_ids() == before
+    assert (len(read_cache), read_cache.hits) == (cached, hits + 1)
+
+def test_uncommitted_write_reads_around_cache(read_note_ids, session_factory, asset_ids):
+    before = read_note_ids()
+
+    with session_factory() as db:
+        pending = BrokerNote(**note(asset_ids[1], Date(2021, 3, 1)).model_dump())
+        db.add(pending)
+        db.flush()
+
+        own_view = [row.id for row in BrokerNoteService(db).list_by_year_for_ui(2021)]
+        db.rollback()
+
+    assert pending.id in own_view
+    assert read_note_ids() == before
+
+def test_commit_from_another_process_drops_cached_reads(read_note_ids, engine, asset_ids):
+    before = read_note_ids()
+
+    # A plain sqlite3 connection stands in for a script run while the app is
+    # open: none of this engine's events see its write.
+    external = sqlite3.connect(engine.url.database)
+    try:
+        external.execute("DELETE FROM broker_notes")
+        external.commit()
+    finally:
+        external.close()
+
+    assert before
+    assert read_note_ids() == []
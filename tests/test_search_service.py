@@ -0,0 +1,12 @@
+from holdings_tracker_desktop.services.search_service import SearchService
+
+def test_search_ranks_matches_across_indexes(db, asset_ids):
+    results = SearchService(db).search_for_ui("TEST0")
+
+    assert {(result["kind"], result["label"]) for result in results} == {
+        ("assets", f"TEST{i:02d}") for i in range(len(asset_ids))
+    }
+    assert [result["rank"] for result in results] == sorted(result["rank"] for result in results)
+
+def test_search_without_searchable_words_finds_nothing(db, asset_ids):
+    assert SearchService(db).search_for_ui(" -- ") == []
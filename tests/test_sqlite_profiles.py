@@ -0,0 +1,21 @@
+import pytest
+from sqlalchemy import create_engine
+
+from holdings_tracker_desktop.utils.sqlite_profiles import SQLITE_PROFILES, apply_sqlite_profile
+
+def foreign_keys_enforced(tmp_path, profile: str, overrides: str | None = None) -> int:
+    engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    apply_sqlite_profile(engine, profile, overrides)
+
+    try:
+        with engine.connect() as conn:
+            return conn.exec_driver_sql("PRAGMA foreign_keys").scalar()
+    finally:
+        engine.dispose()
+
+@pytest.mark.parametrize("profile", SQLITE_PROFILES)
+def test_profiles_leave_foreign_keys_as_sqlite_does(tmp_path, profile):
+    assert foreign_keys_enforced(tmp_path, profile) == 0
+
+def test_foreign_keys_can_be_enabled_by_override(tmp_path):
+    assert foreign_keys_enforced(tmp_path, "safe", "foreign_keys=ON") == 1
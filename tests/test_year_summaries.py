@@ -0,0 +1,50 @@
+from datetime import date as Date
+from decimal import Decimal
+
+import pytest
+
+from holdings_tracker_desktop.models import YearSummary
+from holdings_tracker_desktop.schemas.broker_note import BrokerNoteUpdate
+from holdings_tracker_desktop.services.broker_note_service import BrokerNoteService
+from holdings_tracker_desktop.utils.exceptions import ValidationException
+from tests.conftest import note
+
+def note_counts(db) -> dict[int, int]:
+    db.expire_all()
+    return {summary.year: summary.broker_note_count for summary in db.query(YearSummary)}
+
+def moved_to(year: int) -> BrokerNoteUpdate:
+    return BrokerNoteUpdate(
+        date=Date(year, 6, 1), broker_id=1, quantity=Decimal(10), price=Decimal(10),
+        fees=Decimal("0"), taxes=Decimal("0")
+    )
+
+@pytest.fixture
+def service(db, asset_ids):
+    service = BrokerNoteService(db)
+    service.create_many([note(asset_ids[0], Date(2020, 3, 2)), note(asset_ids[1], Date(2021, 3, 2))])
+    return service
+
+def test_note_writes_keep_year_counts(db, service, asset_ids):
+    created = service.create(note(asset_ids[0], Date(2021, 5, 4)))
+    service.update(created.id, moved_to(2022))
+    service.delete(created.id)
+
+    assert note_counts(db) == {2020: 1, 2021: 1}
+
+def failing(*args, **kwargs):
+    raise ValidationException("rejected")
+
+@pytest.mark.parametrize("write", ["update", "delete"])
+def test_failed_note_write_leaves_year_counts_alone(db, service, monkeypatch, write):
+    note_id = service.list_by_year_for_ui(2020)[0].id
+    monkeypatch.setattr(service.repository, "update_from_schema", failing)
+    monkeypatch.setattr(service.repository, "delete", failing)
+
+    with pytest.raises(ValidationException):
+        service.update(note_id, moved_to(2022)) if write == "update" else service.delete(note_id)
+
+    # Nothing of the failed write may reach a later commit of the session.
+    db.commit()
+
+    assert note_counts(db) == {2020: 1, 2021: 1}